@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""Measure the evaluation throughput of `cocoex` problems.
+
+For each suite and dimension, the problems of the first instance of
+(at most `max_functions`) functions are evaluated on random solutions
+for about `seconds` seconds each, namely
+
+- with single calls ``problem(x)`` and with batch calls
+  ``problem.evaluate_batch(X)`` of `batch_size` solutions,
+- on unobserved problems and on problems observed by the default
+  observer of the suite.
+
+The results are written as JSON to `output`, a list of records with the
+evaluations per second and the mean latency per call in microseconds.
+With `baseline` the name of a previous output file, records which are
+slower than the baseline by more than the factor `tolerance` are printed
+and the exit status is 1. Usage::
+
+    python coco_bench.py [name=value ...]
+
+with the names ``output, baseline, tolerance, suites, dimensions,
+max_functions, batch_size, seconds``, for example::
+
+    python coco_bench.py output=bench.json suites=bbob,bbob-biobj dimensions=2,10
+
+or via ``python do.py bench-python [name=value ...]``.
+"""
+from __future__ import absolute_import, division, print_function
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import numpy as np
+import cocoex as ex
+from cocoex.utilities import args_to_dict
+from cocoex.exceptions import NoSuchSuiteException
+
+output = 'coco_bench.json'
+baseline = None
+tolerance = 1.5  # factor of evaluations per second to report as regression
+suites = ['bbob', 'bbob-biobj', 'bbob-largescale', 'bbob-mixint', 'bbob-constrained']
+dimensions = None  # all dimensions of each suite
+max_functions = 6  # per suite and dimension
+batch_size = 100
+seconds = 0.2  # per problem and measurement
+
+def measure(problem, batch, seconds):
+    """return number of evaluations, number of calls and elapsed time of
+    evaluating `problem` for about `seconds`"""
+    rng = np.random.RandomState(1)
+    X = problem.lower_bounds + rng.rand(batch_size, problem.dimension) * (
+        problem.upper_bounds - problem.lower_bounds)
+    if problem.number_of_integer_variables:
+        X[:, :problem.number_of_integer_variables] = np.round(
+            X[:, :problem.number_of_integer_variables])
+    evaluations, calls, t0 = 0, 0, time.time()
+    while time.time() - t0 < seconds:
+        if batch:
+            problem.evaluate_batch(X)
+            calls += 1
+        else:
+            for x in X:
+                problem(x)
+            calls += len(X)
+        evaluations += len(X)
+    return evaluations, calls, time.time() - t0
+
+def bench_suite(suite_name, dimensions, result_folder):
+    """return the records of `suite_name` or a record with an error"""
+    try:
+        suite = ex.Suite(suite_name, '', '')
+    except NoSuchSuiteException as e:
+        return [{'suite': suite_name, 'error': '%s: %s' % (
+            type(e).__name__, str(e).split('\n')[0])}]
+    observer = ex.Observer(ex.default_observers()[suite_name],
+                           'result_folder: %s' % result_folder)
+    records = []
+    for dimension in dimensions or suite.dimensions:
+        if dimension not in suite.dimensions:
+            continue
+        numbers = [[int(n) for n in re.search(r'_f(\d+)_i(\d+)_d(\d+)', id).groups()]
+                   for id in suite.ids()]  # function, instance, dimension
+        ids = [id for id, n in zip(suite.ids(), numbers)  # first instance of each function
+               if n[1] == numbers[0][1] and n[2] == dimension][:max_functions]
+        for observed in [False, True]:
+            for batch in [False, True]:
+                evaluations, calls, elapsed = 0, 0, 0.
+                for id in ids:
+                    problem = suite.get_problem(id, observer if observed else None)
+                    res = measure(problem, batch, seconds)
+                    problem.free()
+                    evaluations, calls, elapsed = [a + b for a, b in zip(
+                        (evaluations, calls, elapsed), res)]
+                records.append({
+                    'suite': suite_name, 'dimension': dimension,
+                    'observed': observed, 'batch': batch,
+                    'problems': len(ids), 'evaluations': evaluations,
+                    'evaluations_per_second': evaluations / elapsed,
+                    'latency_us': 1e6 * elapsed / calls})
+                print('  %s d=%d %s %s: %.3g evaluations/s' % (
+                    suite_name, dimension, 'observed' if observed else 'unobserved',
+                    'batch' if batch else 'single', evaluations / elapsed))
+                sys.stdout.flush()
+    observer.free()
+    return records
+
+def regressions(records, baseline_records, tolerance):
+    """return the pairs of records which are slower than in the baseline
+    by more than the factor `tolerance`"""
+    def key(record):
+        return tuple(record.get(k) for k in ('suite', 'dimension', 'observed', 'batch'))
+    baseline_records = dict((key(r), r) for r in baseline_records)
+    return [(r, baseline_records[key(r)]) for r in records
+            if 'error' not in r and key(r) in baseline_records and
+            r['evaluations_per_second'] * tolerance <
+            baseline_records[key(r)]['evaluations_per_second']]
+
+def main(args):
+    globals().update(args_to_dict(args, ['output', 'baseline', 'tolerance', 'suites',
+                                         'dimensions', 'max_functions', 'batch_size',
+                                         'seconds']))
+    suite_names = suites.split(',') if isinstance(suites, str) else suites
+    dims = [dimensions] if isinstance(dimensions, int) else dimensions
+    ex.log_level('warning')
+    cwd, result_folder = os.getcwd(), tempfile.mkdtemp(prefix='coco_bench')
+    records = []
+    try:
+        os.chdir(result_folder)  # the observer writes into exdata
+        for suite_name in suite_names:
+            records += bench_suite(suite_name, dims, 'bench')
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(result_folder)
+    with open(output, 'w') as f:
+        json.dump({'python': platform.python_version(),
+                   'platform': platform.platform(),
+                   'time': time.asctime(),
+                   'batch_size': batch_size,
+                   'records': records}, f, indent=1)
+    print('Results written to', output)
+    if baseline:
+        with open(baseline) as f:
+            slower = regressions(records, json.load(f)['records'], tolerance)
+        for record, previous in slower:
+            print('  regression: %s d=%d observed=%s batch=%s %.3g evaluations/s (was %.3g)'
+                  % (record['suite'], record['dimension'], record['observed'],
+                     record['batch'], record['evaluations_per_second'],
+                     previous['evaluations_per_second']))
+        if slower:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -99,6 +99,90 @@ def run_constrained_suite_test():
         counts['b'] += np.any(f.constraint(best_parameter(f)) > 1e-11)  # mac: 6.8361219664552603e-12 is the largest value
     assert sum(counts.values()) == 0
 
+def run_batch_evaluation_test():
+    """check that `Problem.evaluate_batch` evaluates like single calls"""
+    for suite_name in ['bbob', 'bbob-biobj']:
+        suite = Suite(suite_name, '', 'dimensions: 2,10 instance_indices: 1')
+        for f in suite:
+            X = np.random.randn(3, f.dimension)
+            evaluations = f.evaluations
+            F = f.evaluate_batch(X)
+            assert f.evaluations == evaluations + len(X)
+            assert np.array_equal(F, np.array([f(x) for x in X]))
+        suite.free()
+    enable = 'bbob-constrained' not in known_suite_names  # not released yet
+    if enable:
+        known_suite_names.append('bbob-constrained')
+    try:
+        suite = Suite('bbob-constrained', '', 'dimensions: 2,10 instance_indices: 1')
+        for f in suite:
+            X = np.random.randn(3, f.dimension)
+            evaluations = f.evaluations_constraints
+            F, C = f.evaluate_with_constraints(X)
+            assert f.evaluations_constraints == evaluations + len(X)
+            assert np.array_equal(C, f.constraint_batch(X))
+            assert np.array_equal(C, np.array([f.constraint(x) for x in X]))
+            assert np.array_equal(F, f.evaluate_batch(X))
+        suite.free()
+    finally:
+        if enable:
+            known_suite_names.remove('bbob-constrained')
+
+def run_suite_metadata_test():
+    """check the id's, indices and dimensions of `Suite` against a sweep
+    through all its problems"""
+    for suite_name, suite_instance, suite_options in [
+            ('bbob', '', ''),
+            ('bbob', 'instances: 1-3,7', 'dimensions: 3,10 function_indices: 5-9'),
+            ('bbob-biobj', 'instances: 1-20', 'function_indices: 1,55'),
+            ('bbob-largescale', '', 'dimensions: 20,80')]:
+        suite = Suite(suite_name, suite_instance, suite_options)
+        ids, indices, dimensions = [], [], set()
+        for f in suite:
+            ids.append(f.id)
+            indices.append(f.index)
+            dimensions.add(f.dimension)
+        assert ids == suite.ids() and indices == suite.indices
+        assert sorted(dimensions) == suite.dimensions
+        assert all(suite.get_problem(id).id == id for id in ids[::17])
+        suite.free()
+
+def run_runner_test():
+    """run a small experiment in two processes with `cocoex.runner`"""
+    import cocoex.runner
+    for resume in [False, True]:  # the second call has nothing left to do
+        folder = cocoex.runner.run(ex.solvers.random_search, 'bbob', 2, workers=2,
+                                   suite_options='dimensions: 2,3 function_indices: 1-3',
+                                   result_folder='runner_test', resume=resume, verbose=False)
+        with open(os.path.join(folder, 'bbobexp_f1_i1.info')) as f:
+            assert f.read().count('DIM =') == 2
+
+def _budgeted_random_search(problem, budget):
+    """deterministic solver for `run_non_anytime_test`"""
+    rng = np.random.RandomState(budget)
+    X = problem.lower_bounds + rng.rand(budget, problem.dimension) * (
+        problem.upper_bounds - problem.lower_bounds)
+    return X[np.argmin([problem(x) for x in X])]
+
+def run_non_anytime_test():
+    """check that `ProblemNonAnytime.run_budgets` logs the same data with
+    and without worker processes"""
+    from cocoex.utilities import ProblemNonAnytime
+    folders = []
+    for workers in [1, 3]:
+        suite = Suite('bbob', '', 'dimensions: 2 function_indices: 1,3 instance_indices: 1')
+        observer = ex.Observer('bbob', 'result_folder: non_anytime_test')
+        for index in range(len(suite)):
+            with ProblemNonAnytime(suite, observer, index) as problem:
+                problem.run_budgets(_budgeted_random_search, [3, 10, 30], workers)
+        folders.append(observer.result_folder)
+        observer.free()
+    for path, _, names in os.walk(folders[0]):
+        for name in names:
+            with open(os.path.join(path, name)) as f1, open(
+                    os.path.join(path.replace(folders[0], folders[1], 1), name)) as f2:
+                assert f1.read() == f2.read()
+
 def run_doctests():
     """Run doctests on "all" modules.
 
@@ -130,7 +214,10 @@ def _clean_up(folder, start_matches, protected):
         if d not in protected:
             for name in start_matches:
                 if d.startswith(name):
-                    shutil.rmtree(os.path.join(folder, d))
+                    if os.path.isdir(os.path.join(folder, d)):
+                        shutil.rmtree(os.path.join(folder, d))
+                    else:  # like the ledger of cocoex.runner
+                        os.remove(os.path.join(folder, d))
                     break
 
 
@@ -140,13 +227,18 @@ def main(args):
     run_doctests()
     print('doctests done.\nRunning example_experiment:'), sys.stdout.flush()
     example_experiment.main()
+    run_batch_evaluation_test()
+    run_suite_metadata_test()
+    run_runner_test()
+    run_non_anytime_test()
     if "bbob-constrained" in known_suite_names:
         run_constrained_suite_test()
     for arg in args if args else default_testcases:
         if arg is None or arg == 'None':
             break
         process_testfile(arg) if args or os.path.isfile(arg) else None
-    _clean_up('exdata', ['random_search_on_bbob', 'doctest', 'default'], list_before)
+    _clean_up('exdata', ['random_search_on_bbob', 'doctest', 'default', 'runner_test',
+                         'non_anytime_test'], list_before)
 
 if __name__ == '__main__':
     main(sys.argv[1:])
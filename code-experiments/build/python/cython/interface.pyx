@@ -41,8 +41,8 @@ cdef extern from "coco.h":
     void coco_problem_free(coco_problem_t *problem)
 
     void coco_problem_get_initial_solution(coco_problem_t *problem, double *x)
-    void coco_evaluate_function(coco_problem_t *problem, const double *x, double *y)
-    void coco_evaluate_constraint(coco_problem_t *problem, const double *x, double *y)
+    void coco_evaluate_function(coco_problem_t *problem, const double *x, double *y) nogil
+    void coco_evaluate_constraint(coco_problem_t *problem, const double *x, double *y) nogil
     void coco_recommend_solution(coco_problem_t *problem, const double *x)
 
     int coco_logger_biobj_feed_solution(coco_problem_t *problem, const size_t evaluation, const double *y)
@@ -51,6 +51,12 @@ cdef extern from "coco.h":
 
     coco_problem_t* coco_suite_get_next_problem(coco_suite_t*, coco_observer_t*)
     coco_problem_t* coco_suite_get_problem(coco_suite_t *, const size_t)
+    size_t coco_suite_get_number_of_problems(const coco_suite_t *suite)
+    size_t coco_suite_get_function_from_function_index(const coco_suite_t *suite, const size_t function_idx)
+    size_t coco_suite_get_dimension_from_dimension_index(const coco_suite_t *suite, const size_t dimension_idx)
+    size_t coco_suite_get_instance_from_instance_index(const coco_suite_t *suite, const size_t instance_idx)
+    void coco_suite_decode_problem_index(const coco_suite_t *suite, const size_t problem_index,
+                                         size_t *function_idx, size_t *dimension_idx, size_t *instance_idx)
 
     size_t coco_problem_get_suite_dep_index(const coco_problem_t* problem)
     size_t coco_problem_get_dimension(const coco_problem_t *problem)
@@ -80,6 +86,37 @@ cdef bytes _bstring(s):
 
 cdef coco_observer_t* _current_observer
 
+_suite_metadata = {}  # metadata of each (name, instance, options), see `Suite._initialize`
+
+def _id_format(id, numbers):
+    """return a format string for the problem id's from `id` of the first
+    problem and the ``(function, instance, dimension)`` tuples `numbers`,
+    or `None` if the format is not unique for all `numbers`.
+
+    >>> from cocoex.interface import _id_format
+    >>> _id_format('bbob_f001_i01_d02', [(1, 1, 2), (24, 15, 40)])
+    'bbob_f%03d_i%02d_d%02d'
+    >>> _id_format('suite_f10_i1_d2', [(10, 1, 2), (11, 2, 3)])
+    'suite_f%d_i%d_d%d'
+    >>> _id_format('suite_f10_i1_d2', [(10, 1, 2), (9, 1, 2)]) is None
+    True
+    """
+    import re
+    match = re.match(r'^(.*_f)(\d+)(_i)(\d+)(_d)(\d+)$', id)
+    if not match or tuple(int(match.group(i)) for i in (2, 4, 6)) != tuple(numbers[0]):
+        return None
+    res = match.group(1).replace('%', '%%')
+    for column, (number, separator) in enumerate(zip(match.groups()[1::2],
+                                                     match.groups()[2::2] + ('',))):
+        if number.startswith('0'):  # zero-padded to a fixed width
+            res += '%%0%dd' % len(number)
+        elif all(len(str(n[column])) >= len(number) for n in numbers):
+            res += '%d'  # any width up to len(number) gives the same id's
+        else:
+            return None
+        res += separator.replace('%', '%%')
+    return res
+
 cdef class Suite:
     """see __init__.py"""
     cdef coco_suite_t* suite  # AKA _self
@@ -90,8 +127,9 @@ cdef class Suite:
     cdef current_problem_  # name _current_problem is taken
     cdef _current_index
     cdef _ids
+    cdef _id_index  # index of each id
     cdef _indices
-    cdef _names
+    cdef _metadata  # cached in _suite_metadata
     cdef _dimensions
     cdef _number_of_objectives
     cdef initialized
@@ -108,20 +146,12 @@ cdef class Suite:
         self._initialize()
         assert self.initialized
     cdef _initialize(self):
-        """sweeps through `suite` to collect indices and id's to operate by
-        direct access in the remainder"""
-        cdef np.npy_intp shape[1]  # probably completely useless
+        """collect indices and id's to operate by direct access in the
+        remainder, see `_collect_metadata`"""
         cdef coco_suite_t* suite
-        cdef coco_problem_t* p
-        cdef bytes _old_level
 
         if self.initialized:
             self.reset()
-        self._ids = []
-        self._indices = []
-        self._names = []
-        self._dimensions = []
-        self._number_of_objectives = []
         if self._name not in [_bstring(name) for name in known_suite_names]:
             raise NoSuchSuiteException("""
 Unkown benchmark suite name %s.
@@ -142,21 +172,66 @@ also report back a missing name to https://github.com/numbbo/coco/issues
             raise NoSuchSuiteException("No suite with name '%s' found" % self._name)
         if suite == NULL:
             raise NoSuchSuiteException("No suite with name '%s' found" % self._name)
-        while True:
-            old_level = log_level('warning')
-            p = coco_suite_get_next_problem(suite, NULL)
-            log_level(old_level)
-            if not p:
-                break
-            self._indices.append(coco_problem_get_suite_dep_index(p))
-            self._ids.append(coco_problem_get_id(p))
-            self._names.append(coco_problem_get_name(p))
-            self._dimensions.append(coco_problem_get_dimension(p))
-            self._number_of_objectives.append(coco_problem_get_number_of_objectives(p))
-        coco_suite_free(suite)
-        self.suite = coco_suite(self._name, self._instance, self._options)
+        self.suite = suite
+        key = (self._name, self._instance, self._options)
+        if key not in _suite_metadata:
+            _suite_metadata[key] = self._collect_metadata()
+        self._metadata = _suite_metadata[key]
+        self._indices = self._metadata['indices']
+        self._ids = self._metadata['ids']
+        self._id_index = self._metadata['id_index']
+        self._dimensions = self._metadata['dimensions']
+        self._number_of_objectives = self._metadata['number_of_objectives']
         self.initialized = True
         return self
+    cdef _collect_metadata(self):
+        """return a `dict` with the indices, id's, dimensions and numbers of
+        objectives of the problems in `suite`.
+
+        The indices, functions, dimensions and instances are decoded from
+        the suite without instantiating the problems. The id's are formatted
+        like the id of the first problem, unless the format is ambiguous, and
+        only then all problems are instantiated.
+        """
+        cdef size_t index, function_idx, dimension_idx, instance_idx
+        cdef coco_problem_t* p
+        cdef str id  # copied before the problem is free'd
+        indices, numbers = [], []
+        for index in range(coco_suite_get_number_of_problems(self.suite)):
+            coco_suite_decode_problem_index(self.suite, index, &function_idx,
+                                            &dimension_idx, &instance_idx)
+            number = (coco_suite_get_function_from_function_index(self.suite, function_idx),
+                      coco_suite_get_instance_from_instance_index(self.suite, instance_idx),
+                      coco_suite_get_dimension_from_dimension_index(self.suite, dimension_idx))
+            if all(number):  # 0 if filtered out with the suite options
+                indices.append(index)
+                numbers.append(number)
+        old_level = log_level('warning')
+        p = coco_suite_get_problem(self.suite, indices[0])
+        log_level(old_level)
+        id = coco_problem_get_id(p)
+        number_of_objectives = coco_problem_get_number_of_objectives(p)
+        coco_problem_free(p)
+        id_format = _id_format(id, numbers)
+        if id_format:
+            ids = [id_format % number for number in numbers]
+        else:
+            ids = [self._problem_attribute(index, 'id') for index in indices]
+        return {'indices': indices, 'ids': ids,
+                'id_index': dict((id, i) for i, id in enumerate(ids)),
+                'dimensions': [number[2] for number in numbers],
+                'number_of_objectives': [number_of_objectives],
+                'names': None}  # set in `problem_names`
+    cdef _problem_attribute(self, size_t index, name):
+        """return the id or name of the problem with C index `index`"""
+        cdef coco_problem_t* p
+        cdef str res  # copied before the problem is free'd
+        old_level = log_level('warning')
+        p = coco_suite_get_problem(self.suite, index)
+        log_level(old_level)
+        res = coco_problem_get_id(p) if name == 'id' else coco_problem_get_name(p)
+        coco_problem_free(p)
+        return res
     def reset(self):
         """reset to original state, affecting `next_problem()`,
         `current_problem`, `current_index`"""
@@ -229,7 +304,9 @@ also report back a missing name to https://github.com/numbbo/coco/issues
         try:
             1 / (id == int(id))  # int(id) might raise an exception
         except:
-            index = self._ids.index(id)
+            if id not in self._id_index:
+                raise NoSuchProblemException(self.name, str(id))
+            index = self._id_index[id]
         try:
             return Problem_init(coco_suite_get_problem(self.suite, self._indices[index]),
                                 True, self._name).observe_with(observer)
@@ -368,8 +445,17 @@ also report back a missing name to https://github.com/numbbo/coco/issues
         return self._current_index
     @property
     def problem_names(self):
-        """list of problem names in this `Suite`, see also `ids`"""
-        return list(self._names)
+        """list of problem names in this `Suite`, see also `ids`.
+
+        Details: the names are only known after instantiating all problems
+        on the first call.
+        """
+        if self._metadata['names'] is None:
+            if not self.initialized:
+                raise ValueError("Suite has been finalized/free'ed")
+            self._metadata['names'] = [self._problem_attribute(index, 'name')
+                                       for index in self._indices]
+        return list(self._metadata['names'])
     @property
     def dimensions(self):
         """list of problem dimensions occuring at least once in this `Suite`"""
@@ -490,7 +576,8 @@ cdef class Observer:
         return coco_observer_get_result_folder(self._observer)
 
     def free(self):
-        self.__dealloc__()
+        if self._observer != NULL:  # __dealloc__ is not accessible from Python code
+            coco_observer_free(self._observer)
         self._observer = NULL
         self._state = 'deactivated'
     def __dealloc__(self):
@@ -583,6 +670,12 @@ cdef class Problem:
                                <double *>np.PyArray_DATA(_x),
                                <double *>np.PyArray_DATA(self.constraint_values))
         return np.array(self.constraint_values, copy=True)
+    def constraint_batch(self, X):
+        """return constraint values of the rows of `X`, see __init__.py"""
+        return self._evaluate_batch(X, False, True)[1]
+    def evaluate_with_constraints(self, X):
+        """return objective and constraint values of the rows of `X`, see __init__.py"""
+        return self._evaluate_batch(X, True, True)
     def recommend(self, arx):
         """Recommend a solution, return `None`.
 
@@ -624,6 +717,40 @@ cdef class Problem:
             raise InvalidProblemException()
         return coco_logger_biobj_feed_solution(self.problem, _evaluation, <double *>np.PyArray_DATA(_y))
 
+    def logger_biobj_feed_solutions(self, evaluations, Y):
+        """Feed the given solutions to logger_biobj in order to reconstruct its
+        output, like `logger_biobj_feed_solution` for each evaluation number
+        in `evaluations` and the corresponding row of the 2-D array `Y` of
+        objective values.
+
+        Return the number of solutions that updated the archive.
+        """
+        cdef np.ndarray[double, ndim=2, mode="c"] _Y
+        cdef np.ndarray[np.uint64_t, ndim=1, mode="c"] _evaluations
+        cdef coco_problem_t* problem
+        cdef double* y
+        cdef np.uint64_t* evaluation
+        cdef size_t i, n
+        cdef size_t nobj = self._number_of_objectives
+        cdef size_t updates = 0
+        Y = np.ascontiguousarray(Y, dtype=np.double)
+        evaluations = np.ascontiguousarray(evaluations, dtype=np.uint64)
+        if Y.ndim != 2 or Y.shape[1] != nobj or evaluations.shape != (Y.shape[0],):
+            raise ValueError(
+                "Shapes, `np.shape(evaluations)==%s` and `np.shape(Y)==%s`, " % (
+                    str(np.shape(evaluations)), str(np.shape(Y))) +
+                "are not `(n,)` and `(n, number_of_objectives)` with " +
+                "`number_of_objectives==%d`." % self.number_of_objectives)
+        if self.problem is NULL:
+            raise InvalidProblemException()
+        _Y, _evaluations = Y, evaluations  # this is the final type conversion
+        n = Y.shape[0]
+        problem, y = self.problem, <double *>np.PyArray_DATA(_Y)
+        evaluation = <np.uint64_t *>np.PyArray_DATA(_evaluations)
+        for i in range(n):
+            updates += coco_logger_biobj_feed_solution(problem, <size_t>evaluation[i], y + i * nobj)
+        return updates
+
 
     def add_observer(self, observer):
         """`add_observer(self, observer: Observer)`, see `observe_with`.
@@ -815,6 +942,53 @@ cdef class Problem:
             return self.y_values[0]
         return np.array(self.y_values, copy=True)
 
+    def evaluate_batch(self, X):
+        """return objective function values of the rows of `X`, see __init__.py"""
+        return self._evaluate_batch(X, True, False)[0]
+
+    def _evaluate_batch(self, X, function, constraint):
+        """return objective function values and constraint values of the
+        rows of `X` as 2-D arrays or `None` if not evaluated.
+
+        For each row, the constraints are evaluated before the function.
+        """
+        cdef np.ndarray[double, ndim=2, mode="c"] _X
+        cdef np.ndarray[double, ndim=2, mode="c"] _Y
+        cdef np.ndarray[double, ndim=2, mode="c"] _C
+        cdef coco_problem_t* problem
+        cdef double* x
+        cdef double* y
+        cdef double* c
+        cdef size_t i, n
+        cdef size_t dim = self._number_of_variables
+        cdef size_t nobj = self._number_of_objectives
+        cdef size_t ncon = self._number_of_constraints
+        cdef bint _function = function
+        cdef bint _constraint = constraint and ncon > 0  # prevent Python kernel from dying
+        assert self.initialized
+        X = np.ascontiguousarray(X, dtype=np.double)
+        if X.ndim != 2 or X.shape[1] != dim:
+            raise ValueError(
+                "Shape, `np.shape(X)==%s`, of input `X` is " % str(np.shape(X)) +
+                "not `(n, number_of_variables)` with `number_of_variables==%d`."
+                             % self.number_of_variables)
+        if self.problem is NULL:
+            raise InvalidProblemException()
+        _X = X  # this is the final type conversion
+        n = X.shape[0]
+        _Y = np.zeros((n, nobj if function else 0))
+        _C = np.zeros((n, ncon if constraint else 0))
+        problem, x = self.problem, <double *>np.PyArray_DATA(_X)
+        y, c = <double *>np.PyArray_DATA(_Y), <double *>np.PyArray_DATA(_C)
+        with nogil:  # evaluate one by one as with constraint and __call__
+            for i in range(n):
+                if _constraint:
+                    coco_evaluate_constraint(problem, x + i * dim, c + i * ncon)
+                if _function:
+                    coco_evaluate_function(problem, x + i * dim, y + i * nobj)
+        F = None if not function else _Y[:, 0] if nobj == 1 else _Y
+        return F, (_C if constraint else None)
+
     @property
     def id(self):
         "id as string without spaces or weird characters"
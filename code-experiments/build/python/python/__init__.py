@@ -13,7 +13,7 @@ Help on class Suite...
 [...
 
 A more complete example use case can be found in the `example_experiment.py`
-file.
+file. Module `cocoex.runner` runs an experiment in several processes.
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
 from . import solvers, utilities
@@ -435,6 +435,36 @@ class Problem(_interface.Problem):
         """
         return super(Problem, self).constraint(x)
 
+    def constraint_batch(self, X):
+        """return constraint values of the rows of the 2-D array `X`.
+
+        Return an array of shape ``(len(X), number_of_constraints)``,
+        evaluated like ``[self.constraint(x) for x in X]``. For zero
+        constraints, nothing is evaluated and the array is empty.
+        """
+        return super(Problem, self).constraint_batch(X)
+
+    def evaluate_with_constraints(self, X):
+        """return objective function values and constraint values of the
+        rows of the 2-D array `X`.
+
+        Return the tuple of the arrays from `evaluate_batch` and from
+        `constraint_batch`. For each row, the constraints are evaluated
+        before the objective function.
+        """
+        return super(Problem, self).evaluate_with_constraints(X)
+
+    def evaluate_batch(self, X):
+        """return objective function values of the rows of the 2-D array `X`.
+
+        Return an array of shape ``(len(X),)`` or, for more than one
+        objective, ``(len(X), number_of_objectives)``. The rows are
+        evaluated in the given order in one call, with the same result,
+        evaluation count and observer output as with ``[self(x) for x
+        in X]``.
+        """
+        return super(Problem, self).evaluate_batch(X)
+
     def logger_biobj_feed_solution(self, evaluation, y):
         """Feed the given solution to logger_biobj in order to reconstruct its
         output.
@@ -0,0 +1,370 @@
+"""Run a benchmarking experiment in several processes.
+
+`run` distributes the problems of a `Suite` to a pool of worker
+processes and merges the data written by the workers into a single
+result folder, which can be post-processed like the output of a single
+`Observer`::
+
+    import cocoex, cocoex.runner
+    folder = cocoex.runner.run(cocoex.solvers.random_search, 'bbob', 100)
+    # post-process with: python -m cocopp <folder>
+
+The solver is called like `solvers.random_search`, that is, as
+``solver(problem, problem.lower_bounds, problem.upper_bounds, budget)``,
+and repeatedly called until the budget is exhausted or the final target
+is hit. With the usual ``spawn`` start method of `multiprocessing`
+(Windows and macOS), the solver must be picklable, for example a
+function defined at module level, and scripts must guard the `run`
+call with ``if __name__ == '__main__':``.
+
+The identifiers of all problems whose data are in the result folder
+are recorded in a ledger file next to it. An interrupted experiment is
+continued with the same call and ``resume=True``, which skips the
+recorded problems::
+
+    folder = cocoex.runner.run(cocoex.solvers.random_search, 'bbob', 1e5,
+                               resume=True)
+"""
+from __future__ import absolute_import, division, print_function
+import os
+import re
+import glob
+import shutil
+import time
+import multiprocessing
+import numpy as np
+from . import Suite, Observer, default_observers, log_level
+from .utilities import ObserverOptions, MiniPrint, ascetime
+del absolute_import, division, print_function
+
+_suites = {}  # suites of a worker process, see `_get_suite`
+
+
+def run(solver, suite_name, budget_multiplier, workers=None,
+        suite_instance='', suite_options='', observer_options=None,
+        max_runs=1e9, result_folder=None, resume=False, verbose=True):
+    """benchmark `solver` on all problems of a `Suite` with `workers`
+    processes and return the result folder.
+
+    The budget of each problem is ``budget_multiplier * dimension``
+    evaluations. `workers` defaults to the number of CPUs.
+    `observer_options` is a `dict` of further options for the
+    `Observer`, like ``{'algorithm_info': '"my solver"'}``.
+
+    The problems are distributed in units of all instances of the same
+    function and dimension, the units with the largest cost, estimated
+    as dimension times budget of the unit, that is, as squared dimension
+    times number of problems, first. Each unit is observed with its own
+    `Observer`. As soon as the unit is done, its problem identifiers are
+    appended to the ledger file ``exdata/result_folder.ledger`` and its
+    result folder is merged into ``exdata/result_folder`` with
+    `merge_result_folders`.
+
+    If `resume`, the existing ``exdata/result_folder`` or
+    ``exdata/result_folder-001``... with a ledger is continued and the
+    problems in its ledger are skipped, otherwise a new folder is
+    created. Units whose merge was interrupted are merged again, while
+    the data of units which were not done when the experiment was
+    interrupted are removed, hence these problems are run anew and the
+    result folder contains only completed trials. The other arguments
+    must be the same as in the interrupted call.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if result_folder is None:
+        result_folder = '%s_on_%s_budget%04dxD' % (
+            solver.__name__, suite_name, budget_multiplier)
+    result_folder = _result_folder(os.path.join('exdata', result_folder), resume)
+    unit_name = os.path.basename(result_folder) + '_unit%04d'
+    ledger = result_folder + '.ledger'
+    finished = read_ledger(ledger, (solver.__name__, suite_name, suite_instance,
+                                    suite_options, budget_multiplier))
+    if resume:
+        _recover(result_folder, ledger)
+    options = ObserverOptions(observer_options or {})
+    options.update_gracefully({'algorithm_name': solver.__name__})
+    suite = Suite(suite_name, suite_instance, suite_options)
+    ids = suite.ids()
+    units = [(dimension, [i for i in indices if ids[i] not in finished])
+             for dimension, indices in problem_units(suite)]
+    units = [unit for unit in units if unit[1]]
+    if resume:  # remove the merged data of problems which are not in the ledger
+        remove_data(result_folder, [_function_dimension(ids[unit[1][0]]) for unit in units])
+    suite.free()
+    units.sort(key=lambda unit: -unit[0]**2 * len(unit[1]))
+    tasks = [(solver, suite_name, suite_instance, suite_options,
+              default_observers()[suite_name], dict(options, result_folder=
+                  '"%s"' % (unit_name % i)),
+              indices, budget_multiplier, max_runs)
+             for i, (_, indices) in enumerate(units)]
+    if verbose:
+        print("Benchmarking solver '%s' with budget=%s*dimension on %s suite "
+              "with %d processes, %s" % (solver.__name__, str(budget_multiplier),
+                                         suite_name, workers, time.asctime()))
+        if finished:
+            print('  %d problems already done in %s' % (len(finished), result_folder))
+    t0 = time.time()
+    done, total = 0, sum(len(unit[1]) for unit in units)
+    mini_print = MiniPrint()
+    pool = multiprocessing.Pool(workers) if workers > 1 and total else None
+    try:
+        for folder, records in (pool.imap_unordered(_run_unit, tasks) if pool
+                                else map(_run_unit, tasks)):
+            _append_to_ledger(ledger, ['# merging ' + folder] +
+                              [record.id for record in records])
+            merge_result_folders([folder], result_folder)
+            shutil.rmtree(folder)
+            _append_to_ledger(ledger, ['# merged ' + folder])
+            for record in records:
+                done += 1
+                if verbose:
+                    mini_print(record, final=done == total,
+                               restarted=record.runs > 1)
+    except BaseException:
+        if pool:  # don't wait for the remaining units
+            pool.terminate()
+        raise
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    if verbose:
+        print("  %s done (%d problems benchmarked), %s (%s total elapsed time)."
+              % (suite_name, done, time.asctime(), ascetime(time.time() - t0)))
+        print('Data written to folder', result_folder)
+    return result_folder
+
+
+def problem_units(suite):
+    """return a `list` of ``(dimension, indices)`` of the problems in
+    `suite` with the same function and dimension.
+    """
+    units = {}
+    for index, id in enumerate(suite.ids()):
+        function, dimension = _function_dimension(id)
+        units.setdefault((dimension, function), []).append(index)
+    return [(key[0], units[key]) for key in sorted(units)]
+
+
+def _function_dimension(id):
+    """return function and dimension of problem `id`"""
+    match = re.search(r'_f(\d+)_i\d+_d(\d+)', id)
+    return int(match.group(1)), int(match.group(2))
+
+
+def read_ledger(filename, setup):
+    """return the `set` of problem identifiers in ledger `filename`.
+
+    A new ledger is created if `filename` does not exist. `setup` is a
+    `tuple` describing the experiment and must be the same as in the
+    first line of the ledger. The other lines starting with ``#`` mark
+    the merging of units, see `run`.
+    """
+    if not os.path.exists(filename):
+        if not os.path.isdir(os.path.dirname(filename) or '.'):
+            os.makedirs(os.path.dirname(filename))
+        with open(filename, 'w') as f:
+            f.write('# %s\n' % repr(setup))
+        return set()
+    with open(filename) as f:
+        lines = f.read().splitlines()
+    if lines[0] != '# %s' % repr(setup):
+        raise ValueError('the experiment in %s does not match\n  %s\nbut is\n  %s'
+                         % (filename, repr(setup), lines[0][2:]))
+    return set(line for line in lines[1:] if not line.startswith('#'))
+
+
+def _append_to_ledger(filename, ids):
+    """append problem `ids` to ledger `filename` and write it to disk"""
+    with open(filename, 'a') as f:
+        f.write(''.join(id + '\n' for id in ids))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def merge_result_folders(folders, result_folder):
+    """move the data from `folders` into `result_folder`.
+
+    The `folders` and `result_folder` must not contain data of the same
+    function and dimension, as with the units of `run`. Index files with
+    the same name are concatenated, all other files must have different
+    names. Merging a folder again after an interrupted merge gives the
+    same result as a single merge.
+    """
+    for folder in folders:
+        for path, _, names in os.walk(folder):
+            target_path = os.path.join(result_folder, os.path.relpath(path, folder))
+            if not os.path.isdir(target_path):
+                os.makedirs(target_path)
+            for name in sorted(names):
+                target = os.path.join(target_path, name)
+                if name.endswith('.info') and os.path.exists(target):
+                    _append_info_file(os.path.join(path, name), target)
+                elif os.path.exists(target):
+                    raise ValueError('%s exists in more than one folder' %
+                                     os.path.relpath(target, result_folder))
+                else:  # a rename within exdata, which moves the file or not
+                    shutil.move(os.path.join(path, name), target)
+
+
+def remove_data(result_folder, keys):
+    """remove the data of the ``(function, dimension)`` `keys` from
+    `result_folder`.
+
+    The entries of these functions and dimensions are removed from the
+    index files and the data files with these functions and dimensions
+    in their name are deleted.
+    """
+    keys = set(keys)
+    for path, _, names in os.walk(result_folder):
+        for name in names:
+            filename = os.path.join(path, name)
+            if name.endswith('.info'):
+                _remove_info_entries(filename, keys)
+                continue
+            match = re.search(r'_f0*(\d+)_(?:i\d+_)?(?:DIM|d)0*(\d+)[_.]', name)
+            if match and (int(match.group(1)), int(match.group(2))) in keys:
+                os.remove(filename)
+
+
+def _remove_info_entries(filename, keys):
+    """remove the entries of the ``(function, dimension)`` `keys` from
+    index file `filename` and the file if no entries are left"""
+    with open(filename) as f:
+        lines = f.read().splitlines()
+    kept, entries, remove = [], 0, False
+    for line in lines:
+        match = (re.search(r'funcId = *(\d+), DIM = *(\d+)', line) or  # bbob logger header
+                 re.match(r'function = *(\d+), dim = *(\d+),', line))  # bbob-biobj logger entry
+        if match:
+            remove = (int(match.group(1)), int(match.group(2))) in keys
+            entries += not remove
+        elif line.startswith('suite'):  # single header of the bbob-biobj logger
+            remove = False
+        if not remove:
+            kept.append(line)
+    if not entries:
+        os.remove(filename)
+    elif len(kept) < len(lines):
+        _write_file(filename, '\n'.join(kept) + '\n')
+
+
+def _append_info_file(source, target):
+    """append index file `source` to `target`, where an index file with
+    a single header for all entries, like from the ``bbob-biobj``
+    logger, keeps its single header. Nothing is appended if `target`
+    already contains the entries of `source`."""
+    with open(source) as f:
+        lines = f.read().splitlines()
+    with open(target) as f:
+        target_lines = f.read().splitlines()
+    if 'indicator' in lines[0] and lines[0] == target_lines[0]:
+        lines = lines[2:]  # header and comment line
+    if '\n'.join(lines) in '\n'.join(target_lines):  # merged before
+        return
+    _write_file(target, '\n'.join(target_lines + lines) + '\n')
+
+
+def _write_file(filename, text):
+    """replace the content of `filename` with `text` without leaving a
+    partially written file"""
+    with open(filename + '.tmp', 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    getattr(os, 'replace', os.rename)(filename + '.tmp', filename)
+
+
+def _result_folder(folder, resume):
+    """return the result folder of `run`, namely with `resume` the
+    single one of `folder`, ``folder-001``... with a ledger and
+    otherwise a new folder"""
+    if resume:
+        folders = [name for name in [folder] + sorted(glob.glob(folder + '-[0-9][0-9][0-9]'))
+                   if os.path.exists(name + '.ledger')]
+        if len(folders) > 1:
+            raise ValueError('cannot resume, the result folders %s all have a ledger, '
+                             'remove or rename all but one' % str(folders))
+        if folders:
+            return folders[0]
+    return _unique_folder(folder)
+
+
+def _recover(result_folder, ledger):
+    """merge the unit folders of `result_folder` whose merge was
+    interrupted according to `ledger` and remove all other unit folders,
+    which contain the data of interrupted units"""
+    with open(ledger) as f:
+        lines = f.read().splitlines()
+    merging = [line[len('# merging '):] for line in lines if line.startswith('# merging ')]
+    merged = set(line[len('# merged '):] for line in lines if line.startswith('# merged '))
+    for folder in merging:
+        if folder not in merged:
+            if os.path.isdir(folder):  # otherwise removed after the merge
+                merge_result_folders([folder], result_folder)
+                shutil.rmtree(folder)
+            _append_to_ledger(ledger, ['# merged ' + folder])
+    for folder in glob.glob(result_folder + '_unit*'):
+        if re.match(r'_unit\d{4}(-\d{3})?$', folder[len(result_folder):]):
+            shutil.rmtree(folder)
+
+
+def _unique_folder(folder):
+    """return `folder` or, if it exists, the first non-existing
+    ``folder-001``, ``folder-002``..."""
+    name, i = folder, 0
+    while os.path.exists(name):
+        i += 1
+        name = '%s-%03d' % (folder, i)
+    return name
+
+
+class _ProblemRecord(object):
+    """picklable summary of a benchmarked problem, for `MiniPrint`"""
+    def __init__(self, problem, runs):
+        self.id = problem.id
+        self.dimension = problem.dimension
+        self.final_target_hit = problem.final_target_hit
+        self.evaluations = problem.evaluations + problem.evaluations_constraints
+        self.runs = runs
+
+
+def _get_suite(suite_name, suite_instance, suite_options):
+    """return a `Suite` instance, created only once per process"""
+    key = (suite_name, suite_instance, suite_options)
+    if key not in _suites:
+        _suites[key] = Suite(suite_name, suite_instance, suite_options)
+    return _suites[key]
+
+
+def _run_unit(task):
+    """benchmark the problems of a unit of `run` in a new `Observer`,
+    return its result folder and a `list` of `_ProblemRecord`"""
+    (solver, suite_name, suite_instance, suite_options, observer_name,
+     observer_options, indices, budget_multiplier, max_runs) = task
+    np.random.seed()  # forked processes have the same random state
+    log_level('warning')  # no output folder info from each unit
+    suite = _get_suite(suite_name, suite_instance, suite_options)
+    observer = Observer(observer_name, ObserverOptions(observer_options).as_string)
+    records = []
+    for index in indices:
+        problem = suite.get_problem(index, observer)
+        runs = _optimize(solver, problem, budget_multiplier * problem.dimension, max_runs)
+        records.append(_ProblemRecord(problem, runs))
+        problem.free()
+    folder = observer.result_folder
+    observer.free()
+    return folder, records
+
+
+def _optimize(solver, problem, max_evals, max_runs):
+    """call `solver` on `problem` until `max_evals` are exhausted, the
+    final target is hit, `max_runs` calls are done or a call did not
+    evaluate `problem`, return the number of calls"""
+    for runs in range(1, int(max_runs) + 1):
+        remaining_evals = max_evals - problem.evaluations - problem.evaluations_constraints
+        solver(problem, problem.lower_bounds, problem.upper_bounds, remaining_evals)
+        still_remaining = max_evals - problem.evaluations - problem.evaluations_constraints
+        if still_remaining <= 0 or problem.final_target_hit or still_remaining >= remaining_evals:
+            break
+    return runs
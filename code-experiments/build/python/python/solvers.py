@@ -16,10 +16,11 @@ def random_search(fun, lbounds, ubounds, budget):
         # about five times faster than "for k in range(budget):..."
         X = lbounds + (ubounds - lbounds) * np.random.rand(chunk, dim)
         if fun.number_of_constraints > 0:
-            C = [fun.constraint(x) for x in X]  # call constraints
-            F = [fun(x) for i, x in enumerate(X) if np.all(C[i] <= 0)]
+            C = fun.constraint_batch(X)  # call constraints
+            X = X[np.all(C <= 0, axis=1)]  # evaluate only feasible solutions
+            F = fun.evaluate_batch(X)
         else:
-            F = [fun(x) for x in X]
+            F = fun.evaluate_batch(X)
         if fun.number_of_objectives == 1:
             index = np.argmin(F) if len(F) else None
             if index is not None and (f_min is None or F[index] < f_min):
@@ -65,7 +65,7 @@ def args_to_dict(args, known_names, specials=None, split='=',
     def eval_value(value):
         try:
             return _ast.literal_eval(value)
-        except ValueError:
+        except (ValueError, SyntaxError):  # like a file name
             return value
     res = {}
     for arg in args:
@@ -101,6 +101,12 @@ class ObserverOptions(dict):
     See http://numbbo.github.io/coco-doc/C/#observer-parameters
     for details on the available (C-based) options.
 
+    For example, with cheap functions, the logger output is buffered in
+    memory, written when 64KB are reached or 10 seconds have passed and
+    always at the end of each trial, with::
+
+        ObserverOptions({'buffer_size': 2**16, 'flush_interval': 10})
+
     Details: When the `Observer` class in future accepts a dictionary
     also, this class becomes superfluous and could be replaced by a method
     `default_observer_options` similar to `default_observers`.
@@ -157,6 +163,16 @@ class ProblemNonAnytime(object):
     other unobserved. It switches from unobserved to observed when
     ``p_unobserved.evaluations >= p_observed.evaluations``.
 
+    The budgets can also be run concurrently in worker processes with
+    `run_budgets`::
+
+        for index in range(len(suite)):
+            with ProblemNonAnytime(suite, observer, index) as problem:
+                problem.run_budgets(fmin, budget_list, workers=4)
+
+    where ``x = fmin(problem, budget)`` must be picklable, see
+    `cocoex.runner`.
+
     """
     inherited_constant_attributes = [
             'dimension',
@@ -173,6 +189,7 @@ class ProblemNonAnytime(object):
 
     def __init__(self, suite, observer, index):
         self.suite = suite
+        self._suite_index = index  # self.index is the index of the C suite
         self.p_unobserved = suite[index]
         self.p_observed = suite[index].add_observer(observer)
         self._p = self.p_observed
@@ -219,6 +236,49 @@ class ProblemNonAnytime(object):
         self.evaluations = 0
         self._p = self.p_unobserved
 
+    def run_budgets(self, fmin, budget_list, workers=1):
+        """run ``x = fmin(problem, budget)`` and `delivered` for each
+        budget in increasing order until the final target is hit.
+
+        With ``workers > 1``, `fmin` is run for all budgets concurrently
+        in a pool of worker processes on unobserved problems, which
+        record the evaluated solutions. These are replayed in budget
+        order, where only the solutions which the serial protocol would
+        evaluate on the observed problem are evaluated again. If `fmin`
+        is deterministic for a given budget, the logged data are then the
+        same as with ``workers=1``. `fmin` must be picklable, for example
+        a function defined at module level.
+
+        Return the number of budgets run, which is smaller than
+        ``len(budget_list)`` if the final target was hit.
+        """
+        budget_list = sorted(budget_list)
+        if workers <= 1:
+            for i, budget in enumerate(budget_list):
+                self.delivered(fmin(self, budget))
+                if self.final_target_hit:
+                    return i + 1
+            return len(budget_list)
+        import multiprocessing
+        suite = (self.suite.name, self.suite.instance, self.suite.options)
+        pool = multiprocessing.Pool(min(workers, len(budget_list)))
+        try:
+            for i, (X, x) in enumerate(pool.imap(
+                    _run_budget, [(fmin, suite, self._suite_index, budget)
+                                  for budget in budget_list])):
+                # the first evaluations were already observed with the
+                # previous budgets, see __call__
+                self.evaluations = min(len(X), self.p_observed.evaluations)
+                for xi in X[self.evaluations:]:
+                    self(xi)
+                self.delivered(x)
+                if self.final_target_hit:
+                    return i + 1
+        finally:
+            pool.terminate()  # don't wait for the remaining budgets
+            pool.join()
+        return len(budget_list)
+
     def free(self):
         self.p_observed.free()
         self.p_unobserved.free()
@@ -254,6 +314,32 @@ class ProblemNonAnytime(object):
             * (self.upper_bounds - self.lower_bounds) / 2)
 
 
+class _RecordingProblem(object):
+    """unobserved problem which records the evaluated solutions"""
+    def __init__(self, problem):
+        self._problem = problem
+        self.solutions = []
+
+    def __call__(self, x, *args, **kwargs):
+        self.solutions.append(np.array(x, copy=True))
+        return self._problem(x, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._problem, name)
+
+
+def _run_budget(task):
+    """return the evaluated solutions and the delivered solution of
+    ``fmin(problem, budget)`` in a worker of
+    `ProblemNonAnytime.run_budgets`"""
+    from .runner import _get_suite
+    fmin, suite, index, budget = task
+    problem = _RecordingProblem(_get_suite(*suite)[index])
+    x = fmin(problem, budget)
+    problem.free()
+    return problem.solutions, x
+
+
 class SameFunction:
     """Count the number of consecutive instances of the same function.
 
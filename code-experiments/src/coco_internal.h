@@ -194,6 +194,8 @@ struct coco_observer_s {
   int precision_f;           /**< @brief Output precision for function values. */
   int precision_g;           /**< @brief Output precision for constraint values. */
   int log_discrete_as_int;   /**< @brief Whether to output discrete variables in int or double format. */
+  size_t buffer_size;        /**< @brief Size of the output buffer of log files in bytes (0: flush each line). */
+  double flush_interval;     /**< @brief Seconds after which buffered log files are flushed (0: never). */
   void *data;                /**< @brief Void pointer that can be used to point to data specific to an observer. */
 
   coco_data_free_function_t data_free_function;             /**< @brief  The function for freeing this observer. */
@@ -8,6 +8,7 @@
 #include <limits.h>
 #include <float.h>
 #include <math.h>
+#include <time.h>
 
 /**
  * @brief The type for triggers based on target values.
@@ -282,6 +283,115 @@ static void coco_observer_evaluations_free(coco_observer_evaluations_t *evaluati
 
 /***********************************************************************************************************/
 
+/**
+ * @brief The type for the buffering of log files.
+ *
+ * Log files without buffering are flushed after each line, so that impatient users can see progress. With
+ * buffering, the output is kept in memory until the buffer is full, the file is closed or flush_interval
+ * seconds have passed since the last flush.
+ */
+typedef struct {
+
+  size_t buffer_size;         /**< @brief Size of the buffer of each log file in bytes (0: no buffering). */
+  double flush_interval;      /**< @brief Seconds after which buffered log files are flushed (0: never). */
+  time_t flush_time;          /**< @brief Time of the last flush. */
+  char **buffers;             /**< @brief The buffers of the log files. */
+  size_t number_of_buffers;   /**< @brief The number of buffers. */
+
+} coco_observer_buffering_t;
+
+/**
+ * @name Methods regarding the buffering of log files.
+ */
+/**@{*/
+
+/**
+ * @brief Creates and returns a structure containing information on the buffering of log files.
+ *
+ * @note The coco_observer_buffering_t object instances need to be freed using the
+ * coco_observer_buffering_free function after all buffered files are closed!
+ */
+static coco_observer_buffering_t *coco_observer_buffering(const size_t buffer_size,
+                                                          const double flush_interval) {
+
+  coco_observer_buffering_t *buffering;
+  buffering = (coco_observer_buffering_t *) coco_allocate_memory(sizeof(*buffering));
+
+  buffering->buffer_size = buffer_size;
+  buffering->flush_interval = flush_interval;
+  buffering->flush_time = time(NULL);
+  buffering->buffers = NULL;
+  buffering->number_of_buffers = 0;
+
+  return buffering;
+}
+
+/**
+ * @brief Sets a buffer of buffering->buffer_size bytes for the given file if buffering is on.
+ *
+ * Must be called before anything is written to the file.
+ */
+static void coco_observer_buffering_set(coco_observer_buffering_t *buffering, FILE *file) {
+
+  char **buffers;
+  size_t i;
+
+  if (buffering->buffer_size == 0)
+    return;
+
+  buffers = (char **) coco_allocate_memory((buffering->number_of_buffers + 1) * sizeof(char *));
+  for (i = 0; i < buffering->number_of_buffers; i++)
+    buffers[i] = buffering->buffers[i];
+  buffers[i] = (char *) coco_allocate_memory(buffering->buffer_size);
+  if (buffering->buffers != NULL)
+    coco_free_memory(buffering->buffers);
+  buffering->buffers = buffers;
+  buffering->number_of_buffers++;
+
+  if (setvbuf(file, buffers[i], _IOFBF, buffering->buffer_size) != 0)
+    coco_warning("coco_observer_buffering_set(): could not set the buffer of a log file");
+}
+
+/**
+ * @brief Flushes the given file after a line was logged.
+ *
+ * Without buffering, the file is always flushed. With buffering, all files are flushed if flush_interval
+ * seconds have passed since the last flush.
+ */
+static void coco_observer_buffering_flush(coco_observer_buffering_t *buffering, FILE *file) {
+
+  time_t now;
+
+  if (buffering->buffer_size == 0) {
+    fflush(file);
+  } else if (buffering->flush_interval > 0) {
+    now = time(NULL);
+    if (difftime(now, buffering->flush_time) >= buffering->flush_interval) {
+      fflush(NULL);
+      buffering->flush_time = now;
+    }
+  }
+}
+
+/**
+ * @brief Frees the given buffering object including its buffers.
+ */
+static void coco_observer_buffering_free(coco_observer_buffering_t *buffering) {
+
+  size_t i;
+
+  assert(buffering != NULL);
+  for (i = 0; i < buffering->number_of_buffers; i++)
+    coco_free_memory(buffering->buffers[i]);
+  if (buffering->buffers != NULL)
+    coco_free_memory(buffering->buffers);
+  coco_free_memory(buffering);
+}
+
+/**@}*/
+
+/***********************************************************************************************************/
+
 /**
  * @brief Allocates memory for a coco_observer_t instance.
  */
@@ -296,7 +406,9 @@ static coco_observer_t *coco_observer_allocate(const char *result_folder,
                                                const int precision_x,
                                                const int precision_f,
                                                const int precision_g,
-                                               const int log_discrete_as_int) {
+                                               const int log_discrete_as_int,
+                                               const size_t buffer_size,
+                                               const double flush_interval) {
 
   coco_observer_t *observer;
   observer = (coco_observer_t *) coco_allocate_memory(sizeof(*observer));
@@ -313,6 +425,8 @@ static coco_observer_t *coco_observer_allocate(const char *result_folder,
   observer->precision_f = precision_f;
   observer->precision_g = precision_g;
   observer->log_discrete_as_int = log_discrete_as_int;
+  observer->buffer_size = buffer_size;
+  observer->flush_interval = flush_interval;
   observer->data = NULL;
   observer->data_free_function = NULL;
   observer->logger_allocate_function = NULL;
@@ -397,6 +511,14 @@ void coco_observer_free(coco_observer_t *observer) {
  * of digits to be printed after the decimal point. The default value is 3.
  * - "log_discrete_as_int: VALUE" determines whether the values of integer variables (in mixed-integer problems)
  * are logged as integers (1) or not (0 - in this case they are logged as doubles). The default value is 0.
+ * - "buffer_size: VALUE" defines the size in bytes of the output buffer of each log file that is otherwise
+ * flushed after every line (the .dat, .tdat and .rdat files of the "bbob" observer and the .adat files of the
+ * "bbob-biobj" observer). Buffered files are written when the buffer is full and when the problem is freed,
+ * that is, at the end of each trial. The file contents are the same as without buffering. The default value
+ * is 0 (no buffering).
+ * - "flush_interval: VALUE" defines the number of seconds after which buffered log files are flushed
+ * when a line is logged. The default value is 0 (buffered log files are only flushed when the buffer is
+ * full and at the end of the trial).
  *
  * @return The constructed observer object or NULL if observer_name equals NULL, "" or "no_observer".
  */
@@ -406,6 +528,8 @@ coco_observer_t *coco_observer(const char *observer_name, const char *observer_o
   char *path, *result_folder, *algorithm_name, *algorithm_info;
   const char *outer_folder_name = "exdata";
   int precision_x, precision_f, precision_g, log_discrete_as_int;
+  size_t buffer_size;
+  double flush_interval;
 
   size_t number_target_triggers;
   size_t number_evaluation_triggers;
@@ -418,7 +542,7 @@ coco_observer_t *coco_observer(const char *observer_name, const char *observer_o
    * IMPORTANT: This list should be up-to-date with the code and the documentation */
   const char *known_keys[] = { "result_folder", "algorithm_name", "algorithm_info",
       "number_target_triggers", "target_precision", "number_evaluation_triggers", "base_evaluation_triggers",
-      "precision_x", "precision_f", "precision_g", "log_discrete_as_int" };
+      "precision_x", "precision_f", "precision_g", "log_discrete_as_int", "buffer_size", "flush_interval" };
   additional_option_keys = NULL; /* To be set by the chosen observer */
 
   if (0 == strcmp(observer_name, "no_observer")) {
@@ -498,9 +622,18 @@ coco_observer_t *coco_observer(const char *observer_name, const char *observer_o
       log_discrete_as_int = 0;
   }
 
+  buffer_size = 0;
+  coco_options_read_size_t(observer_options, "buffer_size", &buffer_size);
+
+  flush_interval = 0;
+  if (coco_options_read_double(observer_options, "flush_interval", &flush_interval) != 0) {
+    if (flush_interval < 0)
+      flush_interval = 0;
+  }
+
   observer = coco_observer_allocate(path, observer_name, algorithm_name, algorithm_info,
       number_target_triggers, target_precision, number_evaluation_triggers, base_evaluation_triggers,
-      precision_x, precision_f, precision_g, log_discrete_as_int);
+      precision_x, precision_f, precision_g, log_discrete_as_int, buffer_size, flush_interval);
 
   coco_free_memory(path);
   coco_free_memory(result_folder);
@@ -374,7 +374,7 @@ size_t coco_suite_get_instance_from_instance_index(const coco_suite_t *suite, co
     return 0; /* Never reached*/
   }
 
- return suite->functions[instance_idx];
+ return suite->instances[instance_idx];
 }
 
 void coco_suite_free(coco_suite_t *suite) {
@@ -82,11 +82,13 @@ typedef struct {
   size_t number_of_variables;
   size_t number_of_integer_variables;
   int log_discrete_as_int;            /**< @brief Whether to output discrete variables in int or double format. */
+  int binary_data;                    /**< @brief Whether to write binary instead of text data files. */
   double optimal_fvalue;
   char *suite_name;
 
   coco_observer_targets_t *targets;          /**< @brief Triggers based on target values. */
   coco_observer_evaluations_t *evaluations;  /**< @brief Triggers based on the number of evaluations. */
+  coco_observer_buffering_t *buffering;      /**< @brief Buffering of the data files. */
 
 } logger_bbob_data_t;
 
@@ -138,6 +140,27 @@ static const char *bbob_file_header_str = "%% "
 
 static const char *logger_name = "bbob";
 static const char *data_format = "bbob-new2"; /* back to 5 columns, 5-th column writes single digit constraint values */
+static const char *binary_data_format = "bbob-binary"; /* records of the first four columns of bbob-new2 */
+
+/**
+ * writes values as little-endian doubles, see observer_bbob for the binary data format
+ */
+static void logger_bbob_write_binary(FILE *target_file, const double *values, size_t number_of_values) {
+  const unsigned int one = 1;
+  const int is_little_endian = *((const unsigned char *) &one) == 1;
+  unsigned char bytes[sizeof(double)];
+  size_t i, j;
+
+  if (is_little_endian) {
+    fwrite(values, sizeof(double), number_of_values, target_file);
+    return;
+  }
+  for (i = 0; i < number_of_values; ++i) {
+    for (j = 0; j < sizeof(double); ++j)
+      bytes[j] = ((const unsigned char *) &values[i])[sizeof(double) - 1 - j];
+    fwrite(bytes, 1, sizeof(double), target_file);
+  }
+}
 
 /**
  * adds a formated line to a data file
@@ -153,8 +176,18 @@ static void logger_bbob_write_data(FILE *target_file,
                                    size_t number_of_integer_variables,
                                    const double *constraints,
                                    size_t number_of_constraints,
-                                   const int log_discrete_as_int) {
+                                   const int log_discrete_as_int,
+                                   const int binary_data) {
   size_t i;
+  if (binary_data) {
+    double record[4];
+    record[0] = (double) number_of_f_evaluations;
+    record[1] = (double) number_of_cons_evaluations;
+    record[2] = best_fvalue - best_value;
+    record[3] = fvalue;
+    logger_bbob_write_binary(target_file, record, 4);
+    return;
+  }
   /* for some reason, it's %.0f in the old code instead of the 10.9e
    * in the documentation
    */
@@ -181,11 +214,6 @@ static void logger_bbob_write_data(FILE *target_file,
     }
   }
   fprintf(target_file, "\n");
-
-  /* Flush output so that impatient users can see progress.
-   * Otherwise it can take a long time until the output appears.
-   */
-  fflush(target_file);
 }
 
 /**
@@ -209,7 +237,9 @@ static void logger_bbob_error_io(FILE *path, int errnum) {
 static void logger_bbob_open_dataFile(FILE **target_file,
                                       const char *path,
                                       const char *dataFile_path,
-                                      const char *file_extension) {
+                                      const char *file_extension,
+                                      const char *mode,
+                                      coco_observer_buffering_t *buffering) {
   char file_path[COCO_PATH_MAX + 2] = { 0 };
   char relative_filePath[COCO_PATH_MAX + 2] = { 0 };
   int errnum;
@@ -219,11 +249,12 @@ static void logger_bbob_open_dataFile(FILE **target_file,
   COCO_PATH_MAX - strlen(relative_filePath) - 1);
   coco_join_path(file_path, sizeof(file_path), path, relative_filePath, NULL);
   if (*target_file == NULL) {
-    *target_file = fopen(file_path, "a+");
+    *target_file = fopen(file_path, mode);
     errnum = errno;
     if (*target_file == NULL) {
       logger_bbob_error_io(*target_file, errnum);
     }
+    coco_observer_buffering_set(buffering, *target_file);
   }
 }
 
@@ -352,13 +383,14 @@ static void logger_bbob_openIndexFile(logger_bbob_data_t *logger,
               logger->observer->algorithm_name,
               coco_version,
               logger_name,
-              data_format);
+              logger->binary_data ? binary_data_format : data_format);
 
       fprintf(*target_file, "%%\n");
       strncat(used_dataFile_path, "_i", COCO_PATH_MAX - strlen(used_dataFile_path) - 1);
       strncat(used_dataFile_path, bbob_infoFile_firstInstance_char,
       COCO_PATH_MAX - strlen(used_dataFile_path) - 1);
-      fprintf(*target_file, "%s.dat", used_dataFile_path); /* dataFile_path does not have the extension */
+      fprintf(*target_file, "%s%s", used_dataFile_path, /* dataFile_path does not have the extension */
+              logger->binary_data ? ".bdat" : ".dat");
       bbob_current_dim = logger->number_of_variables;
       bbob_current_funId = logger->function_id;
     }
@@ -412,13 +444,22 @@ static void logger_bbob_initialize(logger_bbob_data_t *logger, coco_problem_t *i
   strncat(dataFile_path, bbob_infoFile_firstInstance_char,
   COCO_PATH_MAX - strlen(dataFile_path) - 1);
 
-  logger_bbob_open_dataFile(&(logger->fdata_file), logger->observer->result_folder, dataFile_path, ".dat");
-  fprintf(logger->fdata_file, bbob_file_header_str, logger->optimal_fvalue);
-
-  logger_bbob_open_dataFile(&(logger->tdata_file), logger->observer->result_folder, dataFile_path, ".tdat");
-  fprintf(logger->tdata_file, bbob_file_header_str, logger->optimal_fvalue);
+  logger_bbob_open_dataFile(&(logger->fdata_file), logger->observer->result_folder, dataFile_path,
+      logger->binary_data ? ".bdat" : ".dat", logger->binary_data ? "ab+" : "a+", logger->buffering);
+  logger_bbob_open_dataFile(&(logger->tdata_file), logger->observer->result_folder, dataFile_path,
+      logger->binary_data ? ".btdat" : ".tdat", logger->binary_data ? "ab+" : "a+", logger->buffering);
+  if (logger->binary_data) { /* header record */
+    double header[4] = { 0, 0, 0, 0 };
+    header[2] = logger->optimal_fvalue;
+    logger_bbob_write_binary(logger->fdata_file, header, 4);
+    logger_bbob_write_binary(logger->tdata_file, header, 4);
+  } else {
+    fprintf(logger->fdata_file, bbob_file_header_str, logger->optimal_fvalue);
+    fprintf(logger->tdata_file, bbob_file_header_str, logger->optimal_fvalue);
+  }
 
-  logger_bbob_open_dataFile(&(logger->rdata_file), logger->observer->result_folder, dataFile_path, ".rdat");
+  logger_bbob_open_dataFile(&(logger->rdata_file), logger->observer->result_folder, dataFile_path, ".rdat", "a+",
+      logger->buffering);
   fprintf(logger->rdata_file, bbob_file_header_str, logger->optimal_fvalue);
   logger->is_initialized = 1;
   coco_free_memory(tmpc_dim);
@@ -508,7 +549,9 @@ static void logger_bbob_evaluate(coco_problem_t *problem, const double *x, doubl
           problem->number_of_integer_variables,
           cons,
           problem->number_of_constraints,
-          logger->log_discrete_as_int);
+          logger->log_discrete_as_int,
+          logger->binary_data);
+      coco_observer_buffering_flush(logger->buffering, logger->fdata_file);
     }
   }
 
@@ -527,7 +570,9 @@ static void logger_bbob_evaluate(coco_problem_t *problem, const double *x, doubl
         problem->number_of_integer_variables,
         cons,
         problem->number_of_constraints,
-        logger->log_discrete_as_int);
+        logger->log_discrete_as_int,
+        logger->binary_data);
+    coco_observer_buffering_flush(logger->buffering, logger->tdata_file);
     logger->written_last_eval = 1;
   }
 
@@ -583,7 +628,8 @@ static void logger_bbob_free(void *stuff) {
           logger->number_of_integer_variables,
           NULL,
           0,
-          logger->log_discrete_as_int);
+          logger->log_discrete_as_int,
+          logger->binary_data);
 	}
     fclose(logger->tdata_file);
     logger->tdata_file = NULL;
@@ -594,6 +640,11 @@ static void logger_bbob_free(void *stuff) {
     logger->rdata_file = NULL;
   }
 
+  if (logger->buffering != NULL) {
+    coco_observer_buffering_free(logger->buffering);
+    logger->buffering = NULL;
+  }
+
   if (logger->best_solution != NULL) {
     coco_free_memory(logger->best_solution);
     logger->best_solution = NULL;
@@ -656,10 +707,12 @@ static coco_problem_t *logger_bbob(coco_observer_t *observer, coco_problem_t *in
   logger_data->last_fvalue = DBL_MAX;
   logger_data->is_initialized = 0;
   logger_data->log_discrete_as_int = observer->log_discrete_as_int;
+  logger_data->binary_data = ((observer_bbob_data_t *) observer->data)->binary_data;
     
   /* Initialize triggers based on target values and number of evaluations */
   logger_data->targets = coco_observer_targets(observer->number_target_triggers, observer->target_precision);
   logger_data->evaluations = coco_observer_evaluations(observer->base_evaluation_triggers, inner_problem->number_of_variables);
+  logger_data->buffering = coco_observer_buffering(observer->buffer_size, observer->flush_interval);
 
   problem = coco_problem_transformed_allocate(inner_problem, logger_data, logger_bbob_free, observer->observer_name);
 
@@ -108,6 +108,8 @@ typedef struct {
   observer_biobj_log_nondom_e log_nondom_mode;
                                       /**< @brief Mode for archiving nondominated solutions. */
   FILE *adat_file;                    /**< @brief File for archiving nondominated solutions (all or final). */
+  coco_observer_buffering_t *buffering;
+                                      /**< @brief Buffering of the archive file. */
 
   int log_vars;                       /**< @brief Whether to log the decision values. */
 
@@ -729,7 +731,7 @@ static void logger_biobj_evaluate(coco_problem_t *problem, const double *x, doub
     avl_tree_purge(logger->buffer_tree);
 
     /* Flush output so that impatient users can see progress. */
-    fflush(logger->adat_file);
+    coco_observer_buffering_flush(logger->buffering, logger->adat_file);
   }
 
   /* Output according to observer options */
@@ -842,6 +844,11 @@ static void logger_biobj_free(void *stuff) {
     logger->adat_file = NULL;
   }
 
+  if (logger->buffering != NULL) {
+    coco_observer_buffering_free(logger->buffering);
+    logger->buffering = NULL;
+  }
+
   avl_tree_destruct(logger->archive_tree);
   avl_tree_destruct(logger->buffer_tree);
 
@@ -887,6 +894,7 @@ static coco_problem_t *logger_biobj(coco_observer_t *observer, coco_problem_t *i
   logger_data->precision_x = observer->precision_x;
   logger_data->precision_f = observer->precision_f;
   logger_data->log_discrete_as_int = observer->log_discrete_as_int;
+  logger_data->buffering = coco_observer_buffering(observer->buffer_size, observer->flush_interval);
 
   if (((observer_data->log_vars_mode == LOG_VARS_LOW_DIM) && (inner_problem->number_of_variables > 5))
       || (observer_data->log_vars_mode == LOG_VARS_NEVER))
@@ -918,6 +926,7 @@ static coco_problem_t *logger_biobj(coco_observer_t *observer, coco_problem_t *i
       coco_error("logger_biobj() failed to open file '%s'.", path_name);
       return NULL; /* Never reached */
     }
+    coco_observer_buffering_set(logger_data->buffering, logger_data->adat_file);
     coco_free_memory(path_name);
 
     /* Output header information */
@@ -18,19 +18,38 @@ typedef struct {
   size_t current_dim;
   size_t current_fun_id;
   /* ... and others */
+  int binary_data;        /**< @brief Whether to write binary instead of text data files. */
 } observer_bbob_data_t;
 
 /**
  * @brief Initializes the bbob observer.
+ *
+ * Possible options:
+ *
+ * - "binary_data: VALUE" determines whether the data files are written in the compact binary format (1) or
+ * as text (0). The binary .bdat and .btdat files contain for each logged evaluation a record of four
+ * little-endian doubles, namely the number of function evaluations, the number of constraints evaluations,
+ * the best noise-free fitness - Fopt + sum g_i+ and the measured fitness, and each trial starts with the
+ * header record 0, 0, Fopt, 0. The decision variables are not written. The default value is 0.
  */
 static void observer_bbob(coco_observer_t *observer, const char *options, coco_option_keys_t **option_keys) {
 
+  observer_bbob_data_t *observer_data;
+
+  /* Sets the valid keys for bbob observer options
+   * IMPORTANT: This list should be up-to-date with the code and the documentation */
+  const char *known_keys[] = { "binary_data" };
+  *option_keys = coco_option_keys_allocate(sizeof(known_keys) / sizeof(char *), known_keys);
+
+  observer_data = (observer_bbob_data_t *) coco_allocate_memory(sizeof(*observer_data));
+  observer_data->current_dim = 0;
+  observer_data->current_fun_id = 0;
+
+  if (coco_options_read_int(options, "binary_data", &(observer_data->binary_data)) == 0)
+    observer_data->binary_data = 0;
+
   observer->logger_allocate_function = logger_bbob;
   observer->logger_free_function = logger_bbob_free;
   observer->data_free_function = NULL;
-  observer->data = NULL;
-
-  *option_keys = NULL;
-
-  (void) options; /* To silence the compiler */
+  observer->data = observer_data;
 }
@@ -93,6 +93,18 @@ from math import floor as floor
 from numpy import dot, linspace, diag, tile, zeros, sign, resize
 from numpy.random import standard_normal as _randn # TODO: may bring confusion
 from numpy.random import random as _rand # TODO: may bring confusion
+try:
+    import cocoex
+except ImportError:
+    cocoex = None
+
+backend = 'auto' if cocoex else 'numpy'
+"""default evaluation backend of the noise-free functions, 'cocoex',
+'numpy' or 'auto', see `BBOBNfreeFunction`"""
+_xopts = {}  # computed xopt of each (rseed, dim)
+_rotations = {}  # computed rotation of each (seed, dim)
+_cocoex_problems = {}  # cocoex problem of each (funId, iinstance, dim) or None
+_cocoex_dimensions = []  # dimensions of the cocoex bbob suite
 
 """
 % VAL = BENCHMARKS(X, FUNCID)
@@ -166,13 +178,16 @@ from numpy.random import random as _rand # TODO: may bring confusion
 def compute_xopt(rseed, dim):
     """Generate a random vector used as optimum argument.
     
-    Rounded by four digits, but never to zero.
+    Rounded by four digits, but never to zero. The vectors are cached
+    for each `rseed` and `dim`.
 
     """
-    xopt = 8 * np.floor(1e4 * unif(dim, rseed))/1e4 - 4
-    idx = (xopt == 0)
-    xopt[idx] = -1e-5
-    return xopt
+    if (rseed, dim) not in _xopts:
+        xopt = 8 * np.floor(1e4 * unif(dim, rseed))/1e4 - 4
+        idx = (xopt == 0)
+        xopt[idx] = -1e-5
+        _xopts[rseed, dim] = xopt
+    return _xopts[rseed, dim].copy()
 
 def compute_rotation(seed, dim):
     """Returns an orthogonal basis. 
@@ -180,14 +195,17 @@ def compute_rotation(seed, dim):
     The rotation is used in several ways and in combination with
     non-linear transformations. Search space rotation invariant 
     algorithms are not expected to be invariant under this rotation. 
+    The matrices are cached for each `seed` and `dim`.
     
     """
-    B = np.reshape(gauss(dim * dim, seed), (dim, dim))
-    for i in range(dim):
-        for j in range(0, i):
-            B[i] = B[i] - dot(B[i], B[j]) * B[j]
-        B[i] = B[i] / (np.sum(B[i]**2) ** .5)
-    return B
+    if (seed, dim) not in _rotations:
+        B = np.reshape(gauss(dim * dim, seed), (dim, dim))
+        for i in range(dim):
+            for j in range(0, i):
+                B[i] = B[i] - dot(B[i], B[j]) * B[j]
+            B[i] = B[i] / (np.sum(B[i]**2) ** .5)
+        _rotations[seed, dim] = B
+    return _rotations[seed, dim].copy()
 
 def monotoneTFosc(f):
     """Maps [-inf,inf] to [-inf,inf] with different constants
@@ -443,6 +461,7 @@ class BBOBFunction(AbstractTestFunction):
             self.rseed = 1
 
         self.zerox = zerox
+        self.zerof = zerof
         if zerof:
             self.fopt = 0.
         else:
@@ -508,6 +527,8 @@ class BBOBFunction(AbstractTestFunction):
 
     def _getxopt(self):
         """Return the argument of the optimum of the function."""
+        if self._xopt is None and getattr(self, '_backend_dim', None):
+            self.initwithsize((self._backend_dim,), self._backend_dim)
         if self._xopt is None:
             warnings.warn('You need to evaluate object to set dimension first.')
         return self._xopt
@@ -545,13 +566,58 @@ class BBOBFunction(AbstractTestFunction):
 #    rotation = property(getrotation)
 
 class BBOBNfreeFunction(BBOBFunction):
-    """Class of the noise-free functions of BBOB."""
+    """Class of the noise-free functions of BBOB.
+
+    The functions are evaluated with the C implementation of `cocoex`
+    if the `backend` attribute or, if `None`, the module attribute
+    `backend` is 'cocoex' and `cocoex` supports the function instance
+    and dimension. Otherwise they are evaluated with `_evalfull`. With
+    'auto', single vectors are evaluated with `cocoex`, where it is
+    faster, and arrays of vectors with the vectorized `_evalfull`, see
+    `benchmark_backends`.
+
+    """
+    backend = None
 
     def noise(self, ftrue):
         """Returns the noise-free function values."""
 
         return ftrue.copy()
 
+    def evaluate(self, x):
+        """Returns the objective function value of `x` or the values of
+        the rows of `x`, see also `benchmark_backends`.
+
+        """
+        problem = self._cocoex_problem(np.shape(x)[-1])
+        if problem is None or (np.ndim(x) > 1 and (self.backend or backend) == 'auto'):
+            return self._evalfull(x)[0]
+        self._backend_dim = problem.dimension  # to compute xopt on demand
+        if np.ndim(x) < 2:
+            return problem(x)
+        if hasattr(problem, 'evaluate_batch'):
+            return problem.evaluate_batch(x)
+        return np.array([problem(xi) for xi in x])
+
+    def _cocoex_problem(self, dim):
+        """Returns the `cocoex` problem of this function instance in
+        dimension `dim` or `None` if not available."""
+        if ((self.backend or backend) not in ('cocoex', 'auto') or not cocoex or self.zerox
+                or self.zerof or self.param is not None or self.funId not in nfreeIDs
+                or not isinstance(self.iinstance, (int, np.integer)) or self.iinstance < 1):
+            return None
+        key = (self.funId, self.iinstance, dim)
+        if key not in _cocoex_problems:
+            if not _cocoex_dimensions:
+                _cocoex_dimensions.extend(cocoex.Suite('bbob', '', '').dimensions)
+            _cocoex_problems[key] = None
+            if dim in _cocoex_dimensions:  # otherwise coco_suite crashes
+                suite = cocoex.Suite('bbob', 'instances: %d' % self.iinstance,
+                                     'dimensions: %d function_indices: %d' % (dim, self.funId))
+                _cocoex_problems[key] = suite.get_problem_by_function_dimension_instance(
+                    self.funId, dim, self.iinstance)
+        return _cocoex_problems[key]
+
 class BBOBGaussFunction(BBOBFunction):
     """Class of the Gauss noise functions of BBOB.
 
@@ -993,7 +1059,7 @@ class _FStepEllipsoid(BBOBFunction):
             x1 = x[0]
         idx = np.abs(x) > .5
         x[idx] = np.round(x[idx])
-        x[np.negative(idx)] = np.round(self.alpha * x[np.negative(idx)]) / self.alpha
+        x[np.logical_not(idx)] = np.round(self.alpha * x[np.logical_not(idx)]) / self.alpha
         x = dot(x, self.rotation)
 
         # COMPUTATION core
@@ -2131,6 +2197,29 @@ def instantiate(ifun, iinstance=0, param=None, **kwargs):
     res = dictbbob[ifun](iinstance=iinstance, param=param, **kwargs)  # calling BBOBFunction.__init__(iinstance, param,...)
     return res, res.fopt
 
+def benchmark_backends(dims=(2, 10, 40), popsizes=(1, 100), iinstance=1, number=10):
+    """Compares the 'cocoex' and 'numpy' backends of the noise-free
+    functions and returns a list of
+    ``(funId, dim, popsize, max relative difference, speed-up)``.
+
+    The speed-up is the time of the 'numpy' backend divided by the time
+    of the 'cocoex' backend for `number` evaluations of `popsize` random
+    vectors in dimension `dim`.
+
+    """
+    import timeit
+    res = []
+    for ifun in nfreeIDs:
+        for dim in dims:
+            for popsize in popsizes:
+                x = 4 * _rand((popsize, dim)) - 2 if popsize > 1 else 4 * _rand(dim) - 2
+                fun = [instantiate(ifun, iinstance, backend=b)[0] for b in ('numpy', 'cocoex')]
+                f = [fi.evaluate(x) for fi in fun]  # initializes both
+                t = [timeit.timeit(lambda: fi.evaluate(x), number=number) for fi in fun]
+                res.append((ifun, dim, popsize,
+                            np.max(np.abs(f[1] - f[0]) / (1 + np.abs(f[0]))), t[0] / t[1]))
+    return res
+
 def get_param(ifun):
     """Returns the parameter values of the function ifun."""
     try:
@@ -0,0 +1,275 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Reading, writing and conversion of the binary data format of the
+``bbob`` logger.
+
+With the observer option ``binary_data: 1``, the ``bbob`` logger writes
+:file:`.bdat` and :file:`.btdat` files instead of the :file:`.dat` and
+:file:`.tdat` text files and ``data_format = 'bbob-binary'`` into the
+:file:`.info` files. A binary data file is a sequence of records of
+`number_of_fields` little-endian 8-byte floats, namely
+
+    number of f-evaluations | number of constraints evaluations |
+    best noise-free fitness - Fopt + sum g_i+ | measured fitness
+
+where each trial starts with a header record of two zeros, Fopt and
+zero. The decision variables and single-digit constraint values of the
+text format are not written. The files are read with `split`, which
+memory-maps them, or as gzip compressed files.
+
+`convert` converts the data of an experiment between the text and the
+binary format, from the shell with::
+
+    $ python -m cocopp.binarydata [--text] [--compress] INPUT OUTPUT
+
+>>> import os, tempfile, numpy as np
+>>> from cocopp import binarydata
+>>> filename = os.path.join(tempfile.mkdtemp(), 'data.bdat')
+>>> binarydata.write(filename, [(1.5, np.array([[1, 0, 10., 11.5],
+...                                             [3, 2, 1e-9, 1.5]]))])
+>>> trials = binarydata.read(filename)
+>>> trials[0][0]
+1.5
+>>> trials[0][1]
+array([[1.00e+00, 0.00e+00, 1.00e+01, 1.15e+01],
+       [3.00e+00, 2.00e+00, 1.00e-09, 1.50e+00]])
+>>> binarydata.write(filename + '.gz', trials, compress=True)
+>>> np.array_equal(binarydata.read(filename + '.gz')[0][1], trials[0][1])
+True
+
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import re
+import sys
+import gzip
+import shutil
+import warnings
+import numpy as np
+
+number_of_fields = 4
+"""number of values in each record"""
+dtype = np.dtype('<f8')
+data_format = 'bbob-binary'
+"""value of ``data_format`` in the :file:`.info` files"""
+text_data_format = 'bbob-new2'
+"""value of ``data_format`` in :file:`.info` files converted to text"""
+extensions = {'.dat': '.bdat', '.tdat': '.btdat'}
+"""binary data file extensions of the text data file extensions"""
+
+_gzip_magic = b'\x1f\x8b'  # a record can't start like this, see `read`
+_text_header = ('%% f evaluations | g evaluations | best noise-free fitness - '
+                'Fopt (%13.12e) + sum g_i+ | measured fitness | best measured '
+                'fitness or single-digit g-values | x1 | x2...\n')
+
+
+def read(filename):
+    """return a `list` of ``(fopt, records)`` of the trials in binary
+    data file `filename`.
+
+    ``records`` are the 2-D arrays of the records of each trial without
+    the header record. The arrays of an uncompressed file are memory-
+    mapped copy-on-write.
+    """
+    with open(filename, 'rb') as f:
+        compressed = f.read(2) == _gzip_magic  # the first record has 0 evaluations
+    if compressed:
+        with gzip.open(filename, 'rb') as f:
+            data = np.frombuffer(bytearray(f.read()), dtype=dtype)
+    elif os.path.getsize(filename):
+        data = np.memmap(filename, dtype=dtype, mode='c').view(np.ndarray)
+    else:
+        data = np.zeros(0, dtype=dtype)
+    if len(data) % number_of_fields:
+        warnings.warn('incomplete record at the end of %s' % filename)
+    data = data[:len(data) - len(data) % number_of_fields].reshape(-1, number_of_fields)
+    starts = list(np.flatnonzero(data[:, 0] == 0))
+    if len(data) and (not starts or starts[0] != 0):
+        warnings.warn('%s does not start with a header record' % filename)
+        starts.insert(0, -1)  # read all records
+    return [(float(data[start, 2]) if start >= 0 else np.nan, data[start + 1:end])
+            for start, end in zip(starts, starts[1:] + [len(data)])]
+
+
+def write(filename, trials, compress=False):
+    """write the `list` of ``(fopt, records)`` `trials` as returned by
+    `read` into binary data file `filename`, gzip compressed if
+    `compress`."""
+    data = []
+    for fopt, records in trials:
+        data.extend(([0, 0, fopt, 0], records))
+    data = np.vstack(data).astype(dtype) if data else np.zeros((0, number_of_fields), dtype)
+    with (gzip.open if compress else open)(filename, 'wb') as f:
+        f.write(data.tobytes())
+
+
+def split(dataFiles, idx_to_load=None):
+    """Split a list of binary data files into arrays corresponding to
+    data sets like `readalign.split`.
+
+    Return ``(data_sets, algorithms, reference_values, success_ratio)``,
+    where only `data_sets` is not empty.
+    """
+    data_sets = []
+    idx = 0  # trial index for checking in idx_to_load
+    for filename in dataFiles:
+        if not os.path.isfile(filename):
+            raise IOError(2, 'The file "%s" does not exist.' % filename)
+        for _fopt, records in read(filename):
+            if not len(records):  # like an empty block in a text file
+                continue
+            if (idx_to_load is None) or (idx_to_load and len(idx_to_load) > idx and idx_to_load[idx]):
+                data_sets.append(records)
+            idx += 1
+    return data_sets, [], {}, []
+
+
+def read_text(filename, columns):
+    """return a `list` of ``(fopt, records)`` of the trials in text data
+    file `filename` like `read`.
+
+    `columns` are the column indices of the `number_of_fields` values,
+    where `None` gives zeros, like for the number of constraints
+    evaluations in the ``bbob-old`` format.
+    """
+    from .readalign import block_to_array
+    with open(filename) as f:
+        lines = f.read().split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    trials = []
+    header_indices = [i for i, line in enumerate(lines) if line.startswith('%')]
+    for start, end in zip(header_indices, header_indices[1:] + [len(lines)]):
+        fopt = re.search(r'\(\s*([-+0-9.eEinfaINFA]+)\s*\)', lines[start])
+        content = block_to_array(lines[start + 1:end], filename=filename)[0]
+        if content is None:
+            content = np.zeros((0, 1 + max(c for c in columns if c is not None)))
+        trials.append((float(fopt.group(1)) if fopt else np.nan,
+                       np.column_stack([np.zeros(len(content)) if c is None else content[:, c]
+                                        for c in columns])))
+    return trials
+
+
+def write_text(filename, trials):
+    """write the `list` of ``(fopt, records)`` `trials` into text data
+    file `filename` in the ``bbob-new2`` format without decision
+    variables, where the last column is the best measured fitness."""
+    with open(filename, 'w') as f:
+        for fopt, records in trials:
+            f.write(_text_header % fopt)
+            f.write(''.join('%d %d %+10.9e %+10.9e %+10.9e\n' % (r[0], r[1], r[2], r[3], r[2] + fopt)
+                            for r in records))
+
+
+def convert(folder, output_folder, binary=True, compress=False):
+    """convert the ``bbob`` data in `folder` into `output_folder`, into
+    the binary format if `binary`, otherwise into the text format.
+
+    The :file:`.info` files are rewritten with the new data file names
+    and ``data_format``, all other files are copied. Binary data files
+    are gzip compressed if `compress`. The number of converted data
+    files is returned.
+    """
+    from . import dataformatsettings
+    converted = set()  # source data files
+    for path, _, names in os.walk(folder):
+        target_path = os.path.join(output_folder, os.path.relpath(path, folder))
+        if not os.path.isdir(target_path):
+            os.makedirs(target_path)
+        for name in names:
+            if not name.endswith('.info'):
+                continue
+            with open(os.path.join(path, name)) as f:
+                lines = f.read().split('\n')
+            data_format_name = None
+            for i, line in enumerate(lines):
+                if line.startswith(('suite', 'funcId')):  # header line
+                    if 'indicator' in line:
+                        raise ValueError('%s is not bbob data' % os.path.join(path, name))
+                    match = re.search(r"data_format\s*=\s*'([^']*)'", line)
+                    data_format_name = match.group(1) if match else None
+                    new_format = "data_format = '%s'" % (data_format if binary else text_data_format)
+                    lines[i] = (line[:match.start()] + new_format + line[match.end():]
+                                if match else line + ', ' + new_format)
+                elif line.strip() and not line.startswith('%'):  # data line
+                    source_file, rest = (line.split(',', 1) + [''])[:2]
+                    source_file = source_file.strip()
+                    target_file = _converted_name(source_file, binary)
+                    for extension in ('.dat', '.tdat'):
+                        source = os.path.normpath(os.path.join(
+                            path, _data_file(source_file, extension, data_format_name == data_format)))
+                        if source in converted:
+                            continue
+                        if not os.path.isfile(source):
+                            warnings.warn('data file %s not found' % source)
+                            continue
+                        _convert_file(source, os.path.join(target_path, _data_file(target_file, extension, binary)),
+                                      data_format_name, dataformatsettings, binary, compress)
+                        converted.add(source)
+                    lines[i] = target_file + (',' + rest if rest else '')
+            with open(os.path.join(target_path, name), 'w') as f:
+                f.write('\n'.join(lines))
+    for path, _, names in os.walk(folder):  # copy all other files
+        target_path = os.path.join(output_folder, os.path.relpath(path, folder))
+        for name in names:
+            source = os.path.normpath(os.path.join(path, name))
+            if not name.endswith('.info') and source not in converted:
+                shutil.copy(source, os.path.join(target_path, name))
+    return len(converted)
+
+
+def _data_file(name, text_extension, binary):
+    """return data file `name` with the extension corresponding to
+    `text_extension`"""
+    return os.path.splitext(name)[0] + (extensions[text_extension] if binary else text_extension)
+
+
+def _converted_name(name, binary):
+    """return data file `name` of an :file:`.info` file after conversion"""
+    return _data_file(name.replace('\\', '/'), '.dat', binary)
+
+
+def _convert_file(source, target, data_format_name, dataformatsettings, binary, compress):
+    """convert data file `source` into `target`"""
+    if not os.path.isdir(os.path.dirname(target)):
+        os.makedirs(os.path.dirname(target))
+    if binary:
+        if data_format_name == data_format:  # already binary
+            shutil.copy(source, target)
+            return
+        source_format = dataformatsettings.data_format_name_to_class_mapping[data_format_name]()
+        write(target, read_text(source, (source_format.evaluation_idx,
+                                         getattr(source_format, 'evaluation_constraints_idx', None),
+                                         source_format.function_value_idx, 3)),
+              compress)
+    else:
+        if data_format_name != data_format:  # already text
+            shutil.copy(source, target)
+            return
+        write_text(target, read(source))
+
+
+def main(argv=None):
+    """convert the data given as arguments, see `cocopp.binarydata`.
+
+    `argv` is a list or string of the options ``--text`` and
+    ``--compress`` and of the input and output folder.
+    """
+    from .ppfig import Usage
+    if argv is None:
+        argv = sys.argv[1:]
+    if not isinstance(argv, list):
+        argv = argv.split()
+    options = [arg for arg in argv if arg.startswith('--')]
+    folders = [arg for arg in argv if not arg.startswith('--')]
+    if len(folders) != 2 or set(options) - set(['--text', '--compress']):
+        raise Usage('expected [--text] [--compress] INPUT OUTPUT, got %s' % str(argv))
+    number = convert(folders[0], folders[1], '--text' not in options, '--compress' in options)
+    print('  %d data files converted into %s' % (number, folders[1]))
+
+
+if __name__ == '__main__':
+    main()
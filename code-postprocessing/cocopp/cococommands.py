@@ -64,7 +64,7 @@ from .pproc import DataSetList as _DataSetList
 from .toolsdivers import StringList as _StringList
 from .archiving import COCODataArchive as _COCODataArchive
 
-def load(filename):
+def load(filename, workers=None):
     """Create a :py:class:`DataSetList` instance from a file or folder.
 
     Input argument filename can be a single :file:`info` file name, a
@@ -72,8 +72,19 @@ def load(filename):
     folder is browsed recursively for :file:`info` or :file:`pickle`
     files.
 
+    With ``workers > 1``, :file:`info` files are read with as many
+    processes in parallel, the default is taken from
+    ``genericsettings.loading_workers``.
+
+    The data read from :file:`.dat` and :file:`.tdat` files are kept in
+    the data cache, by default up to 1 GB in :file:`~/.cocopp/cache`,
+    see `genericsettings.data_cache_folder`, `genericsettings.data_cache_size`
+    and `cocopp.datacache`. ``genericsettings.use_data_cache = False``
+    turns the cache off.
+
     """
-    return _DataSetList(_COCODataArchive().get_extended(_StringList(filename)))
+    return _DataSetList(_COCODataArchive().get_extended(_StringList(filename)),
+                        workers=workers)
 
 # info on the DataSetList: algId, function, dim
 
@@ -0,0 +1,178 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Persistent cache of the data read from :file:`.dat` and :file:`.tdat`
+files into `pproc.DataSet` instances.
+
+Each entry is a :file:`.npz` file in `genericsettings.data_cache_folder`
+which is named by a hash of the contents and modification times of the
+data files, of the `cocopp` version and of all further settings
+affecting the data. Hence, modified data or a new `cocopp` version
+never hit an outdated entry. The least recently used entries are
+removed when the cache exceeds `genericsettings.data_cache_size` bytes.
+
+The cache is bypassed with ``genericsettings.use_data_cache = False``
+or with the ``--no-cache`` option of `cocopp.main` and emptied with
+`clear` or the ``--clear-cache`` option.
+
+>>> import os, tempfile, numpy as np
+>>> from cocopp import datacache, genericsettings
+>>> folder, genericsettings.data_cache_folder = (genericsettings.data_cache_folder,
+...                                              tempfile.mkdtemp())
+>>> key = datacache.key([__file__], 'some setting')
+>>> datacache.load(key) is None
+True
+>>> datacache.save(key, {'evals': np.array([[1., 2.], [1e-8, np.nan]])},
+...                {'algs': ['A', 'B']})
+>>> entry = datacache.load(key)
+>>> entry['evals']
+array([[1.e+00, 2.e+00],
+       [1.e-08,    nan]])
+>>> entry['algs']
+['A', 'B']
+>>> datacache.clear()
+>>> datacache.load(key) is None
+True
+>>> genericsettings.data_cache_folder = folder
+
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import json
+import hashlib
+import tempfile
+import warnings
+import numpy as np
+
+from . import genericsettings
+
+_extension = '.npz'
+_sizes = {}  # size of the cache in bytes by folder, computed when needed and then updated
+
+
+def folder():
+    """return the absolute path of the cache folder"""
+    return os.path.abspath(os.path.expanduser(genericsettings.data_cache_folder))
+
+
+def key(filenames, *args):
+    """return a hash string of the contents and modification times of
+    `filenames` and of `args`.
+
+    `args` must have a `repr` which identifies their value, like
+    strings, numbers or lists thereof. The `cocopp` version is always
+    part of the key. Missing files are accepted.
+    """
+    sha = hashlib.sha1(repr((_version(), args)).encode('utf-8'))
+    for name in filenames:
+        try:
+            sha.update(repr((os.path.getmtime(name), os.path.getsize(name))).encode('utf-8'))
+            with open(name, 'rb') as f:
+                for chunk in iter(lambda: f.read(2**20), b''):
+                    sha.update(chunk)
+        except (IOError, OSError):
+            sha.update(b'missing file')
+    return sha.hexdigest()
+
+
+def load(key):
+    """return a `dict` of the arrays and values stored under `key` or
+    `None` if there is no (readable) entry.
+    """
+    filename = os.path.join(folder(), key + _extension)
+    if not os.path.isfile(filename):
+        return None
+    try:
+        with np.load(filename, allow_pickle=False) as entry:
+            res = dict((name, entry[name]) for name in entry.files)
+        res.update(json.loads(str(res.pop('_values'))))
+        os.utime(filename, None)  # mark as recently used
+    except Exception as e:  # a broken entry is a cache miss
+        warnings.warn('data cache entry %s could not be read (%s)' % (filename, str(e)))
+        return None
+    return res
+
+
+def save(key, arrays, values):
+    """store the `dict` of numpy `arrays` and the `dict` of JSON
+    serializable `values` under `key` and remove least recently used
+    entries if necessary.
+
+    Nothing is stored if `values` cannot be serialized or the cache
+    folder cannot be written.
+    """
+    try:
+        values = json.dumps(values)
+    except (TypeError, ValueError):
+        return
+    try:
+        if not os.path.isdir(folder()):
+            os.makedirs(folder())
+        # write to a temporary file first such that no process can read
+        # a partially written entry
+        fd, tmp_name = tempfile.mkstemp(suffix=_extension, dir=folder())
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, _values=np.array(values), **arrays)
+        filename = os.path.join(folder(), key + _extension)
+        if os.path.exists(filename):
+            os.remove(filename)
+        os.rename(tmp_name, filename)
+    except (IOError, OSError) as e:
+        warnings.warn('data could not be written to cache folder %s (%s)'
+                      % (folder(), str(e)))
+        return
+    if folder() not in _sizes:
+        _sizes[folder()] = sum(entry[1] for entry in _entries())
+    else:
+        _sizes[folder()] += os.path.getsize(filename)
+    if _sizes[folder()] > genericsettings.data_cache_size:
+        _remove_least_recently_used(genericsettings.data_cache_size)
+
+
+def clear():
+    """remove all entries from the cache"""
+    _remove_least_recently_used(0)
+
+
+def _entries():
+    """return a list of ``(last_use, size, filename)`` of all cache entries"""
+    path = folder()
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return []
+    res = []
+    for name in names:
+        if name.endswith(_extension):
+            filename = os.path.join(path, name)
+            try:
+                res.append((os.path.getmtime(filename), os.path.getsize(filename), filename))
+            except OSError:  # removed by another process
+                pass
+    return res
+
+
+def _remove_least_recently_used(max_size):
+    """remove entries, least recently used first, until the cache size is
+    not larger than `max_size` bytes"""
+    entries = sorted(_entries())
+    size = sum(entry[1] for entry in entries)
+    for _, entry_size, filename in entries:
+        if size <= max_size:
+            break
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+        size -= entry_size
+    _sizes[folder()] = size
+
+
+def _version():
+    try:
+        from . import __version__
+    except ImportError:
+        __version__ = 'unknown'
+    return __version__
@@ -11,6 +11,24 @@ class DataFormat(object):
 
     """
 
+    vectorized_alignment = True
+    """align data with `readalign.align_data_vectorized` and
+    `readalign.align_array_data_vectorized`, otherwise with the line by
+    line `readalign.align_data` and `readalign.alignArrayData`, which
+    give the same result."""
+
+    data_file_extensions = ('.dat', '.tdat')
+    """extensions of the data files read into `DataSet.evals` and
+    `DataSet.funvals`"""
+
+    def split(self, splitter, data_files, idx_to_load=None):
+        """return the trials in `data_files` as arrays.
+
+        `splitter` is `readalign.split`, passed like the aligner in
+        `align_data` to prevent circular imports.
+        """
+        return splitter(data_files, idx_to_load=idx_to_load)
+
     def align_data(self, aligner, data):
         """aligner is a function taking as input `data` and two column
         indices, namely where to find evaluations and function values.
@@ -103,6 +121,20 @@ class BBOBNewDataFormat(DataFormat):
                     finalfunvals)
 
 
+class BBOBBinaryDataFormat(BBOBNewDataFormat):
+    """the data in binary files written by the ``bbob`` logger with the
+    observer option ``binary_data: 1``, see `binarydata`.
+
+    The arrays of the trials have the columns of the `BBOBNewDataFormat`
+    and are memory-mapped.
+    """
+    data_file_extensions = ('.bdat', '.btdat')
+
+    def split(self, splitter, data_files, idx_to_load=None):
+        from . import binarydata  # not imported with cocopp for ``python -m cocopp.binarydata``
+        return binarydata.split(data_files, idx_to_load=idx_to_load)
+
+
 class BBOBBiObjDataFormat(DataFormat):
     def __init__(self):
         self.evaluation_idx = 0  # index of the column where to find the evaluations
@@ -115,5 +147,6 @@ data_format_name_to_class_mapping = {
         'bbob-old': BBOBOldDataFormat,  # probably never used
         'bbob-new': BBOBNewDataFormat,  # 2nd column has constraints evaluations
         'bbob-new2': BBOBNewDataFormat,  # 2nd column has constraints evaluations, 5th column constraints as single digits
+        'bbob-binary': BBOBBinaryDataFormat,  # binary records of the first four columns of bbob-new2
         'bbob-biobj': BBOBBiObjDataFormat,  # 2nd column has function evaluations
 }
@@ -41,7 +41,8 @@ def main(directory='.'):
     """Lists "data" files recursively in a given directory, tar files
     are extracted.
 
-    The "data" files have :file:`info` and :file:`pickle` extensions.
+    The "data" files have :file:`info` and :file:`pickle` extensions or
+    are index files of `memmapdata` ending with :file:`.mmap.json`.
 
     TODO: not only recognize .tar and .tar.gz and .tgz but .zip...
 
@@ -57,7 +58,8 @@ def main(directory='.'):
             print('Searching in %s ...' % root)
 
         for elem in files:
-            if elem.endswith('.info') or elem.endswith('.pickle') or elem.endswith('.pickle.gz'):
+            if (elem.endswith('.info') or elem.endswith('.pickle') or elem.endswith('.pickle.gz')
+                    or elem.endswith('.mmap.json')):
                 file_list.append(os.path.join(root, elem))
 
     if genericsettings.verbose:
@@ -254,6 +254,11 @@ isNoisy = False
 isNoiseFree = False
 isConv = False
 verbose = False
+loading_workers = 0  # number of processes to read data in parallel, serial if < 2
+lazy_data_loading = False  # read .dat/.tdat files of a DataSet only when its data are accessed
+use_data_cache = True  # keep data read from .dat/.tdat files in data_cache_folder, see datacache.py
+data_cache_folder = '~/.cocopp/cache'
+data_cache_size = 1e9  # in bytes, least recently used data are removed beyond this size
 outputdir = 'ppdata'
 inputsettings = 'color'
 isExpensive = False
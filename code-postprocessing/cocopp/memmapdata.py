@@ -0,0 +1,183 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Export and import of `pproc.DataSet` instances in a columnar format
+with memory-mappable arrays.
+
+`export` writes one folder per algorithm. Each array attribute of each
+`DataSet`, like ``evals`` and ``funvals``, is stored in a :file:`.npy`
+file and all further attributes go into a small JSON index file
+:file:`datasets.mmap.json`. `load` creates the `DataSet` instances from
+the index file only, each array is memory-mapped when it is first
+accessed. Hence, a large collection of data, like the background
+algorithms in `genericsettings.background`, does not need to be held
+in memory as a whole.
+
+Index files or folders containing them can be passed to `cocopp.load`
+and `cocopp.main` like folders with :file:`.info` files. From the
+shell, the data in ``DATA`` (folders or archives with :file:`.info`
+files) are exported to the folder ``OUTPUT`` with::
+
+    $ python -m cocopp.memmapdata OUTPUT DATA [DATA ...]
+
+>>> import tempfile, numpy as np
+>>> from cocopp import pproc, memmapdata
+>>> ds = pproc.DataSet.__new__(pproc.DataSet)
+>>> ds.__dict__.update(algId='A', comment='%', funcId=1, dim=2,
+...                    precision=1e-8, instancenumbers=[1, 2],
+...                    reference_values={1: 3.0},
+...                    evals=np.array([[10., 1, 1], [1e-8, 3, np.nan]]))
+>>> folder = tempfile.mkdtemp()
+>>> memmapdata.export([ds], folder)
+>>> loaded = memmapdata.load(folder)
+>>> loaded
+[DataSet(A on f1 2-D)]
+>>> 'evals' in loaded[0].__dict__  # not yet read
+False
+>>> loaded[0].evals
+array([[1.e+01, 1.e+00, 1.e+00],
+       [1.e-08, 3.e+00,    nan]])
+>>> loaded[0].reference_values, loaded[0].instancenumbers
+({1: 3.0}, [1, 2])
+
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import re
+import sys
+import json
+import functools
+import warnings
+import numpy as np
+
+from . import pproc, findfiles
+from .ppfig import Usage
+
+index_file_name = 'datasets.mmap.json'
+format_version = 1
+
+
+def export(datasets, folder):
+    """write the `DataSet` instances in `datasets` into `folder`.
+
+    Each algorithm, as given by ``algId`` and ``comment``, gets its own
+    subfolder with an index file named `index_file_name` and the arrays
+    as :file:`.npy` files. Existing index files are overwritten.
+    Attributes which can neither be stored as array nor in JSON are
+    skipped with a warning.
+    """
+    by_algorithm = {}
+    for ds in datasets:
+        by_algorithm.setdefault((ds.algId, ds.comment), []).append(ds)
+    used_names = set()
+    for (alg, _comment), alg_datasets in sorted(by_algorithm.items()):
+        name = re.sub(r'[^\w.+-]+', '_', str(alg)) or 'algorithm'
+        while name in used_names:  # same algId with different comments
+            name += '_'
+        used_names.add(name)
+        alg_folder = os.path.join(folder, name)
+        if not os.path.isdir(alg_folder):
+            os.makedirs(alg_folder)
+        entries = [_export_dataset(ds, alg_folder, '%03d-f%s-%dD' % (i, ds.funcId, ds.dim))
+                   for i, ds in enumerate(alg_datasets)]
+        with open(os.path.join(alg_folder, index_file_name), 'w') as f:
+            json.dump({'format_version': format_version,
+                       'datasets': entries}, f, indent=1)
+
+
+def _export_dataset(ds, folder, prefix):
+    """save the arrays of `ds` and return its index entry"""
+    for name in list(ds.__dict__.get('_lazy_attributes', ())):
+        getattr(ds, name, None)  # read deferred attributes
+    entry = {'arrays': {}, 'attributes': {}, 'dict_attributes': {}}
+    for name, value in sorted(ds.__dict__.items()):
+        if name in ('_lazy_attributes', '_summary'):  # not data
+            continue
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            filename = '%s-%s.npy' % (prefix, name)
+            np.save(os.path.join(folder, filename), value)
+            entry['arrays'][name] = filename
+            continue
+        try:
+            if isinstance(value, dict):
+                entry['dict_attributes'][name] = json.loads(json.dumps(
+                    list(value.items()), default=_json_default))
+            else:
+                entry['attributes'][name] = json.loads(json.dumps(
+                    value, default=_json_default))
+        except (TypeError, ValueError):
+            warnings.warn('attribute %s of %s is not exported' % (name, str(ds)))
+    return entry
+
+
+def _json_default(value):
+    """convert numpy scalars and arrays for `json.dumps`"""
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError('%s is not JSON serializable' % repr(value))
+
+
+def load(filename):
+    """return a `list` of `pproc.DataSet` instances from the index file
+    `filename` or from all index files found in folder `filename`.
+
+    The arrays are memory-mapped copy-on-write, that is, changing them
+    does not change the files.
+    """
+    if os.path.isdir(filename):
+        filenames = sorted(name for name in findfiles.main(filename)
+                           if name.endswith(index_file_name))
+    else:
+        filenames = [filename]
+    res = []
+    for index_file in filenames:
+        folder = os.path.dirname(index_file)
+        with open(index_file) as f:
+            index = json.load(f)
+        if index.get('format_version', 0) > format_version:
+            warnings.warn('%s was written by a newer cocopp version' % index_file)
+        for entry in index['datasets']:
+            ds = pproc.DataSet.__new__(pproc.DataSet)
+            ds.__dict__.update(entry['attributes'])
+            for name, items in entry['dict_attributes'].items():
+                setattr(ds, name, dict((tuple(k) if isinstance(k, list) else k, v)
+                                       for k, v in items))
+            ds._lazy_attributes = dict(
+                (name, functools.partial(_load_array, os.path.join(folder, array_file)))
+                for name, array_file in entry['arrays'].items())
+            res.append(ds)
+    return res
+
+
+def _load_array(filename):
+    """return the memory-mapped array in `filename` as `numpy.ndarray`,
+    because `numpy.memmap` results of numpy functions behave
+    differently"""
+    return np.load(filename, mmap_mode='c', allow_pickle=False).view(np.ndarray)
+
+
+def main(argv=None):
+    """export the data given as arguments, see `cocopp.memmapdata`.
+
+    `argv` is a list or string of the output folder followed by one or
+    several data folders or archives.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if not isinstance(argv, list):
+        argv = argv.split()
+    if len(argv) < 2:
+        raise Usage('expected an output folder and at least one data argument, '
+                    'got %s' % str(argv))
+    datasets = pproc.DataSetList(argv[1:])
+    export(datasets, argv[0])
+    print('  %d data sets exported to %s' % (len(datasets), argv[0]))
+
+
+if __name__ == '__main__':
+    import matplotlib
+    matplotlib.use('Agg')  # To avoid window popup and use without X forwarding
+
+    main()
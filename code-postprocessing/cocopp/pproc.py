@@ -28,16 +28,19 @@ import warnings
 import json
 import hashlib
 import functools
+import importlib
 import collections
+import multiprocessing
 from pdb import set_trace
-from six import string_types, advance_iterator
+from six import string_types, advance_iterator, StringIO
 import numpy, numpy as np
 import matplotlib.pyplot as plt
 from collections import OrderedDict
 from . import genericsettings, findfiles, toolsstats, toolsdivers
-from . import testbedsettings, dataformatsettings
+from . import testbedsettings, dataformatsettings, datacache
 from .readalign import split, align_data, HMultiReader, VMultiReader, openfile
 from .readalign import HArrayMultiReader, VArrayMultiReader, alignArrayData
+from .readalign import align_data_vectorized, align_array_data_vectorized
 from .ppfig import consecutiveNumbers, Usage
 
 do_assertion = genericsettings.force_assertions # expensive assertions
@@ -594,10 +597,17 @@ class DataSet(object):
         _attributes
         _complement_data
         _cut_data
+        _data_arrays
+        _data_values
         _detEvals2
         _detMaxEvals
         _evals
         _extra_attr
+        _load_cached_data
+        _read_data_files
+        _save_cached_data
+        _summary_indices
+        _target_row_indices
         algId
         algs
         comment
@@ -611,6 +621,7 @@ class DataSet(object):
         detEvals
         detSuccessRates
         detSuccesses
+        det_evals_array
         dim
         ert
         evals
@@ -899,13 +910,82 @@ class DataSet(object):
         if genericsettings.verbose:
             print("%s" % self.__repr__())
 
+        if genericsettings.lazy_data_loading:
+            # read the data files when a data attribute is first accessed
+            for name in self._data_arrays + self._data_values:
+                self.__dict__.pop(name, None)
+            read = functools.partial(self._read_data_files, filepath, list(self.dataFiles),
+                                     header, comment, data, idx_of_instances_to_load)
+            self._lazy_attributes = dict((name, functools.partial(read, name))
+                                         for name in self._data_arrays + self._data_values)
+        else:
+            self._read_data_files(filepath, self.dataFiles, header, comment, data,
+                                  idx_of_instances_to_load)
+
+    def _read_data_files(self, filepath, data_files, header, comment, data,
+                         idx_of_instances_to_load, attribute=None):
+        """read the :file:`.dat` and :file:`.tdat` files, or the files
+        with the `data_file_extensions` of the data format, into the data
+        attributes, see `_data_arrays` and `_data_values`.
+
+        `data_files` are the data file names from the index file in
+        `filepath`, `header`, `comment` and `data` are the arguments of
+        `__init__`.
+        When reading was deferred (``genericsettings.lazy_data_loading``),
+        return the value of `attribute`.
+        """
+        if attribute is not None:
+            # deferred reading sets all data attributes at once
+            self.__dict__.pop('_lazy_attributes', None)
+            self.evals, self.algs, self.success_ratio = [], [], []
+            self.reference_values = {}
+            if not testbedsettings.current_testbed:
+                testbedsettings.load_current_testbed(self.testbed_name, TargetValues)
+            self._read_data_files(filepath, data_files, header, comment, data,
+                                  idx_of_instances_to_load)
+            try:
+                return self.__dict__[attribute]
+            except KeyError:
+                raise AttributeError("'%s' object has no attribute '%s'"
+                                     % (self.__class__.__name__, attribute))
+
+        data_format = dataformatsettings.data_format_name_to_class_mapping[self.get_data_format()]()
+        dat_extension, tdat_extension = data_format.data_file_extensions
+        if genericsettings.use_data_cache:
+            cache_key = datacache.key(
+                [os.path.join(filepath, os.path.splitext(i)[0] + ext)
+                 for ext in (dat_extension, tdat_extension) for i in data_files],
+                header, comment, data, idx_of_instances_to_load,
+                self.testbed_name, testbedsettings.current_testbed.number_of_points,
+                genericsettings.weight_evaluations_constraints,
+                maximal_evaluations_only_to_last_target)
+            if self._load_cached_data(cache_key):
+                return
+            # record the warnings to replay them when the data come from the cache
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                self._parse_data_files(filepath, data_files, data_format, idx_of_instances_to_load)
+            caught = [(str(w.message), w.category.__module__, w.category.__name__,
+                       w.filename, w.lineno) for w in caught]
+            self._replay_warnings(caught)
+            self._save_cached_data(cache_key, caught)
+            return
+        self._parse_data_files(filepath, data_files, data_format, idx_of_instances_to_load)
+
+    def _parse_data_files(self, filepath, data_files, data_format, idx_of_instances_to_load):
+        """parse the data files into the data attributes, see `_read_data_files`"""
+        dat_extension, tdat_extension = data_format.data_file_extensions
         # Treat successively the data in dat and tdat files:
         # put into variable dataFiles the files where to look for data
-        dataFiles = list(os.path.join(filepath, os.path.splitext(i)[0] + '.dat')
-                         for i in self.dataFiles)
-        datasets, algorithms, reference_values, success_ratio = split(dataFiles, idx_to_load=idx_of_instances_to_load)
-        dataformatsettings.current_data_format = dataformatsettings.data_format_name_to_class_mapping[self.get_data_format()]()
+        dataFiles = list(os.path.join(filepath, os.path.splitext(i)[0] + dat_extension)
+                         for i in data_files)
+        datasets, algorithms, reference_values, success_ratio = data_format.split(
+            split, dataFiles, idx_to_load=idx_of_instances_to_load)
+        dataformatsettings.current_data_format = data_format
         data = HMultiReader(datasets)
+        aligner = (align_data_vectorized
+                   if dataformatsettings.current_data_format.vectorized_alignment
+                   else align_data)
         if genericsettings.verbose:
             print("Processing %s: %d/%d trials found." % (dataFiles, len(data), len(self.instancenumbers)))
        
@@ -913,7 +993,7 @@ class DataSet(object):
             # this takes different data formats into account to compute
             # the evals attribute and others into self:
             maxevals, finalfunvals = dataformatsettings.current_data_format.align_data_into_evals(
-                                                align_data, data, self)
+                                                aligner, data, self)
             # CAVEAT: maxevals may not be f-evaluations only
             # TODO: the above depends implicitely (in readalign.align_data)
             # on the global variable setting of
@@ -935,13 +1015,14 @@ class DataSet(object):
                 self.maxevals = maxevals
                 self.finalfunvals = finalfunvals
 
-        dataFiles = list(os.path.join(filepath, os.path.splitext(i)[0] + '.tdat')
-                         for i in self.dataFiles)
+        dataFiles = list(os.path.join(filepath, os.path.splitext(i)[0] + tdat_extension)
+                         for i in data_files)
                              
         if not any(os.path.isfile(dataFile) for dataFile in dataFiles):
             warnings.warn("Missing tdat files in '{0}'. Please consider to rerun the experiments." % filepath)
 
-        datasets, algorithms, reference_values, success_ratio = split(dataFiles, idx_to_load=idx_of_instances_to_load)
+        datasets, algorithms, reference_values, success_ratio = data_format.split(
+            split, dataFiles, idx_to_load=idx_of_instances_to_load)
         data = VMultiReader(datasets)
         if genericsettings.verbose:
             print("Processing %s: %d/%d trials found."
@@ -950,7 +1031,7 @@ class DataSet(object):
         if data:
             # TODO: maxevals and evals in the constrained case will give
             # values inconsistent with the above evals attribute
-            self.funvals, maxevals, finalfunvals = align_data(
+            self.funvals, maxevals, finalfunvals = aligner(
                 data, 
                 dataformatsettings.current_data_format.evaluation_idx,
                 dataformatsettings.current_data_format.function_value_idx,
@@ -995,6 +1076,51 @@ class DataSet(object):
             # Compute aRT
             self.computeERTfromEvals()
 
+    # attributes set from the data files, arrays and other values
+    _data_arrays = ('evals', 'funvals', 'maxevals', 'finalfunvals', 'ert',
+                    'target', 'evals_function', 'evals_constraints')
+    _data_values = ('reference_values', 'algs', 'success_ratio')
+
+    def _save_cached_data(self, key, caught):
+        """store the data read from the data files and the warnings
+        `caught` while reading in `datacache`"""
+        if not isinstance(getattr(self, 'funvals', None), numpy.ndarray):
+            return  # data are incomplete
+        values = dict((name, list(getattr(self, name).items())
+                             if name == 'reference_values' else getattr(self, name))
+                      for name in self._data_values)
+        values['warnings'] = caught
+        datacache.save(key,
+                       dict((name, getattr(self, name)) for name in self._data_arrays
+                            if hasattr(self, name)),
+                       values)
+
+    @staticmethod
+    def _replay_warnings(caught):
+        """issue the warnings `caught` while reading the data files, given
+        as ``(message, category module, category name, filename, lineno)``"""
+        for message, module, name, filename, lineno in caught:
+            try:
+                category = getattr(importlib.import_module(module), name)
+            except (ImportError, AttributeError):
+                category = UserWarning
+            warnings.warn_explicit(message, category, filename, lineno,
+                                   registry=globals().setdefault('__warningregistry__', {}))
+
+    def _load_cached_data(self, key):
+        """set the data from `datacache` and return `True` if found"""
+        cached = datacache.load(key)
+        if cached is None:
+            return False
+        dataformatsettings.current_data_format = \
+            dataformatsettings.data_format_name_to_class_mapping[self.get_data_format()]()
+        for name in self._data_arrays + self._data_values:
+            if name in cached:
+                setattr(self, name, cached[name])
+        self.reference_values = dict((k, v) for k, v in self.reference_values)
+        self._replay_warnings(cached.get('warnings', []))
+        return True
+
     @property
     def evals_(self):
         """Shall become ``evals`` attribute in future.
@@ -1166,39 +1292,32 @@ class DataSet(object):
         res = []  # res[i] is a list of samplesize evals
         for evals in self.detEvals(targets, bootstrap=bootstrap):
             # prepare evals array
-            evals.sort()
-            indices = np.isfinite(evals)
-            if not sum(indices):  # no successes
+            evals.sort()  # nan last
+            nsucc = np.sum(np.isfinite(evals))
+            if not nsucc:  # no successes
                 res += [samplesize * [np.nan]]  # TODO: this is "many" data with little information
                 continue
-            nindices = ~indices
-            assert sum(indices) + sum(nindices) == len(evals)
-            evals[nindices] = self.maxevals[nindices]  # replace nan
             # let the first nsucc data in evals be those from successful runs
-            evals = np.hstack([evals[indices], evals[nindices]])
-            assert sum(np.isfinite(evals)) == len(evals)
-            nsucc = sum(indices)
-
-            # do the job
-            indices = randintfirst(0, len(evals), samplesize)
-            sums = evals[indices]
-            if nsucc == len(evals):
-                res += [sorted(sums)]
-                continue
-            failing = np.where(indices >= nsucc)[0]
-            assert nsucc > 0  # prevent infinite loop
-            while len(failing):  # add "restarts"
-                indices = randintrest(0, len(evals), len(failing))
-                sums[failing] += evals[indices]
-                # keep failing indices
-                failing = [failing[i] for i in range(len(failing))
-                            if indices[i] >= nsucc]
-            res += [sorted(sums)]
+            evals[nsucc:] = self.maxevals[nsucc:]  # replace nan
+            res += [list(toolsstats.simulated_restart_runlengths(
+                        evals, nsucc, samplesize, randintfirst, randintrest))]
 
         assert set([len(evals) if evals is not None else samplesize
                 for evals in res]) == set([samplesize])
         return res
 
+    def __getattr__(self, name):
+        """Read attributes which are deferred in ``_lazy_attributes``,
+        a `dict` of functions returning the attribute values, on first
+        access, see `memmapdata.load`."""
+        lazy_attributes = self.__dict__.get('_lazy_attributes')
+        if not lazy_attributes or name not in lazy_attributes:
+            raise AttributeError("'%s' object has no attribute '%s'"
+                                 % (self.__class__.__name__, name))
+        value = lazy_attributes.pop(name)()
+        setattr(self, name, value)
+        return value
+
     def __eq__(self, other):
         """Compare indexEntry instances."""
         res = (self.__class__ is other.__class__ and
@@ -1435,29 +1554,53 @@ class DataSet(object):
                   evaluations.
 
         """
-        res = {}
-        # expect evals to be sorted by decreasing function values
-        it = reversed(self.evals)
-        prevline = numpy.array([-numpy.inf] + [numpy.nan] * self.nbRuns())
-        try:
-            line = advance_iterator(it)
-        except StopIteration:
-            # evals is an empty array
-            return res #list()
-
-        for t in sorted(targets):
-            while line[0] <= t:
-                prevline = line
-                try:
-                    line = advance_iterator(it)
-                except StopIteration:
-                    break
-            res[t] = prevline.copy()
-
+        if not len(self.evals):
+            return {}
+        idx = self._target_row_indices(targets, self.evals[:, 0])
+        rows = self.evals[idx]  # a copy
+        rows[idx < 0] = [-numpy.inf] + [numpy.nan] * self.nbRuns()
+        return dict(zip(targets, rows))
+
+    def _target_row_indices(self, targets, target_values):
+        """return for each of `targets` the index of the first of the
+        decreasing `target_values` which is not larger than the target,
+        or -1 if the target is smaller than all `target_values`.
+
+        `target_values` is typically ``self.evals[:, 0]`` or
+        ``self.target``. All targets are looked up with a single
+        `numpy.searchsorted` on the reversed (increasing) values.
+        """
+        target_values = numpy.asarray(target_values)
+        nb_reached = numpy.searchsorted(target_values[::-1],
+                                        numpy.asarray(targets, dtype=float),
+                                        side='right')
+        return numpy.where(nb_reached > 0, len(target_values) - nb_reached, -1)
+
+    def _summary_indices(self, targets):
+        """return the indices of `targets` in the summary table set by
+        `DataSetList.summarize` or `None` if there is no valid table or
+        not all `targets` are in the table"""
+        summary = self.__dict__.get('_summary')
+        if summary is None:
+            return None
+        return summary.indices(self, targets)
+
+    def det_evals_array(self, targets):
+        """return the evaluations to reach `targets` as an array of shape
+        ``(len(targets), self.nbRuns())``.
+
+        Row ``i`` is ``self.evals[idata, 1:]`` with the smallest ``idata``
+        such that ``self.evals[idata, 0] <= targets[i]``, or all `numpy.nan`
+        if no such line exists. This is the batch version of `detEvals`.
+        """
+        idx = self._summary_indices(targets)
+        if idx is not None:
+            return self._summary.evals[idx]
+        idx = self._target_row_indices(targets, self.evals[:, 0])
+        res = self.evals[idx, 1:]  # a copy
+        res[idx < 0] = numpy.nan
         return res
-        # return list(res[i] for i in targets)
-        # alternative output sorted by targets
-        
+
     def detAverageEvals(self, targets):
         """Determine the average number of f-evals for each target 
         in ``targets`` list. If a target is not reached within trial
@@ -1468,14 +1611,13 @@ class DataSet(object):
         where aRT, psucc, and evals are a function of target.  
           
         """
+        idx = self._summary_indices(targets)
+        if idx is not None:
+            return self._summary.average_evals[idx]
         assert not any(np.isnan(self.evals[:][0]))  # target value cannot be nan
 
-        evalsums = []
-        for evalrow in self.detEvals(targets):
-            idxnan = np.isnan(evalrow)
-            evalsums.append(sum(evalrow[idxnan==False]) + sum(self.maxevals[idxnan]))
-        
-        averages = np.array(evalsums, copy=False) / self.nbRuns()
+        evals = self.det_evals_array(targets)
+        averages = np.where(np.isnan(evals), self.maxevals, evals).sum(axis=1) / self.nbRuns()
             
         if do_assertion:
             assert all([(ert == np.inf and ps == 0) or toolsdivers.equals_approximately(ert,  averages[i] / ps)
@@ -1492,11 +1634,10 @@ class DataSet(object):
         are the respective success rates. 
         
         """
-        succ = []
-        for evalrow in self.detEvals(targets, copy=False):
-            assert len(evalrow) == self.nbRuns()
-            succ.append(self.nbRuns() - sum(np.isnan(evalrow)))
-        return succ
+        idx = self._summary_indices(targets)
+        if idx is not None:
+            return list(self._summary.successes[idx])
+        return list(self.nbRuns() - np.sum(np.isnan(self.det_evals_array(targets)), axis=1))
 
     def detSuccessRates(self, targets):
         """return a np.array with the success rate for each target 
@@ -1515,30 +1656,15 @@ class DataSet(object):
                   respective targets.
 
         """
-        res = {}
-        tmparray = numpy.vstack((self.target, self.ert)).transpose()
-        it = reversed(tmparray)
-        # expect this array to be sorted by decreasing function values
-
-        prevline = numpy.array([-numpy.inf, numpy.inf])
-        try:
-            line = advance_iterator(it)
-        except StopIteration:
-            # evals is an empty array
+        idx = self._summary_indices(targets)
+        if idx is not None:
+            return list(self._summary.ert[idx])
+        if not len(self.target):
             return list()
-
-        for t in sorted(targets):
-            while line[0] <= t:
-                prevline = line
-                try:
-                    line = advance_iterator(it)
-                except StopIteration:
-                    break
-            res[t] = prevline.copy() # is copy necessary? Yes. 
-
-        # Return a list of aRT corresponding to the input targets in
-        # targets, sorted along targets
-        return list(res[i][1] for i in targets)
+        # expect target to be sorted by decreasing function values
+        idx = self._target_row_indices(targets, self.target)
+        return list(numpy.where(idx < 0, numpy.inf,
+                                numpy.asarray(self.ert, dtype=float)[idx]))
 
     def detEvals(self, targets, copy=True, bootstrap=False):
         """returns len(targets) data rows self.evals[idata, 1:] each row with 
@@ -1546,30 +1672,20 @@ class DataSet(object):
         and self.evals[idata-1, 0] > target or in the "limit" cases the
         idata==0 line or the line np.array(self.nbRuns() * [np.nan]). 
         
-        Makes by default a copy of the data, however this might change in
-        future.
-        
+        Makes a copy of the data, also with ``copy=False``, see
+        `det_evals_array` for the array of all rows.
+
         """
-        evalsrows = {}  # data rows, easiest target first
-        idata = self.evals.shape[0] - 1  # current data line index 
-        for target in sorted(targets):  # smallest most difficult target first
-            if self.evals[-1, 0] > target:  # last entry is worse than target
-                evalsrows[target] = np.array(self.nbRuns() * [np.nan])
-                continue
-            while idata > 0 and self.evals[idata - 1, 0] <= target:  # idata-1 line is good enough
-                idata -= 1  # move up
-            assert self.evals[idata, 0] <= target and (idata == 0 or self.evals[idata - 1, 0] > target)
-            evalsrows[target] = self.evals[idata, 1:].copy() if copy else self.evals[idata, 1:]
-            
+        evalsrows = self.det_evals_array(targets)  # always a copy
+
         if do_assertion:
-            assert all([all((np.isnan(evalsrows[target]) + (evalsrows[target] == self._detEvals2(targets)[i])))
-                        for i, target in enumerate(targets)])
+            assert all([all((np.isnan(evalsrows[i]) + (evalsrows[i] == self._detEvals2(targets)[i])))
+                        for i in range(len(targets))])
 
         if bootstrap:
-            return [np.asarray(evalsrows[t])[np.random.randint(0,
-                                len(evalsrows[t]), len(evalsrows[t]))]
-                    for t in targets]
-        return [evalsrows[t] for t in targets]
+            return [row[np.random.randint(0, len(row), len(row))]
+                    for row in evalsrows]
+        return list(evalsrows)
         
     def _detEvals2(self, targets):
         """Determine the number of evaluations to reach target values.
@@ -1578,26 +1694,8 @@ class DataSet(object):
         :returns: list of len(targets) values, each being an array of nbRuns FEs values
 
         """
-        tmp = {}  # dict of eval-arrays (of size Ntrials), each entry for a given target
         # expect evals to be sorted by decreasing function values
-        it = reversed(self.evals)
-        prevline = numpy.array([-numpy.inf] + [numpy.nan] * self.nbRuns())
-        try:
-            line = advance_iterator(it)
-        except StopIteration:
-            # evals is an empty array
-            return tmp #list()
-
-        for t in sorted(targets):
-            while line[0] <= t:
-                prevline = line
-                try:
-                    line = advance_iterator(it)
-                except StopIteration:
-                    break
-            tmp[t] = prevline.copy()
-
-        return list(tmp[i][1:] for i in targets)
+        return list(self.det_evals_array(targets))
 
     def plot_funvals(self, **kwargs):
         """plot data of `funvals` attribute, versatile
@@ -1638,6 +1736,142 @@ class DataSet(object):
                 plt.ylabel('number of function evaluations')
         return plt.gca()
 
+def _index_file_datasets(indexFile):
+    """Generates the `DataSet` instances of an index (.info?) file."""
+
+    try:
+        f = openfile(indexFile)
+        if genericsettings.verbose:
+            print('Processing %s.' % indexFile)
+
+        # Read all data sets within one index file.
+        nbLine = 1
+        data_file_names = []
+        header = ''
+        while True:
+            try:
+                if 'indicator' not in header:
+                    header = advance_iterator(f)
+                    while not header.strip(): # remove blank lines
+                        header = advance_iterator(f)
+                        nbLine += 1
+                    comment = advance_iterator(f)
+                    if not comment.startswith('%'):
+                        warnings.warn('Entry in file %s at line %d is faulty: '
+                                      % (indexFile, nbLine) +
+                                      'it will be skipped.')
+                        nbLine += 2
+                        continue
+
+                data = advance_iterator(f)  # this is the filename of the data file!?
+                data_file_names.append(data)
+                nbLine += 3
+                #TODO: check that something is not wrong with the 3 lines.
+                ds = DataSet(header, comment, data, indexFile)                    
+                if len(ds.instancenumbers) > 0:
+                    yield ds
+            except StopIteration:
+                break
+        # Close index file
+        f.close()
+        if len(data_file_names) != len(set(data_file_names)):
+            warnings.warn("WARNING: a data file has been referenced" +
+                " several times in file %s:" % indexFile)
+            data_file_names = sorted(data_file_names)
+            for i in range(1, len(data_file_names)):
+                if data_file_names[i-1] == data_file_names[i]:
+                    warnings.warn("    data file " + data_file_names[i])
+            warnings.warn("  This is likely to produce spurious results.")
+
+    except IOError as e:
+        print('Could not load "%s".' % indexFile)
+        print('I/O error(%s): %s' % (e.errno, e.strerror))
+
+
+def _init_loading_process(testbed, settings):
+    """set the global state of a process loading `DataSet` instances"""
+    testbedsettings.current_testbed = testbed
+    for name, value in settings.items():
+        setattr(genericsettings, name, value)
+
+
+def _load_index_file(indexFile):
+    """Returns a list of ``(output, warnings, dataset)`` tuples.
+
+    The list contains the `DataSet` instances of `indexFile` each with
+    the printed output and the warnings which preceded it. The last
+    entry has ``dataset is None`` and holds the remaining output.
+
+    Used by processes which load index files in parallel, such that
+    the main process can reproduce the output of serial loading.
+    """
+    res = []
+    datasets = _index_file_datasets(indexFile)
+    while True:
+        stdout, sys.stdout = sys.stdout, StringIO()
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                ds = next(datasets, None)
+            res.append((sys.stdout.getvalue(), [(w.message, w.category, w.filename, w.lineno)
+                                                for w in caught], ds))
+        finally:
+            sys.stdout = stdout
+        if ds is None:
+            return res
+
+
+def _load_index_files(indexFiles, workers):
+    """Returns a `dict` of index file names to results of `_load_index_file`,
+    computed with `workers` processes."""
+    settings = dict((name, value) for name, value in vars(genericsettings).items()
+                    if not name.startswith('_') and
+                    isinstance(value, (bool, int, float, string_types, list, tuple, dict)))
+    pool = multiprocessing.Pool(workers, _init_loading_process,
+                                (testbedsettings.current_testbed, settings))
+    try:
+        return dict(zip(indexFiles, pool.map(_load_index_file, indexFiles, chunksize=1)))
+    finally:
+        pool.close()
+        pool.join()
+
+
+class DataSetSummary(object):
+    """Table of aRT, number of successes, average evaluations and
+    evaluations of a `DataSet` for a fixed set of targets.
+
+    The `DataSet` methods `detERT`, `detSuccesses`, `detAverageEvals`
+    and `det_evals_array` (hence `detEvals`) use the table of their
+    ``_summary`` attribute, set by `DataSetList.summarize`, when all
+    requested targets are in the table. The table is ignored when the
+    data attributes of the `DataSet` have been assigned anew since.
+    """
+    _sources = ('evals', 'maxevals', 'ert', 'target')
+
+    def __init__(self, ds, targets):
+        """compute the table for `DataSet` `ds` and `targets`"""
+        ds.__dict__.pop('_summary', None)
+        self.targets = np.unique(np.asarray(targets, dtype=float))
+        self.sources = tuple(ds.__dict__.get(name) for name in self._sources)
+        self.evals = DataSet.det_evals_array(ds, self.targets)
+        self.ert = np.asarray(DataSet.detERT(ds, self.targets), dtype=float)
+        self.successes = np.asarray(DataSet.detSuccesses(ds, self.targets))
+        self.average_evals = DataSet.detAverageEvals(ds, self.targets)
+
+    def indices(self, ds, targets):
+        """return the table indices of `targets` or `None` if the table
+        does not apply"""
+        if not len(self.targets) or any(
+                ds.__dict__.get(name) is not source
+                for name, source in zip(self._sources, self.sources)):
+            return None
+        targets = np.asarray(targets, dtype=float)
+        idx = np.minimum(np.searchsorted(self.targets, targets), len(self.targets) - 1)
+        if not np.all(self.targets[idx] == targets):
+            return None
+        return idx
+
+
 class DataSetList(list):
     """List of instances of :py:class:`DataSet`.
 
@@ -1646,17 +1880,30 @@ class DataSetList(list):
     Also it will merge data of DataSet instances that are identical
     (according to function __eq__ of DataSet).
 
+    Identical instances are found with an index by `algId`, `funcId`,
+    `dim` and `comment` of the elements, which must hence not be changed
+    while they are in the list. The views `dictByAlg`, `dictByDim` and
+    `dictByFunc` are cached until the list changes. Only `append` and
+    `extend` merge identical instances, added with `insert`, ``+=`` or
+    item assignment they remain separate elements, also in the views.
+
     """
     #Do not inherit from set because DataSet instances are mutable which means
     #they might change over time.
 
-    def __init__(self, args=[], check_data_type=True):
+    def __init__(self, args=[], check_data_type=True, workers=None):
         """Instantiate self from a list of folder- or filenames or 
         ``DataSet`` instances.
 
         :keyword list args: strings being either info file names, folder
                             containing info files or pickled data files,
+                            index files of `memmapdata`,
                             or a list of DataSets.
+        :keyword int workers: number of processes to read info files in
+                              parallel, by default
+                              ``genericsettings.loading_workers``. The
+                              result, output and warnings are the same
+                              as with serial loading.
 
         Exceptions:
         Warning -- Unexpected user input.
@@ -1690,11 +1937,26 @@ class DataSetList(list):
                 fnames.extend(findfiles.main(name))
             else:
                 fnames.append(name)
+        if workers is None:
+            workers = genericsettings.loading_workers
+        index_files = [name for name in fnames
+                       if isinstance(name, string_types) and name.endswith('.info')]
+        parallel = (workers > 1 and len(index_files) > 1
+                    and not genericsettings.lazy_data_loading)  # nothing to gain
+        loaded = {}  # results of _load_index_file by index file name
         for name in fnames: 
             if isinstance(name, DataSet):
                 self.append(name)
+            elif name in loaded:
+                self._append_loaded(loaded.pop(name))
             elif name.endswith('.info'):
                 self.processIndexFile(name)
+                if parallel:  # the first index file sets the testbed
+                    loaded = _load_index_files(index_files[1:], workers)
+                    parallel = False
+            elif name.endswith('.mmap.json'):
+                from . import memmapdata
+                self._append_loaded([('', [], ds) for ds in memmapdata.load(name)])
             elif name.endswith('.pickle') or name.endswith('.pickle.gz'):
                 try:
                     # cocofy(name)
@@ -1736,54 +1998,24 @@ class DataSetList(list):
             
     def processIndexFile(self, indexFile):
         """Reads in an index (.info?) file information on the different runs."""
-
-        try:
-            f = openfile(indexFile)
-            if genericsettings.verbose:
-                print('Processing %s.' % indexFile)
-
-            # Read all data sets within one index file.
-            nbLine = 1
-            data_file_names = []
-            header = ''
-            while True:
-                try:
-                    if 'indicator' not in header:
-                        header = advance_iterator(f)
-                        while not header.strip(): # remove blank lines
-                            header = advance_iterator(f)
-                            nbLine += 1
-                        comment = advance_iterator(f)
-                        if not comment.startswith('%'):
-                            warnings.warn('Entry in file %s at line %d is faulty: '
-                                          % (indexFile, nbLine) +
-                                          'it will be skipped.')
-                            nbLine += 2
-                            continue
-
-                    data = advance_iterator(f)  # this is the filename of the data file!?
-                    data_file_names.append(data)
-                    nbLine += 3
-                    #TODO: check that something is not wrong with the 3 lines.
-                    ds = DataSet(header, comment, data, indexFile)                    
-                    if len(ds.instancenumbers) > 0:                    
-                        self.append(ds)
-                except StopIteration:
-                    break
-            # Close index file
-            f.close()
-            if len(data_file_names) != len(set(data_file_names)):
-                warnings.warn("WARNING: a data file has been referenced" +
-                    " several times in file %s:" % indexFile)
-                data_file_names = sorted(data_file_names)
-                for i in range(1, len(data_file_names)):
-                    if data_file_names[i-1] == data_file_names[i]:
-                        warnings.warn("    data file " + data_file_names[i])
-                warnings.warn("  This is likely to produce spurious results.")
-
-        except IOError as e:
-            print('Could not load "%s".' % indexFile)
-            print('I/O error(%s): %s' % (e.errno, e.strerror))
+        for ds in _index_file_datasets(indexFile):
+            self.append(ds)
+
+    def _append_loaded(self, loaded):
+        """Appends the `DataSet` instances of a `_load_index_file` result
+        and replays its output and warnings."""
+        for output, caught, ds in loaded:
+            sys.stdout.write(output)
+            for message, category, filename, lineno in caught:
+                warnings.warn_explicit(message, category, filename, lineno,
+                                       registry=globals().setdefault('__warningregistry__', {}))
+            if ds is not None:
+                # global settings like in DataSet.__init__
+                if not testbedsettings.current_testbed:
+                    testbedsettings.load_current_testbed(ds.testbed_name, TargetValues)
+                dataformatsettings.current_data_format = \
+                    dataformatsettings.data_format_name_to_class_mapping[ds.get_data_format()]()
+                self.append(ds)
 
     def append(self, o, check_data_type=False):
         """Redefines the append method to check for unicity."""
@@ -1792,7 +2024,7 @@ class DataSetList(list):
             warnings.warn('appending a non-DataSet to the DataSetList')
             raise Exception('Expect DataSet instance.')
         isFound = False
-        for i in self:
+        for i in self._ds_index().get(self._index_key(o), ()):
             if i == o:
                 isFound = True
                 if 11 < 3 and i.instancenumbers == o.instancenumbers and any([_i > 5 for _i in i.instancenumbers]):
@@ -1813,11 +2045,15 @@ class DataSetList(list):
                 # tmp = set(i.dataFiles).symmetric_difference(set(o.dataFiles))
                 #Check if there are new data considered.
                 if 1 < 3:
+                    align_arrays = (align_array_data_vectorized
+                                    if getattr(dataformatsettings.current_data_format,
+                                               'vectorized_alignment', True)
+                                    else alignArrayData)
                     i.dataFiles.extend(o.dataFiles)
                     i.indexFiles.extend(o.indexFiles)
-                    i.funvals = alignArrayData(VArrayMultiReader([i.funvals, o.funvals]))
+                    i.funvals = align_arrays(VArrayMultiReader([i.funvals, o.funvals]))
                     i.finalfunvals = numpy.r_[i.finalfunvals, o.finalfunvals]
-                    i.evals = alignArrayData(HArrayMultiReader([i.evals, o.evals]))
+                    i.evals = align_arrays(HArrayMultiReader([i.evals, o.evals]))
                     i.maxevals = numpy.r_[i.maxevals, o.maxevals]
                     i.computeERTfromEvals()
                     i.reference_values.update(o.reference_values)
@@ -1837,17 +2073,152 @@ class DataSetList(list):
                 break
         if not isFound:
             list.append(self, o)
+            self._ds_index().setdefault(self._index_key(o), []).append(o)
+            self.__dict__.pop('_views', None)
+        if getattr(self, '_summarized', False):
+            ds = i if isFound else o
+            ds._summary = DataSetSummary(ds, self._summary_targets(ds))
+
+    def summarize(self, targets=None):
+        """precompute aRT, successes, average evaluations and evaluations
+        of all elements for the given `targets`, see `DataSetSummary`.
+
+        `targets` is a sequence or a callable like `TargetValues` and
+        defaults to the union of all target values of the current
+        testbed, see `testbedsettings`. Elements appended later are
+        summarized as well, merged elements are summarized anew.
+        """
+        self._summarized = True
+        self._summary_target_values = targets
+        for ds in self:
+            ds._summary = DataSetSummary(ds, self._summary_targets(ds))
+
+    def _summary_targets(self, ds):
+        """return the targets to summarize `DataSet` `ds` for"""
+        if self._summary_target_values is not None:
+            target_sets = [self._summary_target_values]
+        elif testbedsettings.current_testbed:
+            target_sets = [value for name, value in sorted(vars(testbedsettings.current_testbed).items())
+                           if name.endswith('target_values') or name.endswith('targetsOfInterest')]
+        else:
+            target_sets = []
+        targets = []
+        for target_set in target_sets:
+            if callable(target_set):
+                target_set = target_set((ds.funcId, ds.dim))
+            targets.extend(np.asarray(target_set, dtype=float).ravel())
+        return targets
 
     def extend(self, o):
         """Extend with elements.
 
         This method is implemented to prevent problems since append was
-        superseded. This method could be the origin of efficiency issue.
+        superseded.
 
         """
         for i in o:
             self.append(i)
 
+    @staticmethod
+    def _index_key(ds):
+        """key of `ds` in `_ds_index`, equal `DataSet` instances have
+        equal keys"""
+        key = tuple(getattr(ds, name, None) for name in ('algId', 'funcId', 'dim', 'comment'))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _ds_index(self):
+        """return a `dict` of the elements as lists by `_index_key`,
+        built when needed"""
+        try:
+            return self.__dict__['_index']
+        except KeyError:
+            index = {}
+            for ds in self:
+                index.setdefault(self._index_key(ds), []).append(ds)
+            self._index = index
+            return index
+
+    def _clear_index(self):
+        """remove the index and the cached views, to be called when
+        elements are removed or replaced or their keys are changed"""
+        self.__dict__.pop('_index', None)
+        self.__dict__.pop('_views', None)
+
+    def _grouped(self, name, key):
+        """return a list of ``(key(ds), datasets)`` pairs in order of
+        first appearance, cached as `name` until self is changed"""
+        views = self.__dict__.setdefault('_views', {})
+        if name not in views:
+            groups = OrderedDict()
+            for ds in self:
+                groups.setdefault(key(ds), []).append(ds)
+            views[name] = list(groups.items())
+        return views[name]
+
+    @staticmethod
+    def _sublist(datasets):
+        """return a new `DataSetList` of `datasets` without comparing them.
+
+        Unlike `append`, equal elements are not merged. They are only in
+        self if added with `insert`, ``+=`` or item assignment, which
+        don't merge either.
+        """
+        res = DataSetList()
+        list.extend(res, datasets)
+        return res
+
+    def __getstate__(self):
+        """the index and the views are neither copied nor pickled"""
+        state = dict(self.__dict__)
+        state.pop('_index', None)
+        state.pop('_views', None)
+        return state
+
+    def __setitem__(self, key, value):
+        list.__setitem__(self, key, value)
+        self._clear_index()
+
+    def __delitem__(self, key):
+        list.__delitem__(self, key)
+        self._clear_index()
+
+    def __setslice__(self, i, j, sequence):  # only called in Python 2
+        list.__setslice__(self, i, j, sequence)
+        self._clear_index()
+
+    def __delslice__(self, i, j):  # only called in Python 2
+        list.__delslice__(self, i, j)
+        self._clear_index()
+
+    def __iadd__(self, other):
+        list.extend(self, other)
+        self._clear_index()
+        return self
+
+    def insert(self, index, o):
+        list.insert(self, index, o)
+        self._clear_index()
+
+    def remove(self, o):
+        list.remove(self, o)
+        self._clear_index()
+
+    def pop(self, *args):
+        res = list.pop(self, *args)
+        self._clear_index()
+        return res
+
+    def clear(self):
+        del self[:]
+
+    def reverse(self):
+        list.reverse(self)
+        self.__dict__.pop('_views', None)
+
     def pickle(self, *args, **kwargs):
         """Loop over self to pickle each element."""
         for i in self:
@@ -1860,10 +2231,8 @@ class DataSetList(list):
         corresponding slices as values.
 
         """
-        d = DictAlg()
-        for i in self:
-            d.setdefault((i.algId, ''), DataSetList()).append(i)
-        return d
+        return DictAlg((key, self._sublist(datasets)) for key, datasets in
+                       self._grouped('alg', lambda ds: (ds.algId, '')))
 
     def dictByDim(self):
         """Returns a dictionary of instances of this class by dimensions.
@@ -1872,10 +2241,8 @@ class DataSetList(list):
         corresponding slices as values.
 
         """
-        d = {}
-        for i in self:
-            d.setdefault(i.dim, DataSetList()).append(i)
-        return d
+        return dict((key, self._sublist(datasets)) for key, datasets in
+                    self._grouped('dim', lambda ds: ds.dim))
 
     def dictByFunc(self):
         """Returns a dictionary of instances of this class by functions.
@@ -1884,10 +2251,8 @@ class DataSetList(list):
         corresponding slices as values.
 
         """
-        d = {}
-        for i in self:
-            d.setdefault(i.funcId, DataSetList()).append(i)
-        return d
+        return dict((key, self._sublist(datasets)) for key, datasets in
+                    self._grouped('func', lambda ds: ds.funcId))
 
     def dictByDimFunc(self):
         """Returns a dictionary of instances of this class 
@@ -2121,8 +2486,8 @@ class DataSetList(list):
             else:
                 return 1 if getattr(a, key1) > getattr(b, key1) else -1
         sorted_self = list(sorted(self, key=functools.cmp_to_key(cmp_fun)))
-        for i, ds in enumerate(sorted_self):
-            self[i] = ds
+        list.__setitem__(self, slice(None), sorted_self)  # keeps the index
+        self.__dict__.pop('_views', None)
         return self
     
         # interested in algorithms, number of datasets, functions, dimensions
@@ -2599,6 +2964,8 @@ def set_unique_algId(ds_list, ds_list_reference, taken_ids=None):
             while algId + ' ' + str(i) in taken_ids:
                 i += 1
             ds.algId = algId + ' ' + str(i)
+    if isinstance(ds_list, DataSetList):
+        ds_list._clear_index()
 
 
 def processInputArgs(args, process_background_algorithms=False):
@@ -255,18 +255,26 @@ class HMultiReader(MultiReader):
         if not fvalues:
             raise ValueError('Value %g is not reached.')
 
-        if max(fvalues) <= 0.:
+        currentValue = self.updateCurrentValue(currentValue, max(fvalues))
+        return numpy.insert(self.currentLine(), 0, currentValue)
+
+    def updateCurrentValue(self, currentValue, fmax):
+        """Updates the alignment index from the largest reached value `fmax`.
+
+        Returns the alignment value of the current line.
+        """
+        if fmax <= 0.:
             if currentValue > 0.:
                 self.idxCurrentFOld = self.idxCurrentF
                 self.idxCurrentF = -numpy.inf
                 currentValue = 0.
             else:
                 self.idxCurrentF = max(self.idxCurrentF,
-                                       numpy.floor(numpy.log10(-max(fvalues) + 1e-12) * self.nbPtsF))
+                                       numpy.floor(numpy.log10(-fmax + 1e-12) * self.nbPtsF))
                 currentValue = self.calculateCurrentValue()
         else:
             self.idxCurrentF = min(self.idxCurrentF,
-                                   numpy.ceil(numpy.log10(max(fvalues) - 1e-12) * self.nbPtsF))
+                                   numpy.ceil(numpy.log10(fmax - 1e-12) * self.nbPtsF))
             # Above line may return: Warning: divide by zero encountered in
             # log10 in the case of negative fvalues.
             # In the case of negative values for fvalues, self.idxCurrentF
@@ -276,8 +284,7 @@ class HMultiReader(MultiReader):
             # The update of idxCurrentF is done so all the intermediate
             # function value trigger reached are not written, only the smallest
             currentValue = self.calculateCurrentValue()
-
-        return numpy.insert(self.currentLine(), 0, currentValue)
+        return currentValue
 
 
 class ArrayMultiReader(MultiReader):
@@ -417,6 +424,191 @@ def alignArrayData(data):
     # of the data.
 
 
+def align_data_vectorized(data, idx_evals, idx_funvals, rewind_reader=False):
+    """Aligns the data from a list of data arrays like `align_data`.
+
+    The result is identical to the result of `align_data`, but the data
+    lines are not read one by one. Instead, the lines reaching each
+    alignment value are found with `numpy.searchsorted` in all data
+    arrays at once. The state of the readers in `data` is not used,
+    hence `rewind_reader` only matters when the alignment falls back to
+    `align_data`, which happens if the alignment values of a data array
+    are not monotonous.
+
+    >>> import numpy
+    >>> from cocopp import readalign, dataformatsettings, testbedsettings, pproc
+    >>> dataformatsettings.current_data_format = dataformatsettings.BBOBOldDataFormat()
+    >>> _ = testbedsettings.load_current_testbed('GECCOBBOBTestbed', pproc.TargetValues)
+    >>> runs = [numpy.array([[1, 9, 9.], [4, 2, 2], [7, 0.5, 0.5]]),
+    ...         numpy.array([[1, 5, 5.], [3, 1e-3, 1e-3]])]
+    >>> for reader in [readalign.HMultiReader, readalign.VMultiReader]:
+    ...     res = readalign.align_data_vectorized(reader(runs), 0, 2)
+    ...     old = readalign.align_data(reader(runs), 0, 2)
+    ...     assert all(numpy.all((a == b) | (numpy.isnan(a) & numpy.isnan(b)))
+    ...                for a, b in zip(res, old))
+    >>> res[0]
+    array([[1.e+00, 9.e+00, 5.e+00],
+           [3.e+00, 9.e+00, 1.e-03],
+           [4.e+00, 2.e+00, 1.e-03],
+           [7.e+00, 5.e-01, 1.e-03]])
+
+    """
+    if isinstance(data, HMultiReader):
+        res = _align_horizontally(data, idx_funvals, [idx_evals])
+    elif isinstance(data, VMultiReader):
+        res = _align_vertically(data, idx_evals, [idx_funvals])
+    else:
+        raise TypeError("reset class %s not implemented"
+                        % type(data))
+    if res is None:
+        return align_data(data, idx_evals, idx_funvals, rewind_reader)
+    return (res, numpy.asarray([i.data[-1, idx_evals] for i in data]),
+            numpy.asarray([i.data[-1, idx_funvals] for i in data]))
+
+
+def align_array_data_vectorized(data):
+    """Aligns the data from a list of aligned arrays like `alignArrayData`.
+
+    See `align_data_vectorized` for details.
+    """
+    if isinstance(data, HMultiReader):
+        res = _align_horizontally(data, data.idx, slice(1, None))
+    elif isinstance(data, VMultiReader):
+        res = _align_vertically(data, data.idx, slice(1, None))
+    else:
+        raise TypeError("reset class %s not implemented"
+                        % type(data))
+    return alignArrayData(data) if res is None else res
+
+
+def _aligned_values(data, positions, finished, idx_data):
+    """return the aligned data columns `idx_data` of all readers in `data`.
+
+    `positions` and `finished` are arrays of shape (nb_lines,
+    len(data)), the former gives the current line of each reader and the
+    latter whether the reader is finished, in which case its
+    ``idxEvals`` columns become `numpy.nan` as in
+    `MultiReader.SingleReader.next`.
+    """
+    res = []
+    for i, reader in enumerate(data):
+        lines = reader.data[positions[:, i]]
+        lines[numpy.ix_(finished[:, i], numpy.atleast_1d(
+            numpy.arange(lines.shape[1])[reader.idxEvals]))] = numpy.nan
+        res.append(lines[:, idx_data])
+    return numpy.hstack(res)
+
+
+def _align_horizontally(data, idx, idx_data):
+    """return the data of `HMultiReader` `data` aligned on column `idx`.
+
+    Follows exactly the alignment of `HMultiReader`, where `data` only
+    serves to compute the alignment values. Return `None` if a data
+    array is not sorted by decreasing values in column `idx`.
+    """
+    arrays = [i.data for i in data]
+    if not arrays or any(numpy.ndim(a) != 2 for a in arrays):
+        return None
+    fvalues = [a[:, idx] for a in arrays]
+    if any(numpy.any(numpy.isnan(f)) or numpy.any(f[1:] > f[:-1])
+           for f in fvalues):
+        return None
+    lengths = numpy.array([len(f) for f in fvalues])
+    offsets = numpy.cumsum(lengths) - lengths
+
+    def reached_lines(values):
+        """return for each value in `values` the current lines, whether
+        the readers are finished, whether all readers are finished and the
+        largest reached f-value (or `None`) after `HMultiReader.isFinished`
+        and `HMultiReader.align` were called with this value.
+
+        As the alignment values decrease by much more than the relative
+        tolerance of `is_close`, the current lines do not depend on the
+        previous alignment values.
+        """
+        values = numpy.asarray(values)[:, None]
+        # index of the first line reaching the value
+        first = numpy.column_stack([numpy.searchsorted(-f, -values[:, 0])
+                                    for f in fvalues])
+        finished = first == lengths
+        positions = numpy.minimum(first, lengths - 1)
+        previous = numpy.maximum(first - 1, 0)
+        positions[(first > 0) & ~finished &
+                  _are_close(flat_fvalues[offsets + previous], values)] -= 1
+        current = flat_fvalues[offsets + positions]
+        reached = (current <= values) | _are_close(current, values)
+        fmax = numpy.where(reached, current, -numpy.inf).max(axis=1)
+        return list(zip(positions, finished, numpy.all(finished, axis=1),
+                        [f if r else None for f, r in zip(fmax, numpy.any(reached, axis=1))]))
+
+    flat_fvalues = numpy.hstack(fvalues)
+    data = type(data)(data)  # only used for its alignment value logic
+    data.idx = idx
+    current_value = data.getInitialValue()
+    # precompute the positive alignment values 10**(i/nbPtsF) in one go
+    lines = {}
+    fpositive = flat_fvalues[flat_fvalues > 0]
+    if len(fpositive) and numpy.isfinite(data.idxCurrentF):
+        indices = numpy.arange(data.idxCurrentF, min(data.idxCurrentF,
+                    numpy.ceil(numpy.log10(min(fpositive)) * data.nbPtsF)) - 3, -1)
+        values = [numpy.power(10, i / data.nbPtsF) for i in indices]
+        lines.update(zip(values, reached_lines(values)))
+
+    def reached(value):
+        """return the result of `reached_lines` for `value`"""
+        if value not in lines:
+            lines[value] = reached_lines([value])[0]
+        return lines[value]
+
+    res, res_positions, res_finished = [], [], []
+
+    def align(current_value):
+        """see `HMultiReader.align`"""
+        positions, finished, _, fmax = reached(current_value)
+        if fmax is None:
+            raise ValueError('Value %g is not reached.')
+        res.append(data.updateCurrentValue(current_value, fmax))
+        res_positions.append(positions)
+        res_finished.append(finished)
+
+    if reached(data.calculateCurrentValue())[2]:
+        align(current_value)
+    while not reached(data.calculateCurrentValue())[2]:
+        align(current_value)
+        current_value = data.newCurrentValue()
+
+    return numpy.column_stack((res, _aligned_values(
+        data, numpy.array(res_positions), numpy.array(res_finished), idx_data)))
+
+
+def _align_vertically(data, idx, idx_data):
+    """return the data of `VMultiReader` `data` aligned on column `idx`.
+
+    Like with `VMultiReader`, the alignment values are the distinct
+    values in column `idx`, except for the first lines. Return `None` if a data array is not sorted
+    by increasing values in column `idx` or if some alignment values are
+    close to each other, which requires sequential processing.
+    """
+    arrays = [i.data for i in data]
+    if not arrays or any(numpy.ndim(a) != 2 for a in arrays):
+        return None
+    evals = [a[:, idx] for a in arrays]
+    if any(numpy.any(numpy.isnan(e)) or numpy.any(e[1:] < e[:-1])
+           for e in evals):
+        return None
+    # first lines are read upfront and only the smallest first value is
+    # an alignment value, unless the first line is the last line
+    values = numpy.unique(numpy.hstack(
+        [[min(e[0] for e in evals)]] + [e[1:] if len(e) > 1 else e for e in evals]))
+    if numpy.any(_are_close(values[1:], values[:-1])):
+        return None
+    nb_reached = numpy.column_stack([numpy.searchsorted(e, values, 'right')
+                                     for e in evals])
+    return numpy.column_stack((values, _aligned_values(
+        data, numpy.maximum(nb_reached - 1, 0),
+        nb_reached == [len(e) for e in evals], idx_data)))
+
+
 def openfile(filePath):
     if not os.path.isfile(filePath):
         if ('win32' in sys.platform) and len(filePath) > 259:
@@ -427,13 +619,20 @@ def openfile(filePath):
     return open(filePath, 'r')
 
 
-def split(dataFiles, idx_to_load=None, dim=None):
+def split(dataFiles, idx_to_load=None, dim=None, vectorized=True):
     """Split a list of data files into arrays corresponding to data sets.
        The Boolean list idx_to_load is thereby indicating whether a
        given part of the split is to be considered or not if None, all
        instances are considered.
+
+       A data file is split into blocks of data lines on the header
+       lines starting with ``%``. If `vectorized`, each block is
+       converted into an array with a single call to `numpy.fromstring`
+       (see `block_to_array`), otherwise line by line (see
+       `lines_to_array`), which is much slower on large files.
     """
 
+    to_array = block_to_array if vectorized else lines_to_array
     data_sets = []
     algorithms = []
     success_ratio = []
@@ -442,93 +641,51 @@ def split(dataFiles, idx_to_load=None, dim=None):
         with openfile(fil) as f:
             # This doesnt work with windows.
             # content = numpy.loadtxt(fil, comments='%')
-            lines = f.readlines()
+            lines = f.read().split('\n')
+        if lines[-1] == '':  # same lines as with readlines
+            lines.pop()
 
-        content = []
         idx = 0  # instance index for checking in idx_to_load
         current_instance = 0
         current_reference_value = 0
         is_best_algorithm_data = False
 
-        # Save values in array content. Check for nan and inf.
-        for line in lines:
-            if line.startswith('%'):
-                if content:
-                    if (idx_to_load is None) or (idx_to_load and len(idx_to_load) > idx and idx_to_load[idx]):
-                        data_sets.append(numpy.vstack(content))
-                    elif genericsettings.verbose:
-                            print('skipped instance...')
-                    # Use only the reference values from instances 1 to 5.
-                    if current_instance in (1, 2, 3, 4, 5):
-                        reference_values[current_instance] = current_reference_value
-
-                    content = []
-                    current_instance = 0
-                    current_reference_value = 0
-                    is_best_algorithm_data = False
-                    idx += 1
-
-                # Get the current instance and reference value.
-                parts = line.strip('\n').strip('\%').split(', ')
-                for elem in parts:
-                    if '=' in elem:
-                        key, value = elem.split('=', 1)
-                        if key.strip() == 'instance':
-                            current_instance = int(value.strip())
-                        elif key.strip() == 'reference value':
-                            current_reference_value = float(value.strip())
-                        elif key.strip() == 'algorithm type':
-                            is_best_algorithm_data = 'best' == value.strip()
-
-                continue
-
-            # else remove end-of-line sign
-            # and split into single strings
-            data = line.strip('\n').split()
-
-            # remove additional data for best algorithm
-            if is_best_algorithm_data:
-                index = len(data) - 3
-                if index <= 0:
-                    warnings.warn('Invalid best algorithm data!')
-                else:
-                    algorithms.append(data[index])
-                    successful_runs = int(data[index + 1])
-                    all_runs = int(data[index + 2])
-                    success_ratio.append([successful_runs, all_runs])
-                    data = data[:-3]  # remove the three processed items from data
-
-            if dim and len(data) != dim + 5:
-                warnings.warn('Incomplete line %s in  ' % line +
-                              'data file %s: ' % fil)
-                continue
-            for index in range(len(data)):
-                if data[index] in ('Inf', 'inf'):
-                    data[index] = numpy.inf
-                elif data[index] in ('-Inf', '-inf'):
-                    data[index] = -numpy.inf
-                elif data[index] in ('NaN', 'nan'):
-                    data[index] = numpy.nan
-                else:
-                    try:
-                        data[index] = float(data[index])
-                    except ValueError:
-                        warnings.warn('%s is not a valid number!' % data[index])
-                        data[index] = numpy.nan
-
-            if data:
-                content.append(numpy.array(data))
-            # Check that it always have the same length?
-
-        if content:
-            if (idx_to_load is None) or (idx_to_load and len(idx_to_load) > idx and idx_to_load[idx]):
-                data_sets.append(numpy.vstack(content))
-            elif genericsettings.verbose:
-                    print('skipped instance...')
-
-            # Use only the reference values from instances 1 to 5.
-            if current_instance in (1, 2, 3, 4, 5):
-                reference_values[current_instance] = current_reference_value
+        header_indices = [i for i, line in enumerate(lines) if line.startswith('%')]
+        start = 0
+        for end in header_indices + [len(lines)]:
+            content, block_algorithms, block_success_ratio = to_array(
+                lines[start:end], is_best_algorithm_data, dim, fil)
+            algorithms.extend(block_algorithms)
+            success_ratio.extend(block_success_ratio)
+            if content is not None:
+                if (idx_to_load is None) or (idx_to_load and len(idx_to_load) > idx and idx_to_load[idx]):
+                    data_sets.append(content)
+                elif genericsettings.verbose:
+                        print('skipped instance...')
+                # Use only the reference values from instances 1 to 5.
+                if current_instance in (1, 2, 3, 4, 5):
+                    reference_values[current_instance] = current_reference_value
+
+                current_instance = 0
+                current_reference_value = 0
+                is_best_algorithm_data = False
+                idx += 1
+
+            if end == len(lines):
+                break
+            start = end + 1
+
+            # Get the current instance and reference value.
+            parts = lines[end].strip('\%').split(', ')
+            for elem in parts:
+                if '=' in elem:
+                    key, value = elem.split('=', 1)
+                    if key.strip() == 'instance':
+                        current_instance = int(value.strip())
+                    elif key.strip() == 'reference value':
+                        current_reference_value = float(value.strip())
+                    elif key.strip() == 'algorithm type':
+                        is_best_algorithm_data = 'best' == value.strip()
 
     if len(algorithms) < len(data_sets):
         algorithms = []
@@ -536,5 +693,129 @@ def split(dataFiles, idx_to_load=None, dim=None):
     return data_sets, algorithms, reference_values, success_ratio
 
 
+def block_to_array(lines, is_best_algorithm_data=False, dim=None, filename=''):
+    """convert a block of data `lines` in one go into a 2-D array.
+
+    Return ``(array, algorithms, success_ratio)`` like `lines_to_array`,
+    to which the conversion is delegated if the lines do not form a
+    rectangular array of numbers (e.g. because of an incomplete or
+    invalid line), such that the same warnings are issued.
+
+    >>> from cocopp.readalign import block_to_array, lines_to_array
+    >>> lines = ['1 2.5 Inf', '', '3 -inf NaN']
+    >>> block_to_array(lines)[0]
+    array([[ 1. ,  2.5,  inf],
+           [ 3. , -inf,  nan]])
+    >>> numpy.array_equal(block_to_array(lines)[0], lines_to_array(lines)[0],
+    ...                   equal_nan=True)
+    True
+    >>> block_to_array(['1 1e-8 ALG 3 15'], True)
+    (array([[1.e+00, 1.e-08]]), ['ALG'], [[3, 15]])
+
+    Lines of different length are not reshaped into shifted rows, even
+    if their numbers add up to full rows, but raise like in
+    `lines_to_array`:
+
+    >>> block_to_array(['1 2 3', '4 5', '6 7 8 9', '10 11 12'])  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+        ...
+    ValueError: ...
+
+    """
+    if len(lines) < 2 or not lines[0].strip() or not lines[-1].strip():
+        return lines_to_array(lines, is_best_algorithm_data, dim, filename)
+    ncols = len(lines[0].split())
+    if len(lines[-1].split()) != ncols:
+        return lines_to_array(lines, is_best_algorithm_data, dim, filename)
+
+    numeric_lines, algorithms, success_ratio = lines, [], []
+    if is_best_algorithm_data:
+        # the last three columns are algorithm name, successful and all runs
+        try:
+            parts = [line.rsplit(None, 3) for line in lines]
+            algorithms = [part[1] for part in parts]
+            success_ratio = [[int(part[2]), int(part[3])] for part in parts]
+        except (IndexError, ValueError):
+            return lines_to_array(lines, is_best_algorithm_data, dim, filename)
+        numeric_lines = [part[0] for part in parts]
+        ncols -= 3
+
+    if dim and ncols != dim + 5:
+        return lines_to_array(lines, is_best_algorithm_data, dim, filename)
+    if any(len(line.split()) not in (0, ncols) for line in numeric_lines):
+        return lines_to_array(lines, is_best_algorithm_data, dim, filename)
+    text = '\n'.join(numeric_lines)
+    with warnings.catch_warnings():
+        # numpy warns and stops reading at invalid data, which is detected below
+        warnings.simplefilter('ignore', DeprecationWarning)
+        try:
+            data = numpy.fromstring(text, sep=' ')
+        except ValueError:  # may be raised in future numpy versions
+            return lines_to_array(lines, is_best_algorithm_data, dim, filename)
+    if len(data) != len(text.split()) or len(data) % ncols:
+        return lines_to_array(lines, is_best_algorithm_data, dim, filename)
+    return data.reshape(len(data) // ncols, ncols), algorithms, success_ratio
+
+
+def lines_to_array(lines, is_best_algorithm_data=False, dim=None, filename=''):
+    """convert a block of data `lines` line by line into a 2-D array.
+
+    Return ``(array, algorithms, success_ratio)``, where `array` is `None`
+    when no valid line was found and the latter two are only non-empty
+    for best algorithm data (`is_best_algorithm_data`).
+    """
+    content = []
+    algorithms = []
+    success_ratio = []
+
+    # Save values in array content. Check for nan and inf.
+    for line in lines:
+        # remove end-of-line sign
+        # and split into single strings
+        data = line.strip('\n').split()
+
+        # remove additional data for best algorithm
+        if is_best_algorithm_data:
+            index = len(data) - 3
+            if index <= 0:
+                warnings.warn('Invalid best algorithm data!')
+            else:
+                algorithms.append(data[index])
+                successful_runs = int(data[index + 1])
+                all_runs = int(data[index + 2])
+                success_ratio.append([successful_runs, all_runs])
+                data = data[:-3]  # remove the three processed items from data
+
+        if dim and len(data) != dim + 5:
+            warnings.warn('Incomplete line %s in  ' % line +
+                          'data file %s: ' % filename)
+            continue
+        for index in range(len(data)):
+            if data[index] in ('Inf', 'inf'):
+                data[index] = numpy.inf
+            elif data[index] in ('-Inf', '-inf'):
+                data[index] = -numpy.inf
+            elif data[index] in ('NaN', 'nan'):
+                data[index] = numpy.nan
+            else:
+                try:
+                    data[index] = float(data[index])
+                except ValueError:
+                    warnings.warn('%s is not a valid number!' % data[index])
+                    data[index] = numpy.nan
+
+        if data:
+            content.append(numpy.array(data))
+        # Check that it always have the same length?
+
+    return (numpy.vstack(content) if content else None), algorithms, success_ratio
+
+
 def is_close(a, b, rel_tol=1e-09, abs_tol=0.0):
     return abs(a-b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol)
+
+
+def _are_close(a, b, rel_tol=1e-09, abs_tol=0.0):
+    """elementwise `is_close` of arrays `a` and `b`"""
+    return numpy.abs(a - b) <= numpy.maximum(
+        rel_tol * numpy.maximum(numpy.abs(a), numpy.abs(b)), abs_tol)
@@ -22,7 +22,7 @@ import getopt
 import warnings
 import webbrowser
 import matplotlib
-from . import genericsettings, testbedsettings, rungeneric1, rungenericmany, toolsdivers, bestalg, archiving
+from . import genericsettings, testbedsettings, rungeneric1, rungenericmany, toolsdivers, bestalg, archiving, datacache
 from .toolsdivers import truncate_latex_command_file, print_done, diff_attr
 from .ppfig import Usage
 from .compall import ppfigs
@@ -179,6 +179,16 @@ def main(argv=None):
 
             do not generate the svg figures which are used in html files
 
+        --no-cache
+
+            read all data files anew, bypassing the data cache in
+            `genericsettings.data_cache_folder` (see `cocopp.datacache`),
+            which by default keeps up to 1 GB of data in ~/.cocopp/cache
+
+        --clear-cache
+
+            remove all entries from the data cache before processing
+
 
     Exceptions raised:
 
@@ -215,7 +225,8 @@ def main(argv=None):
         try:
             opts, args = getopt.getopt(argv, genericsettings.shortoptlist,
                                        genericsettings.longoptlist +
-                                       ['include-single', 'in-a-hurry=', 'input-path='])
+                                       ['include-single', 'in-a-hurry=', 'input-path=',
+                                        'no-cache', 'clear-cache'])
         except getopt.error as msg:
             raise Usage(msg)
 
@@ -249,6 +260,10 @@ def main(argv=None):
                     print('in_a_hurry like ', genericsettings.in_a_hurry, ' (should finally be set to zero)')
             elif o in ("--input-path", ):
                 inputdir = a
+            elif o in ("--no-cache", ):
+                genericsettings.use_data_cache = False
+            elif o in ("--clear-cache", ):
+                datacache.clear()
             elif o in "--no-svg":
                 genericsettings.generate_svg_files = False
             else:
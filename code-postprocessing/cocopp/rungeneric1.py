@@ -295,6 +295,7 @@ def main(argv=None):
         config.config_target_values_setting(genericsettings.isExpensive,
                                             genericsettings.runlength_based_targets)
         config.config(dsList[0].testbed_name)
+        dsList.summarize()  # precompute aRT etc. for all target values
         if genericsettings.verbose:
             for i in dsList:                
                 # check whether current set of instances correspond to correct
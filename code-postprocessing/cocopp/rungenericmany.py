@@ -320,6 +320,8 @@ def main(argv=None):
         config.config_target_values_setting(genericsettings.isExpensive,
                                             genericsettings.runlength_based_targets)
         config.config(dsList[0].testbed_name)
+        for alg in dictAlg:  # dsList contains the same data sets
+            dictAlg[alg].summarize()  # precompute aRT etc. for all target values
 
         for i in dsList:
             if i.dim not in testbedsettings.current_testbed.dimensions_to_display:
@@ -14,6 +14,7 @@ import tempfile
 import shutil
 import subprocess
 import doctest
+import atexit
 
 import matplotlib  # just to make sure the following is actually done first
 
@@ -226,13 +227,325 @@ def delete_files(all_files=False):
         os.remove(join_path(cwd, 'bbob.bib'))
 
 
+def benchmark_readalign_split(tar_files=None, repetitions=3):
+    """compare the timings of the vectorized and the line-by-line parsing
+    of data files in `cocopp.readalign.split`.
+
+    `tar_files` default to the reference algorithm data in ``refalgs``.
+    The results of both parsers are asserted to be identical. Return the
+    ratio of the line-by-line over the vectorized (best of `repetitions`)
+    timing.
+    """
+    import tarfile
+    import numpy as np
+    from cocopp import readalign
+    if tar_files is None:
+        refalgs_folder = join_path(os.path.dirname(os.path.realpath(__file__)), 'refalgs')
+        tar_files = [join_path(refalgs_folder, name)
+                     for name in sorted(os.listdir(refalgs_folder))
+                     if name.endswith('.tar.gz')]
+    timings = {True: [], False: []}
+    with InfolderGoneWithTheWind():
+        for tar_file in tar_files:
+            tarfile.open(tar_file).extractall()
+        data_files = sorted(join_path(root, name)
+                            for root, dirnames, filenames in os.walk('.')
+                            for name in filenames
+                            if name.endswith('.dat') or name.endswith('.tdat'))
+        for _ in range(repetitions):
+            results = {}
+            for vectorized in (True, False):
+                t0 = time.time()
+                results[vectorized] = [readalign.split([name], vectorized=vectorized)
+                                       for name in data_files]
+                timings[vectorized].append(time.time() - t0)
+        for res1, res2 in zip(results[True], results[False]):
+            assert len(res1[0]) == len(res2[0])
+            assert all(np.array_equal(a1, a2, equal_nan=True)
+                       for a1, a2 in zip(res1[0], res2[0]))
+            assert res1[1:] == res2[1:]
+    print('readalign.split on %d data files: %.3f seconds vectorized, '
+          '%.3f seconds line-by-line' % (len(data_files), min(timings[True]),
+                                         min(timings[False])))
+    return min(timings[False]) / min(timings[True])
+
+def benchmark_target_lookup(tar_file=None, number_of_targets=51, repetitions=3):
+    """print and return the per-call latencies of the target lookups
+    `DataSet.detEvals`, `DataSet.detERT`, `DataSet.generateRLData` and
+    `DataSet.det_evals_array` in microseconds.
+
+    `tar_file` defaults to the ``best2009-bbob`` reference algorithm
+    data in ``refalgs``. Each method is called once per data set with
+    `number_of_targets` log-uniformly spaced targets, the best of
+    `repetitions` is reported.
+    """
+    import tarfile
+    import warnings
+    import numpy as np
+    from cocopp import pproc, testbedsettings
+    if tar_file is None:
+        tar_file = join_path(os.path.dirname(os.path.realpath(__file__)),
+                             'refalgs', 'best2009-bbob.tar.gz')
+    targets = list(10**np.linspace(2, -8, number_of_targets))
+    latencies = {}
+    with InfolderGoneWithTheWind():
+        tarfile.open(tar_file).extractall()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            testbedsettings.current_testbed = None
+            datasets = pproc.DataSetList('.')
+        for name in ('detEvals', 'detERT', 'generateRLData', 'det_evals_array'):
+            timings = []
+            for _ in range(repetitions):
+                t0 = time.time()
+                for ds in datasets:
+                    getattr(ds, name)(targets)
+                timings.append(time.time() - t0)
+            latencies[name] = 1e6 * min(timings) / len(datasets)
+    print('target lookups for %d targets on %d data sets: %s' % (
+        number_of_targets, len(datasets), ', '.join('%s %.1f us' % (name, latencies[name])
+                                                    for name in sorted(latencies))))
+    return latencies
+
+def _write_bbob_data(folder, maxevals=3, algorithm='ALG', function=1, dimension=2,
+                     instances=(1, 2)):
+    """write the data of trials of three evaluations on the `instances`
+    of `function` in `dimension` by `algorithm` in the ``bbob`` format
+    into `folder`, where `maxevals` is written into the index file"""
+    header = ('%% f evaluations | g evaluations | best noise-free fitness - Fopt (%.12e) + sum g_i+ '
+              '| measured fitness | best measured fitness or single-digit g-values | x1 | x2...\n')
+    trials = ((7.948e1, ['+5.210094080e+00', '+2.806094080e+00', '+1.864254080e+00']),
+              (3.9448e2, ['+3.912953472e+01', '+3.084073472e+01', '+2.553777472e+01']))
+    trials = [trials[i % 2] for i in range(len(instances))]
+    name = 'data_f%d/bbobexp_f%d_DIM%d_i%d' % (function, function, dimension, instances[0])
+    os.makedirs(join_path(folder, 'data_f%d' % function))
+    with open(join_path(folder, 'bbobexp_f%d_i%d.info' % (function, instances[0])), 'w') as f:
+        f.write("suite = 'bbob', funcId = %d, DIM = %d, Precision = 1.000e-08, algId = '%s', "
+                "coco_version = '2.3', logger = 'bbob', data_format = 'bbob-new2'\n%%\n%s.dat, %s\n"
+                % (function, dimension, algorithm, name,
+                   ', '.join('%d:%d|%s' % (instance, maxevals, trial[1][-1])
+                             for instance, trial in zip(instances, trials))))
+    for extension in ('.dat', '.tdat'):
+        with open(join_path(folder, name + extension), 'w') as f:
+            for fopt, deltas in trials:
+                f.write(header % fopt)
+                for evaluations, delta in enumerate(deltas, 1):
+                    f.write('%d 0 %s +%.9e +%.9e%s\n' % (
+                        evaluations, delta, fopt + float(delta), fopt + float(delta),
+                        dimension * ' +1.0000e+00'))
+
+def run_data_cache_test():
+    """check that data and warnings from `cocopp.datacache` are the same
+    as from reading the data files, that the least recently used entries
+    are removed and that the ``--no-cache`` and ``--clear-cache`` options
+    of `cocopp.main` work"""
+    import warnings
+    import numpy as np
+    import cocopp
+    from cocopp import datacache, genericsettings, pproc, testbedsettings
+    settings = (genericsettings.data_cache_folder, genericsettings.data_cache_size)
+    with InfolderGoneWithTheWind():
+        genericsettings.data_cache_folder = os.path.abspath('cache')
+        try:
+            _write_bbob_data('data', maxevals=5)  # inconsistent with the data files
+            datasets = []
+            for _ in range(2):  # read the data files, then the cache entry
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter('always')
+                    testbedsettings.current_testbed = None
+                    datasets.append(pproc.DataSetList('data')[0])
+                    datasets[-1].evals  # read lazily loaded data
+                assert any('difference between the maxevals' in str(w.message) for w in caught)
+                assert len(datacache._entries()) == 1
+            for name in ('evals', 'funvals', 'maxevals', 'finalfunvals', 'ert'):
+                assert np.array_equal(getattr(datasets[0], name), getattr(datasets[1], name),
+                                      equal_nan=True), name
+
+            def filename(key):
+                return os.path.join(datacache.folder(), key + '.npz')
+            datacache.clear()
+            keys = [datacache.key([], name) for name in 'abc']
+            for i, key in enumerate(keys[:2]):
+                datacache.save(key, {'evals': np.arange(1000.)}, {})
+                os.utime(filename(key), (1e9 + i, 1e9 + i))
+            assert datacache.load(keys[0]) is not None  # now more recently used than keys[1]
+            genericsettings.data_cache_size = 2.5 * os.path.getsize(filename(keys[0]))
+            datacache.save(keys[2], {'evals': np.arange(1000.)}, {})
+            assert [datacache.load(key) is not None for key in keys] == [True, False, True]
+
+            genericsettings.data_cache_size = settings[1]
+            cocopp.main('--no-cache --clear-cache --no-svg -o ppdata data')
+            assert not datacache._entries()
+        finally:
+            genericsettings.data_cache_folder, genericsettings.data_cache_size = settings
+            genericsettings.use_data_cache = True
+
+def _observed_random_search(observer_options):
+    """run a seeded random search on a small ``bbob`` suite observed
+    with `observer_options` and return the result folder"""
+    import numpy as np
+    import cocoex
+    suite = cocoex.Suite('bbob', 'instances: 1-3', 'dimensions: 2,3 function_indices: 1,21')
+    observer = cocoex.Observer('bbob', observer_options)
+    rng = np.random.RandomState(3)
+    for problem in suite:
+        problem.observe_with(observer)
+        for x in problem.lower_bounds + rng.rand(300, problem.dimension) * (
+                problem.upper_bounds - problem.lower_bounds):
+            problem(x)
+    folder = observer.result_folder
+    observer.free()
+    suite.free()
+    return folder
+
+def run_binary_data_test():
+    """check that the binary data of the ``bbob`` logger and the data
+    converted with `cocopp.binarydata.convert` load like the text data,
+    needs `cocoex`"""
+    import numpy as np
+    import cocopp
+    from cocopp import binarydata
+
+    def load(folder):
+        """return the data of `folder` sorted by function and dimension"""
+        return sorted(cocopp.load(folder), key=lambda ds: (ds.funcId, ds.dim))
+
+    def assert_same(datasets1, datasets2):
+        assert len(datasets1) == len(datasets2) > 0
+        for ds1, ds2 in zip(datasets1, datasets2):
+            assert (ds1.funcId, ds1.dim) == (ds2.funcId, ds2.dim)
+            for name in ('evals', 'funvals', 'maxevals', 'finalfunvals'):
+                # the text format has 10 significant digits
+                assert np.allclose(getattr(ds1, name), getattr(ds2, name),
+                                   rtol=1e-9, atol=0, equal_nan=True), (ds1, name)
+
+    with InfolderGoneWithTheWind():
+        text = load(_observed_random_search('result_folder: text'))
+        binary = load(_observed_random_search('result_folder: binary binary_data: 1'))
+        assert all(ds.get_data_format() == binarydata.data_format for ds in binary)
+        assert_same(text, binary)
+        for source, binary_target, compress in [('exdata/text', True, False),
+                                                ('exdata/text', True, True),
+                                                ('exdata/binary', False, False)]:
+            target = 'converted-%s-%s' % (binary_target, compress)
+            assert binarydata.convert(source, target, binary_target, compress) == 2 * len(text)
+            assert_same(text, load(target))
+
+def run_dataset_list_test():
+    """check the index and the cached views of `pproc.DataSetList`
+    against freshly built lists while the list is changed"""
+    import numpy as np
+    from cocopp import pproc, testbedsettings
+
+    def check(datasets):
+        """compare `datasets` with a new list of the same elements"""
+        fresh = pproc.DataSetList()
+        list.extend(fresh, datasets)
+        for name in ('dictByAlg', 'dictByDim', 'dictByFunc'):
+            views = [dict((key, [id(ds) for ds in value])
+                          for key, value in getattr(dsl, name)().items())
+                     for dsl in (datasets, fresh)]
+            assert views[0] == views[1], name
+        index = datasets._ds_index()
+        assert sum(len(value) for value in index.values()) == len(datasets)
+        assert all(any(ds is other for other in index[datasets._index_key(ds)])
+                   for ds in datasets)
+
+    def merged(datasets):
+        """return the instances and evals of the elements in a fixed order"""
+        return sorted(((ds.algId, ds.funcId, ds.dim, sorted(ds.instancenumbers), ds.evals)
+                       for ds in datasets), key=lambda res: res[:3])
+
+    with InfolderGoneWithTheWind():
+        folders = []
+        for instances in [(1, 2), (3, 4)]:
+            for algorithm in ['A', 'B']:
+                for function in [1, 2]:
+                    for dimension in [2, 3]:
+                        folders.append('%s_f%d_%dD_i%d' % (algorithm, function, dimension, instances[0]))
+                        _write_bbob_data(folders[-1], algorithm=algorithm, function=function,
+                                         dimension=dimension, instances=instances)
+        testbedsettings.current_testbed = None
+
+        def load(folders):
+            return [ds for folder in folders for ds in pproc.DataSetList(folder)]
+
+        datasets = pproc.DataSetList()
+        for ds in load(folders):  # the second half is merged into the first
+            check(datasets)
+            datasets.append(ds)
+        check(datasets)
+        expected = pproc.DataSetList(folders)
+        assert len(datasets) == len(expected) == 8
+        for res1, res2 in zip(merged(datasets), merged(expected)):
+            assert res1[:4] == res2[:4] and res1[3] == [1, 2, 3, 4]
+            assert np.array_equal(res1[4], res2[4], equal_nan=True)
+
+        removed = [datasets.pop(), datasets.pop(0)]
+        check(datasets)
+        datasets.remove(datasets[2])
+        check(datasets)
+        del datasets[1:3]
+        check(datasets)
+        datasets.append(removed[0])
+        check(datasets)
+        datasets += [removed[1]]
+        check(datasets)
+        datasets.insert(1, load(folders[:1])[0])  # an equal element is not merged
+        check(datasets)
+        datasets[1] = load(folders[1:2])[0]
+        check(datasets)
+        datasets.sort('funcId', 'dim')
+        check(datasets)
+        datasets.reverse()
+        check(datasets)
+
+        number = len(datasets)
+        pproc.set_unique_algId(datasets, load(folders[:1]))  # renames A to A 2
+        algorithms = set(key[0] for key in datasets.dictByAlg())
+        assert 'A 2' in algorithms and 'A' not in algorithms
+        check(datasets)
+        ds = load(folders[8:9])[0]
+        ds.algId = 'A 2'
+        datasets.append(ds)  # merged with the renamed element
+        assert len(datasets) == number
+        check(datasets)
+
+def run_unit_tests():
+    """run the tests of single functionalities in this process"""
+    print('launching unit tests')
+    t0 = time.time()
+    run_data_cache_test()
+    run_dataset_list_test()
+    print('** unit tests finished in ', time.time() - t0, ' seconds')
+
 def main(arguments):
     """these tests are executed when ``python cocopp`` is called.
 
     with ``wine`` as second argument ``C:\\Python26\\python.exe``
     instead of ``python`` is called
 
+    With ``benchmark`` as argument, only the benchmarks are run, with
+    ``unit`` only the tests in this process which don't call
+    ``python -m cocopp`` and no doctests.
+
+    The data cache of the tests in this process, including the doctests,
+    is a temporary folder, the ``python -m cocopp`` calls don't use the
+    data cache.
     """
+    import cocopp  # the module the doctests use
+    cocopp.genericsettings.data_cache_folder = tempfile.mkdtemp(prefix='_cocopp_cache_')
+    atexit.register(shutil.rmtree, cocopp.genericsettings.data_cache_folder, True)
+
+    if 'benchmark' in arguments:
+        print('*** benchmarking module cocopp ***')
+        benchmark_readalign_split()
+        benchmark_target_lookup()
+        return
+
+    if 'unit' in arguments:
+        run_unit_tests()
+        return
 
     run_all_tests = 'all' in arguments
 
@@ -246,7 +559,7 @@ def main(arguments):
 
     # old_data_path = ' ' + prepare_data(run_all_tests)
 
-    command = ' cocopp --no-svg --settings=grayscale '  # TODO: grayscale has to go
+    command = ' cocopp --no-svg --no-cache --settings=grayscale '  # TODO: grayscale has to go
 
     #copy_latex_templates()
     #print('LaTeX templates copied.')
@@ -398,6 +711,12 @@ def main(arguments):
             print('**  subtest 16 finished in ', time.time() - t0, ' seconds')
             assert result == 0, 'Test failed: rungeneric on newly generated random search data on `bbob-biobj-mixint`.'
 
+        t0 = time.time()
+        run_binary_data_test()  # cocoex is installed by do.py
+        print('**  subtest 17 finished in ', time.time() - t0, ' seconds')
+
+    run_unit_tests()
+
     print('launching doctest (it might be necessary to close a few pop up windows to finish)')
     t0 = time.time()
 
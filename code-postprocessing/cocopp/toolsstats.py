@@ -265,30 +265,22 @@ def drawSP(runlengths_succ, runlengths_unsucc, percentiles,
     # geometric distribution for number of unsuccessful runs
     # The samplesize depends on the number of unsuccessful runs?
 
-    arrStats = []
     sdata = np.array(runlengths_succ)  # more efficient indexing
-    sdata.sort()
     udata = np.array(runlengths_unsucc)  # more efficient indexing
-    udata.sort()
     Nu = len(udata)
     Ns = len(sdata)
-    # data = np.r_[udata, sdata]
     N = Ns + Nu
+    samplesize = int(samplesize)
 
-    for i in range(int(samplesize)):
-        # relying that idx<len(data)
-        sumdata = 0
-        idx = np.random.randint(N)
-        # set_trace()
-        while idx < Nu:
-            sumdata += udata[idx]
-            idx = np.random.randint(N)
-
-        sumdata += sdata[idx - Nu]
-
-        arrStats.append(sumdata)  # We know we have one success here.
-
-    arrStats.sort()
+    # the number of unsuccessful runs before the first successful one
+    # is geometrically distributed
+    nfails = np.random.geometric(Ns / float(N), samplesize) - 1
+    arrStats = sdata[np.random.randint(Ns, size=samplesize)].astype(float)
+    if nfails.sum():
+        arrStats += np.bincount(np.repeat(np.arange(samplesize), nfails),
+                                weights=udata[np.random.randint(Nu, size=nfails.sum())],
+                                minlength=samplesize)
+    arrStats = sorted(arrStats)
 
     return (prctile(arrStats, percentiles, issorted=True),
             arrStats)
@@ -318,21 +310,67 @@ def randint_derandomized(low, high=None, size=None):
         np.asarray(data)[randint_derandomized(0, len(data), ndata)]
 
     """
-    return np.asarray(list(_randint_derandomized_generator(low, high, size)))
-
-def _randint_derandomized_generator(low, high=None, size=None):
-    """the generator for `randint_derandomized`"""
     if high is None:
         low, high = 0, low
     if size is None:
         size = high
-    delivered = 0
-    while delivered < size:
-        for randi in np.random.permutation(high - low):
-            delivered += 1
-            yield low + randi
-            if delivered >= size:
-                break
+    size = int(np.ceil(size))
+    if size <= 0:
+        return np.zeros(0, dtype=int)
+    if high <= low:
+        raise ValueError('high=%s must be larger than low=%s' % (str(high), str(low)))
+    # as many permutations as needed, the last one is cut
+    permutations = [np.random.permutation(high - low)
+                    for _ in range(1 + (size - 1) // (high - low))]
+    return low + np.concatenate(permutations)[:size]
+
+def simulated_restart_runlengths(evals, nsucc,
+            samplesize=genericsettings.simulated_runlength_bootstrap_sample_size,
+            randintfirst=randint_derandomized,
+            randintrest=randint_derandomized):
+    """return a sorted `numpy` array of `samplesize` "simulated" run
+    lengths (#evaluations) with restarts.
+
+    The first `nsucc` > 0 values of `evals` are the run lengths of
+    successful runs, the remaining values those of unsuccessful runs.
+
+    A simulated run length is the sum of uniformly chosen run lengths
+    until the first time a successful one is chosen. The first run is
+    chosen with `randintfirst`. For a first unsuccessful run, the number
+    of further unsuccessful runs is geometrically distributed. These
+    runs and the final successful run are chosen with `randintrest`,
+    for all samples at once.
+
+    >>> import numpy as np
+    >>> from cocopp.toolsstats import simulated_restart_runlengths
+    >>> np.random.seed(3)
+    >>> evals = [1, 2, 10, 10]  # the last two runs were unsuccessful
+    >>> x = simulated_restart_runlengths(evals, 2, 10000)
+    >>> len(x), x[0], all(np.diff(x) >= 0)
+    (10000, 1.0, True)
+    >>> assert abs(np.mean(x) / 11.5 - 1) < 0.05  # aRT = sum(evals) / 2
+    >>> list(simulated_restart_runlengths(evals[:2], 2, 4))  # derandomized, no restarts
+    [1.0, 1.0, 2.0, 2.0]
+
+    """
+    evals = np.asarray(evals, dtype=float)
+    nfails = len(evals) - nsucc
+    if nsucc <= 0:
+        raise ValueError("without any successful run, simulated runlengths"
+                         " are undefined")
+    indices = randintfirst(0, len(evals), samplesize)
+    sums = evals[indices]
+    failing = np.nonzero(indices >= nsucc)[0]
+    if len(failing):
+        # number of further unsuccessful runs before the first successful one
+        nrestarts = np.random.geometric(nsucc / float(len(evals)), len(failing)) - 1
+        if nrestarts.sum():
+            restarts = evals[nsucc + randintrest(0, nfails, nrestarts.sum())]
+            sums[failing] += np.bincount(np.repeat(np.arange(len(failing)), nrestarts),
+                                         weights=restarts, minlength=len(failing))
+        sums[failing] += evals[randintrest(0, nsucc, len(failing))]
+    sums.sort()
+    return sums
 
 def simulated_evals(evals, nfails,
             samplesize=genericsettings.simulated_runlength_bootstrap_sample_size,
@@ -706,7 +744,7 @@ def significancetest(entry0, entry1, targets):
     # one of the entry is an instance of BestAlgDataSet
     for entry in (entry0, entry1):
         tmp = entry.detEvals(targets)
-        if not 'funvals' in entry.__dict__ and not 'indicator' in entry.__dict__:  # this looks like a terrible hack
+        if not hasattr(entry, 'funvals') and not hasattr(entry, 'indicator'):  # this looks like a terrible hack
             isRefAlg = True
             # for i, j in enumerate(tmp[0]):
                 # if np.isnan(j).all():
@@ -2,16 +2,159 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 import os
+import sys
 import argparse
+import numpy as np
 
 from cocoprep.archive_load_data import get_file_name_list, parse_archive_file_name
 from cocoprep.archive_load_data import create_path, parse_range
 from cocoprep.archive_exceptions import PreprocessingException, PreprocessingWarning
 from cocoprep.coco_archive import Archive, log_level
+from cocoprep.archive_functions import parallel_map
+
+
+def nondominated_mask(f, ideal, nadir, margin=1e-11):
+    """Returns a boolean mask of the rows of the n x 2 array f (in the original objective space) that cannot be left out
+       when adding the rows in their order to an archive with the given ideal and nadir point without changing the
+       final archive. A row is left out if it equals a previous row or if it is dominated by another row by more than
+       margin (relative to the normalization) in at least one objective. Rows that are within margin of the ideal
+       point in an objective are never left out and never used to leave out other rows, because the archive
+       normalization moves them to the boundary of the region of interest.
+       :param f: array of objective values with two columns
+       :param ideal: ideal point
+       :param nadir: nadir point
+       :param margin: relative margin of dominance
+    """
+    f = np.asarray(f, dtype=float).reshape(-1, 2)
+    mask = np.zeros(len(f), dtype=bool)
+    if not len(f):
+        return mask
+
+    # Keep the first of equal rows
+    _, first = np.unique(f, axis=0, return_index=True)
+    mask[first] = True
+
+    ideal = np.asarray(ideal, dtype=float)
+    margin = margin * (np.asarray(nadir, dtype=float) - ideal)
+    interior = np.all(f > ideal + margin, axis=1)
+    if not np.any(interior):
+        return mask
+
+    # For the interior rows sorted by the first objective, the minimal second objective up to each row
+    order = np.argsort(f[interior, 0], kind='mergesort')
+    f1 = f[interior, 0][order]
+    min_f2 = np.minimum.accumulate(f[interior, 1][order])
+
+    def is_dominated(y1, y2):
+        # Whether an interior row has a first objective <= y1 and a second objective <= y2
+        count = np.searchsorted(f1, y1, side='right')
+        return (count > 0) & (min_f2[np.maximum(count - 1, 0)] <= y2)
+
+    dominated = interior & (is_dominated(f[:, 0], f[:, 1] - margin[1]) | is_dominated(f[:, 0] - margin[0], f[:, 1]))
+    return mask & ~dominated
+
+
+def _thin_block(lines, ideal, normalization, thinning_precision):
+    """Returns the indices of the lines with (non-extreme) solutions among the given lines, their objective values
+       rounded according to the thinning precision (in the normalized objective space) as an array with two columns
+       and the number of all solutions including the extreme ones.
+    """
+    indices = []
+    values = []
+    all_solutions = 0
+    for i, line in enumerate(lines):
+        if line[0] == '%':
+            continue
+        split = line.split()
+        if len(split) < 3:
+            continue
+        all_solutions += 1
+        if split[0] != '0':
+            # The line contains a 'regular' solution
+            indices.append(i)
+            values.append(split[1:3])
+    f = np.array(values, dtype=float).reshape(-1, 2)
+    f = (f - ideal) / normalization
+    f = ideal + np.round(f / thinning_precision) * thinning_precision
+    return indices, f, all_solutions
+
+
+def thin_archive_file(input_file, output_file, thinning_precision, currently_nondominated, block_size=1 << 22):
+    """Performs thinning of the archive in the input file and stores the thinned archive in the output file (see
+       archive_thinning). The input file is read in blocks of about block_size bytes, the solutions of a block are
+       rounded at once and, if currently_nondominated is False, solutions that are dominated within the block are left
+       out before they are added to the thinned archive. Returns the number of all and of the thinned solutions.
+       :param input_file: name of the input archive file containing one archive
+       :param output_file: name of the output archive file (its path is created if not existing before)
+       :param thinning_precision: thinning precision in the normalized objective space
+       :param currently_nondominated: whether to output the currently nondominated solutions instead of the final ones
+       :param block_size: size of the blocks in bytes
+    """
+    old_level = log_level('warning')
+
+    (suite_name, function, instance, dimension) = parse_archive_file_name(input_file)
+    create_path(os.path.dirname(output_file))
+    f_out = open(output_file, 'w')
+    thinned_archive = Archive(suite_name, function, instance, dimension)
+    thinned_solutions = 0
+    all_solutions = 0
+
+    extreme1_text = thinned_archive.get_next_solution_text()
+    extreme2_text = thinned_archive.get_next_solution_text()
+    extreme1 = [float(x) for x in extreme1_text.split()[1:3]]
+    extreme2 = [float(x) for x in extreme2_text.split()[1:3]]
+    ideal = np.minimum(extreme1, extreme2)
+    nadir = np.maximum(extreme1, extreme2)
+    normalization = nadir - ideal
+
+    with open(input_file, 'r') as f_in:
+        while True:
+            lines = f_in.readlines(block_size)
+            if not lines:
+                break
+            indices, f, block_solutions = _thin_block(lines, ideal, normalization, thinning_precision)
+            all_solutions += block_solutions
+
+            if currently_nondominated:
+                # The output depends on the order of the solutions, add them one by one
+                rows = dict((index, row) for row, index in enumerate(indices))
+                for i, line in enumerate(lines):
+                    if line[0] == '%':
+                        f_out.write(line)
+                    elif i in rows and thinned_archive.add_solution(f[rows[i], 0], f[rows[i], 1], line) == 1:
+                        thinned_solutions += 1
+                        f_out.write(line)
+            else:
+                f_out.writelines(line for line in lines if line[0] == '%')
+                mask = nondominated_mask(f, ideal, nadir)
+                thinned_archive.add_solutions(f[mask], [lines[index] for index, keep in zip(indices, mask) if keep])
+
+    if not currently_nondominated and (thinned_archive.number_of_solutions == 2):
+        # Output the two extreme solutions if they are the only two in the archive
+        f_out.write(extreme1_text)
+        f_out.write(extreme2_text)
+        thinned_solutions = 2
+
+    while not currently_nondominated:
+        text = thinned_archive.get_next_solution_text()
+        if text is None:
+            break
+        thinned_solutions += 1
+        f_out.write(text)
+
+    f_out.close()
+    log_level(old_level)
+    return all_solutions, thinned_solutions
+
+
+def _thin_archive_file(args):
+    """Calls thin_archive_file with the given tuple of arguments in a worker process.
+    """
+    return thin_archive_file(*args)
 
 
 def archive_thinning(input_path, output_path, thinning_precision, currently_nondominated, functions, instances,
-                     dimensions):
+                     dimensions, jobs=1):
     """Performs thinning of all the archives in the input path and stores the thinned archives in the output path.
        Assumes one file contains one archive.
 
@@ -20,14 +163,16 @@ def archive_thinning(input_path, output_path, thinning_precision, currently_nond
        are currently nondominated within the thinned archive are output. The two extreme solutions are not output.
        If currently_nondominated is False, only the solutions that are contained in the final archive are output.
        In this case, the two extreme solutions are also output.
+
+       The archives are thinned by jobs processes in parallel (the results are printed in the same order as with a
+       single process).
     """
     # Check whether input path exists
     input_files = get_file_name_list(input_path, ".adat")
     if len(input_files) == 0:
         raise PreprocessingException('Folder {} does not exist or is empty'.format(input_path))
 
-    old_level = log_level('warning')
-
+    tasks, skipped = [], []
     for input_file in input_files:
         try:
             (suite_name, function, instance, dimension) = parse_archive_file_name(input_file)
@@ -38,78 +183,24 @@ def archive_thinning(input_path, output_path, thinning_precision, currently_nond
             if instance not in instances:
                 continue
         except PreprocessingWarning as warning:
-            print('Skipping file {}\n{}'.format(input_file, warning))
+            # Printed before the results of the next thinned file to keep the input order
+            skipped.append((len(tasks), 'Skipping file {}\n{}'.format(input_file, warning)))
             continue
 
-        print(input_file)
-
         output_file = input_file.replace(input_path, output_path)
-        create_path(os.path.dirname(output_file))
-        f_out = open(output_file, 'w')
-        thinned_archive = Archive(suite_name, function, instance, dimension)
-        thinned_solutions = 0
-        all_solutions = 0
-
-        extreme1_text = thinned_archive.get_next_solution_text()
-        extreme2_text = thinned_archive.get_next_solution_text()
-        extreme1 = [float(x) for x in extreme1_text.split()[1:3]]
-        extreme2 = [float(x) for x in extreme2_text.split()[1:3]]
-        ideal = [min(x, y) for x, y in zip(extreme1, extreme2)]
-        nadir = [max(x, y) for x, y in zip(extreme1, extreme2)]
-        normalization = [x - y for x, y in zip(nadir, ideal)]
-
-        with open(input_file, 'r') as f_in:
-            for line in f_in:
-
-                if line[0] == '%':
-                    f_out.write(line)
-
-                elif len(line) == 0 or len(line.split()) < 3:
-                    continue
-
-                elif line.split()[0] == '0':
-                    # The line contains an extreme solution, do nothing
-                    all_solutions += 1
-                    continue
-
-                else:
-                    # The line contains a 'regular' solution
-                    try:
-                        # Fill the archives with the rounded solutions values wrt the different precisions
-                        f_original = [float(x) for x in line.split()[1:3]]
-                        f_normalized = [(f_original[i] - ideal[i]) / normalization[i] for i in range(2)]
-                        f_normalized = [round(f_normalized[i] / thinning_precision) for i in range(2)]
-                        f_normalized = [ideal[i] + f_normalized[i] * thinning_precision for i in range(2)]
-                        updated = thinned_archive.add_solution(f_normalized[0], f_normalized[1], line)
-                    except IndexError:
-                        print('Problem in file {}, line {}, skipping line'.format(input_file, line))
-                        continue
-                    finally:
-                        all_solutions += 1
-
-                    if currently_nondominated and (updated == 1):
-                        thinned_solutions += 1
-                        f_out.write(line)
-
-        if not currently_nondominated and (thinned_archive.number_of_solutions == 2):
-            # Output the two extreme solutions if they are the only two in the archive
-            f_out.write(extreme1_text)
-            f_out.write(extreme2_text)
-            thinned_solutions = 2
-
-        while not currently_nondominated:
-            text = thinned_archive.get_next_solution_text()
-            if text is None:
-                break
-            thinned_solutions += 1
-            f_out.write(text)
-
+        tasks.append((input_file, output_file, thinning_precision, currently_nondominated))
+
+    results = parallel_map(_thin_archive_file, tasks, jobs)
+    for i, task in enumerate(tasks + [None]):
+        while skipped and skipped[0][0] == i:
+            print(skipped.pop(0)[1])
+        if task is None:
+            break
+        print(task[0])
+        all_solutions, thinned_solutions = next(results)
         print('original: {} thinned: {} ({:.2f}%)'.format(all_solutions, thinned_solutions,
                                                           100 * thinned_solutions / all_solutions))
-        f_out.close()
-
-    log_level(old_level)
-
+        sys.stdout.flush()
 
 if __name__ == '__main__':
     """Performs thinning of archives w.r.t. the given precision (intended to use with already updated archives, not the
@@ -131,6 +222,8 @@ if __name__ == '__main__':
                         help='thinning precision')
     parser.add_argument('--currently-nondominated', action='store_true',
                         help='output currently nondominated solutions')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of processes that thin different archives in parallel')
     parser.add_argument('output', help='path to the output folder')
     parser.add_argument('input', help='path to the input folder')
     args = parser.parse_args()
@@ -141,5 +234,5 @@ if __name__ == '__main__':
 
     # Analyze the archives
     archive_thinning(args.input, args.output, args.precision, args.currently_nondominated, args.functions,
-                     args.instances, args.dimensions)
+                     args.instances, args.dimensions, args.jobs)
 
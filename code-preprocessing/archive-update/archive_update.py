@@ -6,7 +6,7 @@ import sys
 import argparse
 
 from cocoprep.archive_load_data import parse_range, read_best_values, write_best_values
-from cocoprep.archive_functions import ArchiveInfo
+from cocoprep.archive_functions import ArchiveInfo, parallel_map
 from cocoprep.coco_archive import Archive, log_level
 
 
@@ -55,7 +55,36 @@ def update_best_hypervolume(old_best_files, new_best_data, new_best_file):
     sys.stdout.flush()
 
 
-def merge_archives(input_path, output_path, functions, instances, dimensions, crop_variables):
+def merge_problem_instance(problem_instance_info, output_path, crop_variables):
+    """Merges the archives of the given problem instance and stores the consolidated archive in the output_path.
+       Returns the problem name and its new best hypervolume value.
+       :param problem_instance_info: ProblemInstanceInfo of the problem instance
+       :param output_path: output path (created if not existing before)
+       :param crop_variables: whether output archives should contain information on solution variables
+    """
+    old_level = log_level('warning')
+
+    # Create an archive for this problem instance
+    archive = Archive(problem_instance_info.suite_name, problem_instance_info.function,
+                      problem_instance_info.instance, problem_instance_info.dimension)
+
+    # Read the solutions from the files and add them to the archive
+    problem_instance_info.fill_archive(archive)
+
+    # Write the non-dominated solutions into output folder
+    problem_instance_info.write_archive_solutions(output_path, archive, crop_variables)
+
+    log_level(old_level)
+    return str(problem_instance_info), archive.hypervolume
+
+
+def _merge_problem_instance(args):
+    """Calls merge_problem_instance with the given tuple of arguments in a worker process.
+    """
+    return merge_problem_instance(*args)
+
+
+def merge_archives(input_path, output_path, functions, instances, dimensions, crop_variables, jobs=1):
     """Merges all archives from the input_path (removes any dominated solutions) and stores the consolidated archives
        in the output_path. Returns problem names and their new best hypervolume values in the form of a dictionary.
        :param input_path: input path
@@ -64,6 +93,8 @@ def merge_archives(input_path, output_path, functions, instances, dimensions, cr
        :param instances: instances to be included in the merging
        :param dimensions: dimensions to be included in the merging
        :param crop_variables: whether output archives should contain information on solution variables
+       :param jobs: number of processes that merge the archives of different problem instances in parallel (the
+       results are collected in the same order as with a single process)
     """
     result = {}
 
@@ -73,30 +104,19 @@ def merge_archives(input_path, output_path, functions, instances, dimensions, cr
 
     print('Processing archives...')
     sys.stdout.flush()
+    problem_instance_infos = []
     while True:
         # Get information about the next problem instance
         problem_instance_info = archive_info.get_next_problem_instance_info()
         if problem_instance_info is None:
             break
+        problem_instance_infos.append((problem_instance_info, output_path, crop_variables))
 
-        old_level = log_level('warning')
-
-        # Create an archive for this problem instance
-        archive = Archive(problem_instance_info.suite_name, problem_instance_info.function,
-                          problem_instance_info.instance, problem_instance_info.dimension)
-
-        # Read the solutions from the files and add them to the archive
-        problem_instance_info.fill_archive(archive)
-
-        # Write the non-dominated solutions into output folder
-        problem_instance_info.write_archive_solutions(output_path, archive, crop_variables)
-
-        result.update({str(problem_instance_info): archive.hypervolume})
-        print('{}: {:.15f}'.format(problem_instance_info, archive.hypervolume))
+    for problem_name, hypervolume in parallel_map(_merge_problem_instance, problem_instance_infos, jobs):
+        result.update({problem_name: hypervolume})
+        print('{}: {:.15f}'.format(problem_name, hypervolume))
         sys.stdout.flush()
 
-        log_level(old_level)
-
     return result
 
 
@@ -123,6 +143,8 @@ if __name__ == '__main__':
                         help='don\'t include information on the variables in the output archives')
     parser.add_argument('--hyp-file', default='new_best_values_hyp.c',
                         help='name of the file to store new hypervolume values')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of processes that merge the archives of different problem instances in parallel')
     parser.add_argument('output', help='path to the output folder')
     parser.add_argument('input', default=[], nargs='+', help='path(s) to the input folder(s)')
     args = parser.parse_args()
@@ -132,7 +154,7 @@ if __name__ == '__main__':
 
     # Merge the archives
     new_hypervolumes = merge_archives(args.input, args.output, args.functions, args.instances, args.dimensions,
-                                      args.crop_variables)
+                                      args.crop_variables, args.jobs)
 
     timing.log('Finished merging', timing.now())
 
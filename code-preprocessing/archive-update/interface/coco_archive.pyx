@@ -1,8 +1,10 @@
 # -*- mode: cython -*-
 #interface: c_string_type=str, c_string_encoding=ascii
 from __future__ import absolute_import, division, print_function, unicode_literals
+import sys
 import numpy as np
 cimport numpy as np
+from libc.stdlib cimport strtod
 
 # Must initialize numpy or risk segfaults
 np.import_array()
@@ -44,6 +46,7 @@ cdef class Archive:
     cdef bytes _tmp_text
     
     cdef up_to_date
+    cdef readonly size_t number_of_read_solutions
     
     def __cinit__(self, suite_name, function, instance, dimension):
 
@@ -69,6 +72,80 @@ cdef class Archive:
         if updated:
             self.up_to_date = False            
         return updated
+
+    def add_solutions(self, f, texts):
+        """Adds the solutions with objective values in the rows of the n x 2 array f and the given texts to the
+           archive as n calls to add_solution would. Returns the number of updates of the archive.
+           :param f: array of objective values with two columns
+           :param texts: sequence of n solution texts
+        """
+        cdef np.ndarray[double, ndim=2, mode="c"] _f = np.ascontiguousarray(f, dtype=np.double).reshape(-1, 2)
+        cdef size_t i
+        cdef size_t updates = 0
+        if len(texts) != _f.shape[0]:
+            raise ValueError('{} objective vectors but {} texts'.format(_f.shape[0], len(texts)))
+        for i in range(_f.shape[0]):
+            updates += coco_archive_add_solution(self.archive, _f[i, 0], _f[i, 1], _bstring(texts[i]))
+        if updates:
+            self.up_to_date = False
+        self.number_of_read_solutions = _f.shape[0]
+        return updates
+
+    def add_file(self, file_name, instance=None, offset=0):
+        """Reads the solutions from an archive file and adds them to the archive. Returns the number of updates of
+           the archive and sets number_of_read_solutions to the number of solutions read.
+           If instance is None, all comments are skipped and all solutions are read. Otherwise, the solutions are
+           read from the first comment with 'instance = {instance}' at or after the byte offset up to the next comment
+           with an instance. Raises a ValueError if no such comment is found.
+           :param file_name: archive file name
+           :param instance: instance number of the solutions to be read in a file with multiple instances
+           :param offset: position in bytes from which to search for the instance
+        """
+        from cocoprep.archive_load_data import get_key_value
+        cdef bytes line
+        cdef char* start
+        cdef char* end
+        cdef double f1, f2
+        cdef size_t updates = 0
+        cdef size_t number_of_solutions = 0
+        instance_found = instance is None
+        with open(file_name, 'rb') as f:
+            if offset:
+                f.seek(offset)
+            for line in f:
+                if line[:1] == b'%':
+                    if instance is not None and b'instance' in line:
+                        if instance_found:
+                            # Stop when you encounter another instance
+                            break
+                        value = get_key_value(line[1:].decode('ascii', 'replace').rstrip('\r\n'), 'instance')
+                        instance_found = value is not None and int(value) == instance
+                    continue
+                if not instance_found or not line.strip():
+                    continue
+                if line.endswith(b'\r\n'):
+                    line = line[:-2] + b'\n'  # like in a file opened in text mode
+                # Skip the first column (the evaluation number) and parse the objective values
+                start = line
+                strtod(start, &end)
+                if end != start:
+                    start = end
+                    f1 = strtod(start, &end)
+                if end != start:
+                    start = end
+                    f2 = strtod(start, &end)
+                if end == start:
+                    print('Problem in file {}, line {}, skipping line'.format(file_name, line.decode('ascii')))
+                    sys.stdout.flush()
+                    continue
+                updates += coco_archive_add_solution(self.archive, f1, f2, line)
+                number_of_solutions += 1
+        if not instance_found:
+            raise ValueError('File \'{}\' does not contain \'instance = {}\''.format(file_name, instance))
+        if updates:
+            self.up_to_date = False
+        self.number_of_read_solutions = number_of_solutions
+        return updates
         
     def get_next_solution_text(self):
         self._tmp_text = coco_archive_get_next_solution_text(self.archive)
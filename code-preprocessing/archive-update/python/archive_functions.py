@@ -2,9 +2,10 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import os
 import sys
+import multiprocessing
 
 from .archive_exceptions import PreprocessingWarning, PreprocessingException
-from .archive_load_data import create_path, get_key_value, get_file_name_list, get_archive_file_info, get_range
+from .archive_load_data import create_path, get_file_name_list, get_archive_file_info, get_range
 
 
 class ProblemInstanceInfo:
@@ -12,14 +13,14 @@ class ProblemInstanceInfo:
        with archived solutions for this problem instance.
     """
 
-    def __init__(self, _file_name, single_instance, suite_name, _function, instance, dimension):
+    def __init__(self, _file_name, single_instance, suite_name, _function, instance, dimension, offset=None):
         """Instantiates a ProblemInstanceInfo object.
         """
         self.suite_name = suite_name
         self.function = _function
         self.instance = instance
         self.dimension = dimension
-        self.file_info = [{'file_name': _file_name, 'single_instance': single_instance}]
+        self.file_info = [{'file_name': _file_name, 'single_instance': single_instance, 'offset': offset}]
 
         self.current_file_initialized = False
         self.current_position = 0
@@ -49,53 +50,21 @@ class ProblemInstanceInfo:
     def fill_archive(self, archive):
         """Reads the solutions from the files and feeds them to the given archive. If a file contains a single
         instance, all comments are skipped. If a file contains multiple instances, only the solutions up to the next
-        instance are read. If the file contains no solutions for the given problem instance, an exception is raised.
+        instance are read, starting from the offset of the instance in the file if it is known. If the file contains
+        no solutions for the given problem instance, an exception is raised.
            :param archive: archive to be filled with solutions
         """
         for f_info in self.file_info:
             f_name = f_info.get('file_name')
             single_instance = f_info.get('single_instance')
-            with open(f_name, 'r') as f:
-
-                instance_found = single_instance
-                solution_found = False
-
-                for line in f:
-                    if not line.strip() or (single_instance and line[0] == '%'):
-                        # Ignore empty lines and all comments if the file contains a single instance
-                        continue
-
-                    elif line[0] == '%' and 'instance' not in line:
-                        # If a file has multiple instances, ignore all comments not containing instance information
-                        continue
-
-                    elif not single_instance and line[0] == '%' and 'instance' in line:
-                        if instance_found:
-                            # If a file has multiple instances, stop when you encounter another instance
-                            break
-                        else:
-                            value = get_key_value(line[1:], 'instance')
-                            if int(value) == self.instance:
-                                instance_found = True
-
-                    elif instance_found:
-                        if line[0] != '%':
-                            # Solution found, feed it to the archive
-                            try:
-                                archive.add_solution(float(line.split()[1]), float(line.split()[2]), line)
-                                solution_found = True
-                            except IndexError:
-                                print('Problem in file {}, line {}, skipping line'.format(f_name, line))
-                                sys.stdout.flush()
-                                continue
-
-                f.close()
-                if not instance_found:
-                    raise PreprocessingException('File \'{}\' does not contain \'instance = {}\''.format(f_name,
-                                                                                                         self.instance))
-                if not solution_found:
-                    raise PreprocessingException('File \'{}\' contains no solutions for \'instance = {}\''.format(
-                        f_name, self.instance))
+            try:
+                archive.add_file(f_name, None if single_instance else self.instance, f_info.get('offset') or 0)
+            except ValueError:
+                raise PreprocessingException('File \'{}\' does not contain \'instance = {}\''.format(f_name,
+                                                                                                     self.instance))
+            if not archive.number_of_read_solutions:
+                raise PreprocessingException('File \'{}\' contains no solutions for \'instance = {}\''.format(
+                    f_name, self.instance))
 
     # noinspection PyTypeChecker
     def write_archive_solutions(self, output_path, archive, crop_variables):
@@ -176,22 +145,24 @@ class ArchiveInfo:
                 result += str(problem_instance) + '\n'
         return result
 
-    def _add_entry(self, _file_name, single_instance, suite_name, _function, instance, dimension):
+    def _add_entry(self, _file_name, single_instance, suite_name, _function, instance, dimension, offset=None):
         """Adds a new ProblemInstanceInfo instance with the given suite_name, function, instance, dimension to the list
            of problem instances if an instance with these exact values does not exist yet. If it already exists, the
-           current file_name and single_instance entries are added to its list of file information dictionaries.
+           current file_name, single_instance and offset entries are added to its list of file information
+           dictionaries.
         """
 
         found = False
         for problem_instance in self.problem_instances:
             if problem_instance.equals(suite_name, _function, instance, dimension):
-                problem_instance.file_info.append({'file_name': _file_name, 'single_instance': single_instance})
+                problem_instance.file_info.append({'file_name': _file_name, 'single_instance': single_instance,
+                                                   'offset': offset})
                 found = True
                 break
 
         if not found:
             self.problem_instances.append(ProblemInstanceInfo(_file_name, single_instance, suite_name, _function,
-                                                              instance, dimension))
+                                                              instance, dimension, offset))
 
     def get_next_problem_instance_info(self):
         """Returns the current ProblemInstanceInfo and increases the counter. If there are no more instances left,
@@ -245,3 +216,31 @@ class ArchiveInfo:
             for file_info in problem_instance.file_info:
                 file_name_set.add(file_info['file_name'])
         return sorted(file_name_set)
+
+
+def parallel_map(function, tasks, jobs):
+    """Yields the results of function for the given tasks in their order, computed by jobs worker processes if jobs
+       is larger than 1.
+
+       Raises a PreprocessingException if a worker process exits (for example because of a fatal error in the COCO
+       library), since its task would never be finished.
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield function(task)
+        return
+
+    pool = multiprocessing.Pool(jobs)
+    try:
+        # The pool replaces an exited worker process with a new one
+        process_ids = set(process.pid for process in pool._pool)
+        results = [pool.apply_async(function, (task,)) for task in tasks]
+        for result in results:
+            while not result.ready():
+                result.wait(0.1)
+                if any(process.pid not in process_ids or process.exitcode is not None for process in pool._pool):
+                    raise PreprocessingException('A worker process exited before finishing its task')
+            yield result.get()
+    finally:
+        pool.terminate()
+        pool.join()
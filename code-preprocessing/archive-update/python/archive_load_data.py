@@ -39,7 +39,12 @@ def create_path(path):
     :param path: path
     """
     if not os.path.exists(path):
-        os.makedirs(path)
+        try:
+            os.makedirs(path)
+        except OSError:
+            # The path can be created by another process in the meantime
+            if not os.path.isdir(path):
+                raise
 
 
 def remove_empty_file(file_name):
@@ -162,13 +167,23 @@ def get_instances(file_name):
     """Returns the list of instances contained in the given archive file's comments (lines beginning with %).
        :param file_name: archive file name
     """
+    return [instance for instance, _ in get_instance_offsets(file_name)]
+
+
+def get_instance_offsets(file_name):
+    """Returns the list of (instance, offset) pairs of the instances contained in the given archive file's comments
+       (lines beginning with %), where offset is the position of the comment in bytes from the beginning of the file.
+       :param file_name: archive file name
+    """
     result = []
-    with open(file_name, 'r') as f:
+    offset = 0
+    with open(file_name, 'rb') as f:
         for line in f:
-            if line[0] == '%' and 'instance' in line:
-                value = get_key_value(line[1:], 'instance')
+            if line[:1] == b'%' and b'instance' in line:
+                value = get_key_value(line[1:].decode('utf-8', 'replace').rstrip('\r\n'), 'instance')
                 if value is not None:
-                    result.append(int(value))
+                    result.append((int(value), offset))
+            offset += len(line)
         f.close()
 
     if len(result) == 0:
@@ -180,12 +195,13 @@ def get_instances(file_name):
 def get_archive_file_info(file_name, functions, instances, dimensions):
     """Returns information on the problem instances contained in the given archive file that also correspond to the
        given functions, instances and dimensions in the form of the following list of lists:
-       file_name, single_instance, suite_name, function, instance1, dimension
-       file_name, single_instance, suite_name, function, instance2, dimension
+       file_name, single_instance, suite_name, function, instance1, dimension, offset1
+       file_name, single_instance, suite_name, function, instance2, dimension, offset2
        ...
        The suite_name, function and dimension are always retrieved from the file name, while instances are either (1)
        retrieved from the file name, if the file name is in form [suite-name]_f[function]_i[instance]_d[dimension]_*.*,
-       or (2) read from the file. Value of single_instance is set to True if (1) and False if (2).
+       or (2) read from the file. Value of single_instance is set to True if (1) and False if (2). In case (2), offset
+       is the position of the instance comment in the file (see get_instance_offsets), otherwise it is None.
        :param file_name: archive file name
        :param functions: functions to be considered
        :param instances: instances to be considered
@@ -196,18 +212,18 @@ def get_archive_file_info(file_name, functions, instances, dimensions):
         if (function not in functions) or (dimension not in dimensions):
             return None
         if not instance:
-            instance_list = get_instances(file_name)
+            instance_list = get_instance_offsets(file_name)
             single_instance = False
         else:
-            instance_list = [instance]
+            instance_list = [(instance, None)]
             single_instance = True
     except PreprocessingWarning as warning:
         raise PreprocessingWarning('Skipping file {}\n{}'.format(file_name, warning))
 
     result = []
-    for instance in instance_list:
+    for instance, offset in instance_list:
         if instance in instances:
-            result.append((file_name, single_instance, suite_name, function, instance, dimension))
+            result.append((file_name, single_instance, suite_name, function, instance, dimension, offset))
     return result
 
 
@@ -115,45 +115,48 @@ def cleanup_archive_data(delete_all=False):
 
 def run_archive_update():
     """
-    Tests whether merge_archives() from archive_update.py works correctly for the given input.
+    Tests whether merge_archives() from archive_update.py works correctly for the given input, with one and with two
+    processes.
     """
     from archive_update import merge_archives
     from cocoprep.archive_load_data import parse_range
 
     base_path = dirname(__file__)
-    new_hypervolumes = merge_archives(abspath(join(base_path, 'test-data', 'archives-input')),
-                                      abspath(join(base_path, 'test-data', 'archives-output')),
-                                      parse_range('1-55'),
-                                      parse_range('1-10'),
-                                      parse_range('2,3,5,10,20,40'),
-                                      False)
-
     precision = 1e-13
 
-    assert len(new_hypervolumes) == 22
-
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d02'), 0.107610318984904, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d03'), 0.227870801380100, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d05'), 0.438362398133288, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d10'), 0.742933437184518, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d20'), 0.587349925250638, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d40'), 0.359511886735384, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f03_i06_d05'), 0.038070322787987, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f03_i07_d05'), 0.129884501203751, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f03_i08_d05'), 0.000760506516737, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f03_i09_d05'), 0.025178346536679, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f03_i10_d05'), 0.001064503341995, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f08_i06_d05'), 0.791099512196690, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f16_i02_d05'), 0.888980819178966, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f17_i01_d05'), 0.948755656523708, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f18_i07_d10'), 0.948488874548393, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f24_i10_d03'), 0.985816809701546, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f25_i02_d05'), 0.933561771067860, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f34_i07_d05'), 0.951275562997383, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f48_i07_d02'), 0.985762281913168, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f50_i07_d02'), 0.893071152604545, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f51_i02_d05'), 0.920488608198097, precision)
-    assert almost_equal(new_hypervolumes.get('bbob-biobj_f52_i07_d02'), 0.920581303184137, precision)
+    for jobs, output_folder in [(1, 'archives-output'), (2, 'archives-output-parallel')]:
+        new_hypervolumes = merge_archives(abspath(join(base_path, 'test-data', 'archives-input')),
+                                          abspath(join(base_path, 'test-data', output_folder)),
+                                          parse_range('1-55'),
+                                          parse_range('1-10'),
+                                          parse_range('2,3,5,10,20,40'),
+                                          False,
+                                          jobs=jobs)
+
+        assert len(new_hypervolumes) == 22
+
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d02'), 0.107610318984904, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d03'), 0.227870801380100, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d05'), 0.438362398133288, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d10'), 0.742933437184518, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d20'), 0.587349925250638, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f01_i04_d40'), 0.359511886735384, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f03_i06_d05'), 0.038070322787987, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f03_i07_d05'), 0.129884501203751, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f03_i08_d05'), 0.000760506516737, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f03_i09_d05'), 0.025178346536679, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f03_i10_d05'), 0.001064503341995, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f08_i06_d05'), 0.791099512196690, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f16_i02_d05'), 0.888980819178966, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f17_i01_d05'), 0.948755656523708, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f18_i07_d10'), 0.948488874548393, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f24_i10_d03'), 0.985816809701546, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f25_i02_d05'), 0.933561771067860, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f34_i07_d05'), 0.951275562997383, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f48_i07_d02'), 0.985762281913168, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f50_i07_d02'), 0.893071152604545, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f51_i02_d05'), 0.920488608198097, precision)
+        assert almost_equal(new_hypervolumes.get('bbob-biobj_f52_i07_d02'), 0.920581303184137, precision)
 
 
 def run_archive_reformat():
@@ -198,24 +201,37 @@ def run_archive_split():
 
 def run_archive_thinning():
     """
-    Tests whether archive_thinning() from archive_thinning.py works correctly for the given input.
+    Tests whether archive_thinning() from archive_thinning.py works correctly for the given input, with one and with two
+    processes, and whether thin_archive_file() gives the same results when reading the input in small blocks.
     """
-    from archive_thinning import archive_thinning
+    from archive_thinning import archive_thinning, thin_archive_file
     from cocoprep.archive_load_data import parse_range
 
     base_path = dirname(__file__)
-    archive_thinning(abspath(join(base_path, 'test-data', 'archives-input')),
-                     abspath(join(base_path, 'test-data', 'archives-thinned')),
-                     1e-3,
-                     False,
-                     parse_range('1'),
-                     parse_range('1-10'),
-                     parse_range('2,3,5,10,20,40'))
+    for jobs, output_folder in [(1, 'archives-thinned'), (2, 'archives-thinned-parallel')]:
+        archive_thinning(abspath(join(base_path, 'test-data', 'archives-input')),
+                         abspath(join(base_path, 'test-data', output_folder)),
+                         1e-3,
+                         False,
+                         parse_range('1'),
+                         parse_range('1-10'),
+                         parse_range('2,3,5,10,20,40'),
+                         jobs=jobs)
+
+        for root, dirs, files in walk(abspath(join(base_path, 'test-data', output_folder)), topdown=False):
+            for name in files:
+                assert compare_files(abspath(join(base_path, 'test-data', 'archives-results', name)),
+                                     abspath(join(base_path, 'test-data', output_folder, name)))
 
     for root, dirs, files in walk(abspath(join(base_path, 'test-data', 'archives-thinned')), topdown=False):
         for name in files:
+            thin_archive_file(abspath(join(base_path, 'test-data', 'archives-input', name)),
+                              abspath(join(base_path, 'test-data', 'archives-thinned-blocks', name)),
+                              1e-3,
+                              False,
+                              block_size=256)
             assert compare_files(abspath(join(base_path, 'test-data', 'archives-results', name)),
-                                 abspath(join(base_path, 'test-data', 'archives-thinned', name)))
+                                 abspath(join(base_path, 'test-data', 'archives-thinned-blocks', name)))
 
 
 def run_archive_analysis():
@@ -1,20 +1,194 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import os
+import shutil
 import argparse
 import numpy as np
+from collections import OrderedDict
 
 from cocoprep.archive_exceptions import PreprocessingWarning
-from cocoprep.archive_load_data import parse_archive_file_name, parse_range, get_key_value
-from cocoprep.archive_functions import ArchiveInfo
+from cocoprep.archive_load_data import create_path, parse_archive_file_name, parse_range, get_key_value
+from cocoprep.archive_functions import ArchiveInfo, parallel_map
 from cocoex import Suite, Observer
 
 
-def log_reconstruct(input_path, output_path, algorithm_name, algorithm_info, functions, instances, dimensions):
+def _parse_solutions(input_file, lines, splits):
+    """Returns the evaluation numbers and the objective values of the solutions in the given lines of the input file
+       (and their splits into words) as arrays, skipping lines that cannot be parsed.
+    """
+    try:
+        evaluations = np.array([int(split[0]) for split in splits], dtype=np.int64)
+        objective_vectors = np.array([(float(split[1]), float(split[2])) for split in splits], dtype=np.double)
+    except ValueError:
+        # Find the lines that cannot be parsed
+        evaluations, objective_vectors = [], []
+        for line, split in zip(lines, splits):
+            try:
+                objective_vector = (float(split[1]), float(split[2]))
+                evaluations.append(int(split[0]))
+                objective_vectors.append(objective_vector)
+            except ValueError as error:
+                print('Problem in file {}, line {}, skipping line\n{}'.format(input_file, line, error))
+        evaluations = np.array(evaluations, dtype=np.int64)
+        objective_vectors = np.array(objective_vectors, dtype=np.double).reshape(-1, 2)
+    return evaluations, objective_vectors
+
+
+def reconstruct_file(input_file, suite, observer, instances):
+    """Feeds the solutions of the given instances from the .adat input_file to the logger of the problems of the suite
+       observed by the observer. The solutions between two comment lines are fed at once. Returns the number of
+       reconstructed problems.
+    """
+    (_suite_name, function, _instance, dimension) = parse_archive_file_name(input_file)
+
+    with open(input_file, 'r') as f_in:
+        print(input_file)
+
+        problem = None
+        objective_vector = None
+        evaluation_found = False
+        instance = None
+        count_not_updated = 0
+        evaluation = 0
+        number_of_problems = 0
+        solution_lines = []
+        solution_splits = []
+
+        def feed_solutions():
+            # Feeds the solution lines to the problem and returns the last solution
+            evaluations, objective_vectors = _parse_solutions(input_file, solution_lines, solution_splits)
+            del solution_lines[:], solution_splits[:]
+            if len(evaluations) == 0:
+                return evaluation, objective_vector, 0
+            updates = problem.logger_biobj_feed_solutions(evaluations, objective_vectors)
+            return int(evaluations[-1]), objective_vectors[-1], len(evaluations) - updates
+
+        for line in f_in:
+
+            split = line.split()
+            if len(split) < 3:
+                continue
+
+            elif line[0] != '%':
+                if instance in instances:
+                    solution_lines.append(line)
+                    solution_splits.append(split)
+                continue
+
+            elif solution_lines:
+                evaluation, objective_vector, not_updated = feed_solutions()
+                count_not_updated += not_updated
+
+            if 'instance' in line:
+                instance = int(get_key_value(line[1:], 'instance'))
+                if instance in instances:
+                    if problem is not None:
+                        if not evaluation_found:
+                            raise PreprocessingWarning('Missing the line `% evaluations = ` in the previous '
+                                                       'problem. This problem is file = {}, instance = {}'
+                                                       .format(input_file, instance))
+                        if count_not_updated > 0:
+                            print('{} solutions did not update the archive'.format(count_not_updated))
+                        problem.free()
+                    problem = suite.get_problem_by_function_dimension_instance(function, dimension, instance,
+                                                                               observer)
+                    number_of_problems += 1
+                    evaluation_found = False
+
+            elif 'evaluations' in line:
+                old_evaluation = evaluation
+                evaluation = int(get_key_value(line[1:], 'evaluations'))
+                evaluation_found = True
+                if (evaluation > old_evaluation) and problem is not None and objective_vector is not None:
+                    problem.logger_biobj_feed_solution(evaluation, objective_vector)
+
+        if solution_lines:
+            evaluation, objective_vector, not_updated = feed_solutions()
+            count_not_updated += not_updated
+
+        if problem is not None:
+            if not evaluation_found:
+                print('Missing the line `% evaluations = ` in this or the previous problem. This is file = {}, '
+                      'instance = {}' .format(input_file, instance))
+            if count_not_updated > 0:
+                print('{} solutions did not update the archive'.format(count_not_updated))
+            problem.free()
+
+        f_in.close()
+
+    return number_of_problems
+
+
+def _reconstruct_files(args):
+    """Reconstructs the logger output of the given input files in a worker process with its own suite and observer
+       (the observer output cannot be shared between processes). Returns the result folder of the observer and the
+       number of reconstructed problems of each input file.
+    """
+    suite_name, suite_instance, suite_options, observer_options, input_files, instances = args
+    suite = Suite(suite_name, suite_instance, suite_options)
+    observer = Observer('bbob-biobj', observer_options)
+    numbers_of_problems = [reconstruct_file(input_file, suite, observer, instances) for input_file in input_files]
+    return observer.result_folder, numbers_of_problems
+
+
+def merge_result_folders(result_folders, problem_folders, output_folder):
+    """Merges the logger output in the result_folders into the output_folder and removes the result_folders.
+
+       Each result folder contains the output of problems of a single function and dimension and problem_folders
+       gives the index of the result folder of each reconstructed problem in the order of a sequential
+       reconstruction. The .dat and .tdat files are appended to the ones in the output folder, while the .info files
+       are written as the observer would have written them in a sequential reconstruction.
+    """
+    info_files = []
+    for result_folder in result_folders:
+        info_file = None
+        for root, dirs, files in os.walk(result_folder):
+            for name in files:
+                file_name = os.path.join(root, name)
+                output_file = os.path.join(output_folder, os.path.relpath(file_name, result_folder))
+                if name.endswith('.info'):
+                    # The header, the line start with the function, dimension and file and the problem entries
+                    with open(file_name, 'r') as f:
+                        header, line = f.read().split('\nfunction = ', 1)
+                    items = line.split(', ')
+                    info_file = [output_file, header, ', '.join(items[:3]), items[3:]]
+                else:
+                    create_path(os.path.dirname(output_file))
+                    with open(file_name, 'rb') as f_in, open(output_file, 'ab') as f_out:
+                        shutil.copyfileobj(f_in, f_out)
+        info_files.append(info_file)
+        shutil.rmtree(result_folder)
+
+    info_texts = OrderedDict()
+    previous_folder = None
+    entries = [0] * len(result_folders)
+    for folder in problem_folders:
+        output_file, header, line_start, items = info_files[folder]
+        if output_file not in info_texts:
+            info_texts[output_file] = [header]
+        if folder != previous_folder:
+            # The observer starts a new line when the function or dimension changes
+            info_texts[output_file].append('\nfunction = ' + line_start)
+        info_texts[output_file].append(', ' + items[entries[folder]])
+        entries[folder] += 1
+        previous_folder = folder
+
+    for output_file, text in info_texts.items():
+        create_path(os.path.dirname(output_file))
+        with open(output_file, 'a') as f:
+            f.write(''.join(text))
+
+
+def log_reconstruct(input_path, output_path, algorithm_name, algorithm_info, functions, instances, dimensions,
+                    jobs=1):
     """Reconstructs the .info, .dat and .tdat files produced by the logger from the .adat files in the input_path.
 
        Takes into account only the given functions, instances and dimensions. If any .info, .dat and .tdat files of
        the same names already exist in the output_path, the new data is appended to them.
+
+       If jobs > 1, the files of different functions and dimensions are reconstructed by jobs processes in parallel,
+       each writing into its own result folder, which are merged into the output folder at the end.
     """
     ext_suite_name = 'bbob-biobj-ext'
     suite_name = 'bbob-biobj'
@@ -31,76 +205,45 @@ def log_reconstruct(input_path, output_path, algorithm_name, algorithm_info, fun
     suite_instance = 'instances: {}'.format(instance_string)
     suite_options = 'dimensions: {} function_indices: {}'.format(dimension_string, function_string)
     if archive_info.is_suite_bbob_biobj_ext():
-        suite = Suite(ext_suite_name, suite_instance, suite_options)
+        suite_name_used = ext_suite_name
     else:
-        suite = Suite(suite_name, suite_instance, suite_options)
+        suite_name_used = suite_name
     observer_options = 'result_folder: {} algorithm_name: {} algorithm_info: "{}" log_nondominated: read'. \
         format(output_path, algorithm_name, algorithm_info)
     observer = Observer(suite_name, observer_options)
 
-    print('Reconstructing...')
+    # Group the files by function and dimension
+    groups = OrderedDict()
     for input_file in file_name_set:
+        (_suite_name, function, _instance, dimension) = parse_archive_file_name(input_file)
+        groups.setdefault((function, dimension), []).append(input_file)
 
+    print('Reconstructing...')
+    if jobs <= 1 or len(groups) <= 1:
+        suite = Suite(suite_name_used, suite_instance, suite_options)
+        for input_file in file_name_set:
+            reconstruct_file(input_file, suite, observer, instances)
+        return
+
+    tasks = [(suite_name_used, suite_instance, suite_options,
+              'result_folder: {}_f{:02d}_d{:02d} algorithm_name: {} algorithm_info: "{}" log_nondominated: read'.
+              format(output_path, function, dimension, algorithm_name, algorithm_info), input_files, instances)
+             for (function, dimension), input_files in groups.items()]
+    results = list(parallel_map(_reconstruct_files, tasks, jobs))
+
+    # The index of the result folder of each problem in the order of a sequential reconstruction
+    numbers_of_problems = {}
+    for (_result_folder, numbers), input_files in zip(results, groups.values()):
+        numbers_of_problems.update(zip(input_files, numbers))
+    folder_index = dict((key, index) for index, key in enumerate(groups))
+    problem_folders = []
+    for input_file in file_name_set:
         (_suite_name, function, _instance, dimension) = parse_archive_file_name(input_file)
+        problem_folders += [folder_index[(function, dimension)]] * numbers_of_problems[input_file]
 
-        with open(input_file, 'r') as f_in:
-            print(input_file)
-
-            problem = None
-            objective_vector = None
-            evaluation_found = False
-            instance = None
-            count_not_updated = 0
-            evaluation = 0
-
-            for line in f_in:
-
-                if len(line.split()) < 3:
-                    continue
-
-                elif line[0] == '%' and 'instance' in line:
-                    instance = int(get_key_value(line[1:], 'instance'))
-                    if instance in instances:
-                        if problem is not None:
-                            if not evaluation_found:
-                                raise PreprocessingWarning('Missing the line `% evaluations = ` in the previous '
-                                                           'problem. This problem is file = {}, instance = {}'
-                                                           .format(input_file, instance))
-                            if count_not_updated > 0:
-                                print('{} solutions did not update the archive'.format(count_not_updated))
-                            problem.free()
-                        problem = suite.get_problem_by_function_dimension_instance(function, dimension, instance,
-                                                                                   observer)
-                        evaluation_found = False
-
-                elif line[0] != '%' and instance in instances:
-                    try:
-                        split = line.split()
-                        evaluation = int(split[0])
-                        objective_vector = np.array(split[1:3])
-                        updated = problem.logger_biobj_feed_solution(evaluation, objective_vector)
-                        if updated == 0:
-                            count_not_updated += 1
-                    except ValueError as error:
-                        print('Problem in file {}, line {}, skipping line\n{}'.format(input_file, line, error))
-                        continue
-
-                elif line[0] == '%' and 'evaluations' in line:
-                    old_evaluation = evaluation
-                    evaluation = int(get_key_value(line[1:], 'evaluations'))
-                    evaluation_found = True
-                    if (evaluation > old_evaluation) and problem is not None and objective_vector is not None:
-                        problem.logger_biobj_feed_solution(evaluation, objective_vector)
-
-            if problem is not None:
-                if not evaluation_found:
-                    print('Missing the line `% evaluations = ` in this or the previous problem. This is file = {}, '
-                          'instance = {}' .format(input_file, instance))
-                if count_not_updated > 0:
-                    print('{} solutions did not update the archive'.format(count_not_updated))
-                problem.free()
-
-            f_in.close()
+    print('Merging the result folders...')
+    merge_result_folders([result_folder for result_folder, _numbers in results], problem_folders,
+                         observer.result_folder)
 
 
 if __name__ == '__main__':
@@ -117,6 +260,8 @@ if __name__ == '__main__':
     parser.add_argument('-d', '--dimensions', type=parse_range, default=[2, 3, 5, 10, 20, 40],
                         help='dimensions to be included in the processing of archives')
     parser.add_argument('-a', '--algorithm-info', default='', help='algorithm information')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of processes that reconstruct different functions and dimensions in parallel')
     parser.add_argument('output', help='path to the output folder')
     parser.add_argument('input', help='path to the input folder')
     parser.add_argument('algorithm_name', help='algorithm name')
@@ -127,4 +272,4 @@ if __name__ == '__main__':
     print('alg_name = {} \nalg_info = {}\n'.format(args.algorithm_name, args.algorithm_info))
 
     log_reconstruct(args.input, args.output, args.algorithm_name, args.algorithm_info, args.functions, args.instances,
-                    args.dimensions)
+                    args.dimensions, args.jobs)
@@ -5,7 +5,7 @@
 # python -m pytest
 # in a terminal window on this folder
 
-from os.path import dirname, abspath, join, exists
+from os.path import dirname, abspath, join, exists, relpath
 from os import walk, remove, rmdir, chdir, chmod, mkdir
 
 
@@ -130,6 +130,35 @@ def run_log_reconstruct():
                           abspath(join(root, name)).replace('exdata', 'test-data'))
 
 
+def run_log_reconstruct_parallel():
+    """
+    Tests whether log_reconstruct() from log_reconstruct.py gives the same files as in test-data/reconstruction and the
+    same results as run_log_reconstruct() when reconstructing with two processes.
+    """
+    from log_reconstruct import log_reconstruct
+    from cocoprep.archive_load_data import parse_range
+
+    base_path = dirname(__file__)
+    log_reconstruct(abspath(join(base_path, 'test-data', 'archives-input')),
+                    'reconstruction-parallel',
+                    'RECONSTRUCTOR',
+                    'A test for reconstruction of logger output',
+                    parse_range('1-55'),
+                    parse_range('1-10'),
+                    parse_range('2,3,5,10,20,40'),
+                    jobs=2)
+
+    def file_names(path):
+        return sorted(relpath(join(root, name), path) for root, dirs, files in walk(path) for name in files)
+
+    expected_path = abspath(join(base_path, 'test-data', 'reconstruction'))
+    sequential_path = abspath(join(base_path, 'exdata', 'reconstruction'))
+    parallel_path = abspath(join(base_path, 'exdata', 'reconstruction-parallel'))
+    assert file_names(parallel_path) == file_names(expected_path)
+    for name in file_names(parallel_path):
+        assert compare_files(join(sequential_path, name), join(parallel_path, name))
+
+
 def run_merge_lines():
     """
     Tests whether merge_lines_in() from merge_lines_in_info_files.py works correctly for the given input.
@@ -164,6 +193,8 @@ def test_all():
 
     run_log_reconstruct()
 
+    run_log_reconstruct_parallel()
+
     run_merge_lines()
 
     cleanup_reconstruction_data()
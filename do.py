@@ -400,6 +400,12 @@ def test_python(args=(['code-experiments/build/python', ['coco_test.py', 'None']
         shutil.rmtree(python_temp_home)
 
 
+def bench_python(args):
+    """measure the evaluation throughput of the Python module `cocoex` with
+    `coco_bench.py`, `args` are its ``name=value`` arguments"""
+    test_python([['code-experiments/build/python', ['coco_bench.py'] + list(args)]])
+
+
 ################################################################################
 ## Matlab
 def build_matlab():
@@ -941,6 +947,11 @@ Available commands for developers:
   test-c-example          - Build and run an example experiment test in C
   test-java               - Build and run a test in Java
   test-python             - Build and run minimal test of Python module
+  bench-python            - Build the Python module and measure evaluations
+                            per second of all suites, written as JSON into
+                            code-experiments/build/python/coco_bench.json.
+                            Takes optional name=value arguments, see
+                            coco_bench.py
   test-octave             - Build and run example experiment in Octave
   test-postprocessing     - Runs some of the post-processing tests (see NOTE
                             below)
@@ -1009,6 +1020,7 @@ def main(args):
     elif cmd == 'test-c-example': test_c_example()
     elif cmd == 'test-java': test_java()
     elif cmd == 'test-python': test_python()
+    elif cmd == 'bench-python': bench_python(args[1:])
     elif cmd == 'test-octave': test_octave()
     elif cmd == 'test-postprocessing': test_postprocessing(all_tests = False, package_install_option = package_install_option)
     elif cmd == 'test-postprocessing-all': test_postprocessing(all_tests = True, package_install_option = package_install_option)